@@ -1,12 +1,23 @@
 import os
-from flask import Flask, render_template
+import importlib
+from flask import Flask, render_template, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from .config import Config
+from markupsafe import Markup
+from .config import get_config
+from .utils.security import PasswordHasher
+from .utils.rate_limit import RateLimiter
+from .utils.assets import Assets
+from .utils.text import nl2br
+from .utils.database import RoutingSession
+from .utils.warmup import Warmup
+from .utils.startup import StartupProfiler
+from .utils.events import EventBroker
+from .commands import register_commands
 
 
-# 初始化資料庫
-db = SQLAlchemy()
+# 初始化資料庫（設定唯讀副本時，唯讀查詢轉送到副本）
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # 初始化登入管理器並配置
 login_manager = LoginManager()
@@ -14,6 +25,21 @@ login_manager.login_view = 'auth.login'  # 設定登入頁面的路由
 login_manager.login_message = '請先登入後再訪問此頁面'  # 設定未登入時的提示訊息
 login_manager.login_message_category = 'warning'  # 設定提示訊息的樣式類別
 
+# 初始化密碼雜湊管理器
+password_hasher = PasswordHasher()
+
+# 初始化請求速率限制器
+limiter = RateLimiter()
+
+# 初始化靜態資源管理
+assets = Assets()
+
+# 初始化工作行程預熱管理
+warmup = Warmup()
+
+# 初始化即時事件發布與訂閱（文章頁的 SSE）
+event_broker = EventBroker()
+
 
 @login_manager.user_loader
 def load_user(id):
@@ -26,22 +52,29 @@ def load_user(id):
     return User.query.get(int(id))
 
 
+# 藍圖：(模組, 名稱)，於註冊時才匯入，啟動分析可個別量測匯入與註冊耗時
+BLUEPRINTS = (
+    ('app.routes.main', 'main_bp'),
+    ('app.routes.settings', 'settings_bp'),
+    ('app.routes.auth', 'auth_bp'),
+    ('app.routes.post', 'post_bp'),
+    ('app.routes.api', 'api_bp'),
+    ('app.routes.admin', 'admin_bp'),
+    ('app.routes.notifications', 'notifications_bp'),
+    ('app.routes.health', 'health_bp'),
+)
+
+
 def register_blueprints(app):
     """
     註冊所有藍圖
     :param app: Flask 應用程式實例
     """
-    # 導入所有藍圖
-    from app.routes.main import main_bp
-    from app.routes.settings import settings_bp
-    from app.routes.auth import auth_bp
-    from app.routes.post import post_bp
-
-    # 註冊藍圖
-    app.register_blueprint(main_bp)
-    app.register_blueprint(settings_bp)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(post_bp)
+    startup = app.extensions['startup']
+    for module_name, name in BLUEPRINTS:
+        with startup.step(f'blueprint:{name}'):
+            module = importlib.import_module(module_name)
+            app.register_blueprint(getattr(module, name))
 
 
 def register_error_handlers(app):
@@ -60,21 +93,58 @@ def register_error_handlers(app):
         """處理 500 伺服器內部錯誤"""
         return render_template('errors/500.html', title='服務器錯誤'), 500
 
+    def retry_later_response(e, template, title):
+        """回應需稍後重試的錯誤，並依請求類型回傳 JSON 或錯誤頁面"""
+        headers = {}
+        retry_after = getattr(e, 'retry_after', None)
+        if retry_after:
+            headers['Retry-After'] = str(retry_after)
+
+        if request.is_json or request.accept_mimetypes.best == 'application/json':
+            return jsonify({
+                'success': False,
+                'message': e.description
+            }), e.code, headers
+
+        return render_template(template, title=title), e.code, headers
+
+    @app.errorhandler(429)
+    def too_many_requests(e):
+        """處理 429 請求過於頻繁錯誤"""
+        return retry_later_response(e, 'errors/429.html', '請求過於頻繁')
+
+    @app.errorhandler(503)
+    def service_unavailable(e):
+        """處理 503 服務暫時無法使用錯誤（例如密碼雜湊工作池已滿）"""
+        return retry_later_response(e, 'errors/503.html', '服務暫時無法使用')
+
 
 def register_template_filters(app):
     """
-    註冊模板過濾器
+    註冊模板過濾器與模板函數
     :param app: Flask 應用程式實例
     """
 
     @app.template_filter('nl2br')
     def nl2br_filter(s):
         """
-        將換行符轉換為 HTML 的 <br> 標籤
+        跳脫 HTML 並將換行符轉換為 <br> 標籤
+        文章與留言的 HTML 已於儲存時產生，此過濾器只用於尚未產生 HTML 的舊資料
         :param s: 輸入字串
-        :return: 轉換後的字串
+        :return: 轉換後的 HTML
+        """
+        return Markup(nl2br(s))
+
+    @app.template_global('liked_by_current_user')
+    def liked_by_current_user(post_id):
+        """
+        目前用戶是否已對文章按讚
+        列表頁應先以 LikeService.prefetch_liked_posts 批次載入，避免逐篇查詢
+        :param post_id: 文章ID
+        :return: 是否已按讚
         """
-        return s.replace('\n', '<br>') if s else ''
+        from app.services import LikeService
+        return LikeService.is_liked_by_current_user(post_id)
 
 
 def configure_uploads(app):
@@ -90,32 +160,140 @@ def configure_uploads(app):
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 
-def create_app(config_class=Config):
+def configure_templates(app):
+    """
+    配置 Jinja 位元組碼快取，需在第一次使用 app.jinja_env 之前呼叫
+    :param app: Flask 應用程式實例
+    """
+    from app.utils.templates import create_bytecode_cache
+
+    cache = create_bytecode_cache(app)
+    if cache is not None:
+        app.jinja_options = {**app.jinja_options, 'bytecode_cache': cache}
+
+
+def configure_compression(app):
+    """
+    配置回應壓縮
+    :param app: Flask 應用程式實例
+    """
+    if not app.config.get('COMPRESS_ENABLED'):
+        return
+
+    app.wsgi_app = compression_middleware(app, app.wsgi_app)
+
+
+def configure_proxy_fix(app):
+    """
+    位於反向代理（nginx 等）之後時，依 X-Forwarded-For / X-Forwarded-Proto 還原用戶端 IP 與協定
+    只信任 PROXY_FIX_X_FOR / PROXY_FIX_X_PROTO 層代理加上的標頭，為 0 時不處理（直接對外時用戶端可偽造標頭）
+    :param app: Flask 應用程式實例
+    """
+    x_for = app.config.get('PROXY_FIX_X_FOR') or 0
+    x_proto = app.config.get('PROXY_FIX_X_PROTO') or 0
+    if not x_for and not x_proto:
+        return
+
+    from werkzeug.middleware.proxy_fix import ProxyFix
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=x_for, x_proto=x_proto, x_host=0, x_port=0, x_prefix=0)
+
+
+def compression_middleware(app, wsgi_app):
+    """
+    以應用程式的壓縮設定包裝 WSGI 應用程式（ASGI 模式的非同步回應也使用）
+    :param app: Flask 應用程式實例
+    :param wsgi_app: 要包裝的 WSGI 應用程式
+    :return: 包裝後的 WSGI 應用程式
+    """
+    from app.utils.compression import CompressionMiddleware
+    from app.utils.assets import static_cache_control
+    return CompressionMiddleware(
+        wsgi_app,
+        min_size=app.config['COMPRESS_MIN_SIZE'],
+        level=app.config['COMPRESS_LEVEL'],
+        brotli_quality=app.config['COMPRESS_BROTLI_QUALITY'],
+        static_folder=app.static_folder,
+        static_url_path=app.static_url_path,
+        static_cache_control=static_cache_control
+    )
+
+
+def configure_database(app):
+    """
+    配置資料庫引擎參數，需在 db.init_app 之前呼叫
+    :param app: Flask 應用程式實例
+    """
+    from app.utils.database import build_engine_options
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+
+
+def configure_sqlite_pragmas(app):
+    """
+    為 SQLite 引擎設定連線 PRAGMA，需在 db.init_app 之後、第一次連線之前呼叫
+    :param app: Flask 應用程式實例
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+
+    from app.utils.database import apply_sqlite_pragmas
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                apply_sqlite_pragmas(engine, pragmas)
+
+
+def create_app(config_class=None):
     """
     應用程式工廠函數
-    :param config_class: 配置類，預設使用 Config
+    :param config_class: 配置類，預設依環境變數 APP_ENV 選擇
     :return: 配置完成的 Flask 應用程式實例
     """
     # 建立 Flask 應用程式實例
     app = Flask(__name__)
+    startup = app.extensions['startup'] = StartupProfiler()
 
     # 載入配置
-    app.config.from_object(config_class)
+    with startup.step('config'):
+        app.config.from_object(config_class or get_config())
+        if not app.config.get('SECRET_KEY'):
+            # 以公開的預設金鑰簽署 session 等同沒有簽署，寧可無法啟動
+            raise RuntimeError('未設定 SECRET_KEY：正式環境請以環境變數 SECRET_KEY 提供隨機且保密的金鑰')
+
+        # 配置檔案上傳
+        configure_uploads(app)
 
-    # 配置檔案上傳
-    configure_uploads(app)
+    with startup.step('templates'):
+        configure_templates(app)
 
     # 初始化擴展
-    db.init_app(app)
-    login_manager.init_app(app)
+    with startup.step('extension:db'):
+        configure_database(app)
+        db.init_app(app)
+        configure_sqlite_pragmas(app)
+    for name, extension in (('login_manager', login_manager), ('password_hasher', password_hasher),
+                            ('limiter', limiter), ('assets', assets), ('warmup', warmup),
+                            ('event_broker', event_broker)):
+        with startup.step(f'extension:{name}'):
+            extension.init_app(app)
 
-    # 註冊藍圖、錯誤處理器和模板過濾器
+    # 註冊藍圖、錯誤處理器、模板過濾器和命令列指令
     register_blueprints(app)
-    register_error_handlers(app)
-    register_template_filters(app)
+    with startup.step('handlers'):
+        register_error_handlers(app)
+        register_template_filters(app)
+        register_commands(app)
 
-    # 建立資料表
-    with app.app_context():
-        db.create_all()
+    # 配置回應壓縮
+    with startup.step('extension:compression'):
+        configure_compression(app)
+
+    # 反向代理之後還原用戶端 IP（限流依 IP 計數），包在最外層
+    configure_proxy_fix(app)
+
+    # 開發環境自動建立資料表；正式環境（AUTO_CREATE_TABLES 為 False）改以 `flask db upgrade` 遷移
+    if app.config.get('AUTO_CREATE_TABLES'):
+        with startup.step('create_all'), app.app_context():
+            db.create_all()
 
     return app
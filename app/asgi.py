@@ -0,0 +1,389 @@
+"""
+ASGI 進入點
+
+    uvicorn --factory app.asgi:create_asgi_app --workers 4
+
+- JSON API 的唯讀端點（app/routes/api_async.py）以非同步 SQLAlchemy 引擎處理，
+  單一工作行程可同時等待多個查詢，而不是每個請求佔用一個執行緒
+- 文章頁的即時事件（/posts/<id>/events）以非同步方式等待事件，連線不佔用執行緒
+- 其餘請求（頁面、表單、登入、需要目前用戶的 API、靜態檔案）交給原本的 Flask 應用程式，
+  在執行緒池（ASGI_WSGI_THREADS）中執行，串流回應逐塊送出
+
+需要安裝非同步資料庫驅動（SQLite 使用 aiosqlite）與 ASGI 伺服器（例如 uvicorn）。
+"""
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from werkzeug.exceptions import HTTPException, InternalServerError
+from werkzeug.routing import Map, Rule
+from app import create_app, db, compression_middleware, warmup, event_broker
+from app.models import Post
+from app.routes.api import handle_http_error
+from app.routes.api_async import url_map, WsgiFallback
+from app.utils.database import REPLICA_BIND_KEY, apply_sqlite_pragmas, pool_options
+from app.utils.events import RECONNECT_DELAY_MS, format_event, post_channel
+
+
+# 同步驅動對應的非同步驅動
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+    'mariadb': 'mariadb+aiomysql',
+}
+
+# 非同步回應在 environ 中的鍵名（交給壓縮中介層處理時使用）
+RESPONSE_KEY = 'app.async_response'
+
+# 以非同步方式處理的 SSE 端點（同 post.events）
+stream_map = Map([
+    Rule('/posts/<int:post_id>/events', endpoint='post_events', methods=['GET']),
+])
+
+
+def build_environ(scope: dict, body: bytes = b'') -> dict:
+    """
+    由 ASGI scope 建立 WSGI environ
+
+    Args:
+        scope: ASGI HTTP scope
+        body: 請求主體
+
+    Returns:
+        dict: WSGI environ
+    """
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else f'HTTP_{name}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def encode_headers(headers: list) -> list:
+    """將 WSGI 回應標頭轉為 ASGI 格式"""
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+
+class WsgiBridge:
+    """
+    在執行緒池中執行 WSGI 應用程式的 ASGI 包裝
+
+    每個請求在單一執行緒中完成呼叫與回應迭代（stream_with_context 等依賴執行緒內
+    context 的回應才能正常運作），回應區塊一產生就送出
+    """
+
+    def __init__(self, wsgi_app, max_workers: int):
+        """
+        Args:
+            wsgi_app: WSGI 應用程式
+            max_workers: 同時處理的最大請求數
+        """
+        self.wsgi_app = wsgi_app
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wsgi')
+
+    async def __call__(self, scope, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+
+        environ = build_environ(scope, bytes(body))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.run, environ, loop, send)
+
+    def run(self, environ: dict, loop, send) -> None:
+        """在工作執行緒中執行 WSGI 應用程式"""
+        def send_message(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        state = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and state.get('sent'):
+                raise exc_info[1].with_traceback(exc_info[2])
+            state['start'] = {
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': encode_headers(headers),
+            }
+
+        def send_start():
+            if not state.get('sent'):
+                send_message(state['start'])
+                state['sent'] = True
+
+        iterable = self.wsgi_app(environ, start_response)
+        try:
+            for chunk in iterable:
+                if chunk:
+                    send_start()
+                    send_message({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            if hasattr(iterable, 'close'):
+                iterable.close()
+
+        send_start()
+        send_message({'type': 'http.response.body', 'body': b''})
+
+
+def async_database_url(app):
+    """
+    取得非同步引擎的資料庫位址
+    預設沿用同步引擎的位址（已設定唯讀副本時使用副本）並換成非同步驅動，
+    可用 ASYNC_DATABASE_URL 指定
+
+    Args:
+        app: Flask 應用程式實例
+
+    Returns:
+        URL: 資料庫位址
+    """
+    if app.config.get('ASYNC_DATABASE_URL'):
+        return make_url(app.config['ASYNC_DATABASE_URL'])
+
+    with app.app_context():
+        url = (db.engines.get(REPLICA_BIND_KEY) or db.engine).url
+
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'不支援的資料庫: {backend}，請設定 ASYNC_DATABASE_URL')
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_async_db_engine(app) -> AsyncEngine:
+    """
+    建立非同步引擎，套用與同步引擎相同的 SQLite PRAGMA 或連線池設定
+
+    Args:
+        app: Flask 應用程式實例
+
+    Returns:
+        AsyncEngine: 非同步引擎
+    """
+    url = async_database_url(app)
+    if url.get_backend_name() == 'sqlite':
+        engine = create_async_engine(url)
+        apply_sqlite_pragmas(engine.sync_engine, app.config.get('SQLITE_PRAGMAS') or {})
+        return engine
+    return create_async_engine(url, **pool_options(app.config))
+
+
+class AsgiApp:
+    """
+    ASGI 應用程式：非同步 API 端點與 Flask 應用程式的分派
+    """
+
+    def __init__(self, flask_app):
+        """
+        Args:
+            flask_app: Flask 應用程式實例
+        """
+        self.flask_app = flask_app
+        self.wsgi = WsgiBridge(flask_app, flask_app.config.get('ASGI_WSGI_THREADS', 32))
+        self.enabled = flask_app.config.get('ASYNC_API_ENABLED', True)
+        self._engine: Optional[AsyncEngine] = None
+        self._sessionmaker = None
+
+        # 非同步回應也經過與 Flask 相同的壓縮處理
+        def respond(environ, start_response):
+            return environ[RESPONSE_KEY](environ, start_response)
+
+        self.finalize = compression_middleware(flask_app, respond) \
+            if flask_app.config.get('COMPRESS_ENABLED') else respond
+
+    @property
+    def sessionmaker(self):
+        """第一次使用時才建立非同步引擎"""
+        if self._sessionmaker is None:
+            self._engine = create_async_db_engine(self.flask_app)
+            self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+        return self._sessionmaker
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+
+        if scope['type'] == 'http' and self.enabled and scope['method'] == 'GET':
+            environ = build_environ(scope)
+            try:
+                endpoint, arguments = url_map.bind_to_environ(environ).match()
+            except HTTPException:
+                endpoint = None
+
+            if endpoint is not None and await self.dispatch(environ, endpoint, arguments, send):
+                return
+
+            try:
+                _, arguments = stream_map.bind_to_environ(environ).match()
+            except HTTPException:
+                arguments = None
+
+            if arguments is not None and await self.stream_events(receive, send, **arguments):
+                return
+
+        if scope['type'] == 'http':
+            await self.wsgi(scope, receive, send)
+
+    async def dispatch(self, environ: dict, endpoint, arguments: dict, send) -> bool:
+        """
+        執行非同步端點並送出回應
+
+        Returns:
+            bool: 是否已處理（False 表示需要交給 Flask）
+        """
+        with self.flask_app.request_context(environ):
+            try:
+                async with self.sessionmaker() as session:
+                    response = await endpoint(session, **arguments)
+            except WsgiFallback:
+                return False
+            except HTTPException as e:
+                response = handle_http_error(e)
+            except Exception as e:
+                self.flask_app.logger.error(f"Error handling async request {environ['PATH_INFO']}: {str(e)}")
+                response = handle_http_error(InternalServerError())
+
+            environ[RESPONSE_KEY] = response
+            started = {}
+
+            def start_response(status, headers, exc_info=None):
+                started['status'] = int(status.split(' ', 1)[0])
+                started['headers'] = headers
+
+            body = self.finalize(environ, start_response)
+            try:
+                content = b''.join(body)
+            finally:
+                if hasattr(body, 'close'):
+                    body.close()
+
+        await send({
+            'type': 'http.response.start',
+            'status': started['status'],
+            'headers': encode_headers(started['headers']),
+        })
+        await send({'type': 'http.response.body', 'body': content})
+        return True
+
+    async def stream_events(self, receive, send, post_id: int) -> bool:
+        """
+        文章即時事件的非同步串流，事件的合併與保持連線方式與 WSGI 版本相同
+
+        Returns:
+            bool: 是否已處理（文章不存在時交給 Flask 回應 404）
+        """
+        async with self.sessionmaker() as session:
+            if await session.scalar(select(Post.id).where(Post.id == post_id)) is None:
+                return False
+
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        subscription = event_broker.subscribe(
+            post_channel(post_id), notify=lambda: loop.call_soon_threadsafe(wakeup.set), limit=False
+        )
+
+        async def wait_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        disconnected = asyncio.ensure_future(wait_disconnect())
+
+        async def send_chunk(text: str):
+            await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': encode_headers([
+                    ('Content-Type', 'text/event-stream; charset=utf-8'),
+                    ('Cache-Control', 'no-cache'),
+                    ('X-Accel-Buffering', 'no'),
+                ]),
+            })
+            await send_chunk(f'retry: {RECONNECT_DELAY_MS}\n\n')
+
+            deadline = loop.time() + event_broker.stream_timeout
+            while not disconnected.done() and not subscription.closed and loop.time() < deadline:
+                wakeup.clear()
+                delay = subscription.ready_in()
+                if delay == 0:
+                    await send_chunk(''.join(format_event(event, data) for event, data in subscription.drain()))
+                    continue
+
+                # 沒有事件時等到保持連線的時間；有事件但尚未到送出間隔時等到可送出
+                timeout = min(event_broker.keepalive if delay is None else delay, deadline - loop.time())
+                waiter = asyncio.ensure_future(wakeup.wait())
+                done, _ = await asyncio.wait({waiter, disconnected}, timeout=max(0.0, timeout),
+                                             return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                if not done and delay is None:
+                    await send_chunk(': keepalive\n\n')
+
+            if not disconnected.done():
+                await send({'type': 'http.response.body', 'body': b''})
+        except OSError:
+            pass  # 用戶端已斷線
+        finally:
+            disconnected.cancel()
+            subscription.close()
+        return True
+
+    async def lifespan(self, receive, send):
+        """處理 ASGI lifespan：啟動時預熱，關閉時釋放非同步引擎的連線並停止事件監聽"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # 預熱完成後伺服器才開始接收請求
+                await asyncio.get_running_loop().run_in_executor(
+                    self.wsgi.executor, warmup.run, self.flask_app
+                )
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._engine is not None:
+                    await self._engine.dispose()
+                event_broker.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(flask_app=None) -> AsgiApp:
+    """
+    ASGI 應用程式工廠函數
+
+    Args:
+        flask_app: Flask 應用程式實例，預設以 create_app() 建立
+
+    Returns:
+        AsgiApp: ASGI 應用程式
+    """
+    return AsgiApp(flask_app or create_app())
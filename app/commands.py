@@ -0,0 +1,286 @@
+import os
+import click
+from flask import current_app
+from flask.cli import ScriptInfo, with_appcontext
+
+
+@click.command('compress-static')
+@click.option('--min-size', default=None, type=int, help='壓縮的最小位元組數')
+@with_appcontext
+def compress_static_command(min_size):
+    """預先壓縮靜態檔案，產生 .gz 與 .br"""
+    from app.utils.compression import precompress_static, brotli
+
+    min_size = min_size if min_size is not None else current_app.config['COMPRESS_MIN_SIZE']
+    written = precompress_static(current_app.static_folder, min_size=min_size)
+
+    if brotli is None:
+        click.echo('未安裝 brotli，只產生 .gz 檔')
+    click.echo(f'已產生 {len(written)} 個壓縮檔')
+
+
+@click.group('assets')
+def assets_cli():
+    """靜態資源管理"""
+
+
+@assets_cli.command('vendor')
+@with_appcontext
+def vendor_command():
+    """下載第三方資源（Bootstrap、Bootstrap Icons、字型）到 static/vendor"""
+    from app.utils.assets import vendor_assets
+
+    written = vendor_assets(current_app.static_folder)
+    click.echo(f'已下載 {len(written)} 個檔案')
+
+
+@assets_cli.command('build')
+@click.option('--keep', default=None, type=int, help='保留最近幾次建置的檔案（含本次）')
+@click.option('--no-fetch', is_flag=True, help='缺少第三方資源時不自動下載')
+@with_appcontext
+def build_command(keep, no_fetch):
+    """打包、精簡並以內容雜湊命名資源，輸出到 static/dist"""
+    from app import assets
+    from app.utils.assets import build_assets, missing_vendor_files, vendor_assets, DIST_FOLDER
+    from app.utils.compression import precompress_static
+
+    # 第三方資源不在版本庫中，全新的 checkout 先下載缺少的檔案
+    missing = missing_vendor_files(current_app.static_folder)
+    if missing:
+        if no_fetch:
+            raise click.ClickException('缺少第三方資源，請先執行 flask assets vendor：' + ', '.join(missing))
+        try:
+            written = vendor_assets(current_app.static_folder, only_missing=True)
+        except OSError as e:
+            raise click.ClickException(f'下載第三方資源失敗：{e}')
+        click.echo(f'已下載 {len(written)} 個缺少的第三方資源檔案')
+
+    manifest = build_assets(current_app.static_folder,
+                            keep if keep is not None else current_app.config['ASSETS_KEEP_BUILDS'])
+    for name, output in sorted(manifest.items()):
+        click.echo(f'{name} -> {DIST_FOLDER}/{output}')
+
+    # 一併預先壓縮，靜態請求可直接送出壓縮檔
+    dist = os.path.join(current_app.static_folder, DIST_FOLDER)
+    precompress_static(dist, min_size=current_app.config['COMPRESS_MIN_SIZE'])
+    assets.load_manifest()
+
+
+@click.group('posts')
+def posts_cli():
+    """文章管理"""
+
+
+@posts_cli.command('render')
+@click.option('--all', 'rerender_all', is_flag=True, help='重新產生所有文章與留言（調整轉換設定後使用）')
+@with_appcontext
+def render_posts_command(rerender_all):
+    """為既有文章與留言產生預先轉換的 HTML 與摘要"""
+    from app.services import PostService, CommentService
+
+    posts = PostService.render_stored_posts(rerender_all)
+    comments = CommentService.render_stored_comments(rerender_all)
+    click.echo(f'已處理 {posts} 篇文章、{comments} 則留言')
+
+
+@posts_cli.command('related')
+@with_appcontext
+def related_posts_command():
+    """重新計算所有文章的相關文章（初次建立、調整相關文章設定後使用，並建議以排程定期執行以修正增量更新的近似分數）"""
+    from app.services import RelatedPostService
+
+    posts = RelatedPostService.rebuild()
+    click.echo(f'已計算 {posts} 篇文章的相關文章')
+
+
+@click.group('stats')
+def stats_cli():
+    """網站統計"""
+
+
+@stats_cli.command('rollup')
+@click.option('--full', is_flag=True, help='清除後完整重建所有日期')
+@with_appcontext
+def rollup_stats_command(full):
+    """將每日統計彙總寫入 daily_stats（建議以排程每小時或每日執行）"""
+    from app.services import StatsService
+
+    days = StatsService.rollup_daily_stats(full=full)
+    click.echo(f'已彙總 {days} 天的統計資料')
+
+
+@click.group('replica')
+def replica_cli():
+    """唯讀副本管理"""
+
+
+@replica_cli.command('sync')
+@with_appcontext
+def sync_replica_command():
+    """將主資料庫複製到唯讀副本（只用於本機以兩個 SQLite 檔案模擬主從架構）"""
+    from app import db
+    from app.utils.database import REPLICA_BIND_KEY, sync_sqlite_replica
+
+    replica = db.engines.get(REPLICA_BIND_KEY)
+    if replica is None:
+        raise click.ClickException('未設定 DATABASE_REPLICA_URL')
+
+    sync_sqlite_replica(db.engine, replica)
+    click.echo(f'已同步到 {replica.url}')
+
+
+@click.group('templates')
+def templates_cli():
+    """模板管理"""
+
+
+@templates_cli.command('compile')
+@click.option('--clear', is_flag=True, help='編譯前清除快取目錄中的所有位元組碼')
+@with_appcontext
+def compile_templates_command(clear):
+    """預先編譯所有模板並寫入位元組碼快取（建置或部署時執行）"""
+    from jinja2 import FileSystemBytecodeCache
+    from app.utils.templates import bytecode_cache_dir, precompile_templates
+
+    # 未啟用 TEMPLATE_BYTECODE_CACHE 時仍寫入同一目錄，供正式環境使用
+    directory = bytecode_cache_dir(current_app)
+    os.makedirs(directory, exist_ok=True)
+    cache = FileSystemBytecodeCache(directory)
+    if clear:
+        cache.clear()
+
+    count = precompile_templates(current_app.jinja_env, cache)
+    click.echo(f'已編譯 {count} 個模板到 {directory}')
+
+
+@click.group('notifications')
+def notifications_cli():
+    """通知管理"""
+
+
+@notifications_cli.command('digest')
+@with_appcontext
+def digest_command():
+    """寄出未讀通知的摘要郵件（建議以排程每日執行），所有郵件使用同一條 SMTP 連線"""
+    import smtplib
+    from app.services import NotificationService
+
+    try:
+        sent, included = NotificationService.send_digests()
+    except (RuntimeError, smtplib.SMTPException, OSError) as e:
+        raise click.ClickException(f'寄送失敗：{e}')
+    click.echo(f'已寄出 {sent} 封摘要郵件，包含 {included} 則通知')
+
+
+@notifications_cli.command('recount')
+@with_appcontext
+def recount_notifications_command():
+    """依通知表重新計算所有用戶的未讀通知數"""
+    from app.services import NotificationService
+
+    updated = NotificationService.recount_unread()
+    click.echo(f'已修正 {updated} 位用戶的未讀通知數')
+
+
+@click.group('feed')
+def feed_cli():
+    """首頁動態管理"""
+
+
+@feed_cli.command('trim')
+@click.option('--max-entries', default=None, type=int, help='每位用戶保留的動態筆數')
+@with_appcontext
+def trim_feed_command(max_entries):
+    """刪除每位用戶超過保留筆數的較舊動態（建議以排程每日執行）"""
+    from app.services import FeedService
+
+    deleted = FeedService.trim(max_entries)
+    click.echo(f'已刪除 {deleted} 筆動態')
+
+
+@feed_cli.command('rebuild')
+@with_appcontext
+def rebuild_feed_command():
+    """依追蹤關係重建所有用戶的動態"""
+    from app.services import FeedService
+
+    users = FeedService.rebuild()
+    click.echo(f'已重建 {users} 位用戶的動態')
+
+
+class MigrateGroup(click.Group):
+    """
+    `flask db` 指令群組：第一次使用時才初始化 Flask-Migrate 並載入 alembic，
+    網站工作行程不需負擔其匯入成本
+    """
+
+    def load_commands(self, ctx: click.Context) -> click.Group:
+        """
+        初始化 Flask-Migrate 並回傳其指令群組
+        群組層級尚未推入應用程式上下文（例如 app.test_cli_runner()），由 ScriptInfo 取得應用程式
+        """
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_cli
+        from app import db
+
+        app = ctx.ensure_object(ScriptInfo).load_app()
+        if 'migrate' not in app.extensions:
+            with app.app_context():
+                Migrate(app, db,
+                        directory=app.config['MIGRATIONS_DIRECTORY'],
+                        render_as_batch=db.engine.dialect.name == 'sqlite')
+        return db_cli
+
+    def list_commands(self, ctx):
+        return self.load_commands(ctx).list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self.load_commands(ctx).get_command(ctx, name)
+
+
+migrate_cli = MigrateGroup('db', help='資料庫遷移（Flask-Migrate）')
+
+
+@click.group('startup')
+def startup_cli():
+    """應用程式啟動分析"""
+
+
+@startup_cli.command('profile')
+@click.option('--top', default=10, type=int, help='列出匯入耗時最多的套件數')
+def profile_startup_command(top):
+    """在新的行程中建立應用程式，列出各擴展、藍圖的匯入與初始化耗時"""
+    from app.utils.startup import profile_startup
+
+    try:
+        report = profile_startup()
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"啟動耗時 {report['total'] * 1000:.0f} ms")
+    click.echo(f"{'步驟':<28}{'總計(ms)':>8}{'匯入(ms)':>8}{'模組數':>5}")
+    for step in report['steps']:
+        click.echo(f"{step['name']:<30}{step['seconds'] * 1000:>10.1f}"
+                   f"{step['import_seconds'] * 1000:>10.1f}{step['module_count']:>8}")
+
+    click.echo('')
+    click.echo('匯入耗時最多的套件（模組自身耗時加總）')
+    for package, seconds in list(report['packages'].items())[:top]:
+        click.echo(f"  {package:<28}{seconds * 1000:>10.1f}")
+
+
+def register_commands(app):
+    """
+    註冊命令列指令
+    :param app: Flask 應用程式實例
+    """
+    app.cli.add_command(compress_static_command)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(posts_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(replica_cli)
+    app.cli.add_command(templates_cli)
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(feed_cli)
+    app.cli.add_command(migrate_cli)
+    app.cli.add_command(startup_cli)
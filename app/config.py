@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 
 
 try:
@@ -13,15 +14,210 @@ class Config:
         'sqlite:///app.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    # 其他配置項
+    # 部署版本（例如 git commit），納入頁面 ETag，部署後瀏覽器不會沿用舊版本的頁面
+    APP_VERSION = os.environ.get('APP_VERSION')
+
+    # 啟動時以 db.create_all() 建立缺少的資料表（每次啟動都會檢查資料庫結構）
+    # 關閉時改以 `flask db upgrade` 套用 migrations/ 中的遷移
+    AUTO_CREATE_TABLES = True
+    MIGRATIONS_DIRECTORY = os.environ.get('MIGRATIONS_DIRECTORY') or \
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+    # 唯讀副本（設定後，列表、搜尋、統計等唯讀查詢改用副本）
+    SQLALCHEMY_BINDS = {'replica': os.environ['DATABASE_REPLICA_URL']} \
+        if os.environ.get('DATABASE_REPLICA_URL') else {}
+
+    # SQLite 連線 PRAGMA（每個新連線建立時設定），例如 {'journal_mode': 'WAL'}
+    SQLITE_PRAGMAS = {}
+
+    # ASGI 模式（app/asgi.py）：API 唯讀端點使用非同步引擎，預設沿用上方資料庫位址並換成非同步驅動
+    ASYNC_API_ENABLED = os.environ.get('ASYNC_API_DISABLED') is None
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS') or 32)  # ASGI 模式下處理 Flask 請求的執行緒數
+
+    # 伺服器資料庫（PostgreSQL、MySQL）連線池設定，None 表示使用 SQLAlchemy 預設值
+    DB_POOL_SIZE = None
+    DB_MAX_OVERFLOW = None
+    DB_POOL_TIMEOUT = None
+    DB_POOL_RECYCLE = None
+    DB_POOL_PRE_PING = False
+
+    # 密碼雜湊（例如 'scrypt:32768:8:1' 或 'pbkdf2:sha256:600000'）
+    # 調整後，舊密碼會在用戶下次成功登入時自動升級
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt'
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH') or 16)
+
+    # 密碼雜湊行程池（預設關閉，工作行程數預設為 CPU 核心數）
+    # 進行中的雜湊工作超過「工作行程數 + 排隊數」時回應 503 與 Retry-After
+    PASSWORD_HASH_EXECUTOR = os.environ.get('PASSWORD_HASH_EXECUTOR') is not None
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 0) or None
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ['PASSWORD_HASH_QUEUE_SIZE']) \
+        if os.environ.get('PASSWORD_HASH_QUEUE_SIZE') else None
+    PASSWORD_HASH_TIMEOUT = 10
+    PASSWORD_HASH_RETRY_AFTER = 1
+
+    # 請求速率限制
+    # 儲存位址：'memory://'（單一行程）、'sqlite:///<路徑>'（相對路徑放在 instance 目錄）或 'redis://...'（多工作行程共享）
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_DISABLED') is None
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL') or 'memory://'
+    RATELIMIT_LOGIN_PER_IP = '20/minute'
+    RATELIMIT_LOGIN_PER_ACCOUNT = '5/minute'
+    RATELIMIT_REGISTER_PER_IP = '10/hour'
+    RATELIMIT_PASSWORD_CHECK_PER_IP = '60/minute'
+    RATELIMIT_AVAILABILITY_PER_IP = '120/minute'
+    # 反向代理（nginx 等）的層數：依 X-Forwarded-For / X-Forwarded-Proto 還原用戶端 IP 與協定
+    # 為 0 時使用連線的位址；在代理之後卻維持 0，所有用戶共用代理的 IP，依 IP 的限制會變成全站共用
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR') or 0)
+    PROXY_FIX_X_PROTO = int(os.environ.get('PROXY_FIX_X_PROTO') or 0)
+
+    # 用戶名與電子郵件可用性過濾器（布隆過濾器）
+    AVAILABILITY_FILTER_ERROR_RATE = 0.01
+    AVAILABILITY_FILTER_MAX_AGE = 300  # 秒，定期重建以納入其他工作行程新增的用戶
+
+    # Jinja 位元組碼快取：編譯後的模板寫入檔案，工作行程重啟或新增執行個體時直接載入，不需重新編譯
+    # 目錄預設為 instance/jinja_cache，部署時以 `flask templates compile` 預先產生
+    TEMPLATE_BYTECODE_CACHE = os.environ.get('TEMPLATE_BYTECODE_CACHE') is not None
+    TEMPLATE_BYTECODE_CACHE_DIR = os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR')
+
+    # 文章頁即時更新（SSE）：按讚數與新留言
+    # 傳遞位址：'memory://'（單一行程）、'sqlite:///<路徑>'（同一台機器的多工作行程，相對路徑放在 instance 目錄）或 'redis://...'
+    EVENTS_BACKEND_URL = os.environ.get('EVENTS_BACKEND_URL') or 'memory://'
+    EVENTS_MIN_INTERVAL = 0.5     # 秒，每個連線最多每隔此時間送出一次，期間的事件合併送出
+    EVENTS_KEEPALIVE = 15         # 秒，沒有事件時送出保持連線的註解
+    EVENTS_STREAM_TIMEOUT = 300   # 秒，連線到期後結束，由瀏覽器重新連線
+    EVENTS_MAX_PENDING = 100      # 每個連線最多暫存的事件數
+    # WSGI 模式下每個連線佔用一個執行緒，超過此數量時回應 503（ASGI 模式的連線不受限制）
+    EVENTS_MAX_STREAMS = int(os.environ.get('EVENTS_MAX_STREAMS') or 100)
+
+    # 工作行程預熱（wsgi.py / gunicorn.conf.py 與 ASGI 模式在開始處理請求前執行）
+    # WARMUP_REQUIRED 為 True 時，預熱完成前 /readyz 回應 503
+    WARMUP_REQUIRED = False
+    WARMUP_PATHS = ['/', '/posts/', '/members', '/api/v1/posts']
+    WARMUP_DB_CONNECTIONS = 1
+    WARMUP_IMPORTS = []  # 預熱時匯入的延遲載入模組
+
+    # 郵件（通知摘要）：`flask notifications digest` 在同一條 SMTP 連線上寄出所有摘要
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 25)
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS') is not None
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or 'noreply@localhost'
+    MAIL_TIMEOUT = 30  # 秒
+    # 郵件中的連結網址
+    SITE_URL = os.environ.get('SITE_URL') or 'http://localhost:5000'
+
+    # 首頁動態：追蹤者少於門檻的作者於發文時推送到每位追蹤者的動態，達門檻的作者於讀取時合併
+    FEED_FANOUT_THRESHOLD = int(os.environ.get('FEED_FANOUT_THRESHOLD') or 1000)
+    FEED_MAX_ENTRIES = 500   # 每位用戶保留的動態筆數（`flask feed trim` 刪除較舊的項目）
+    FEED_BACKFILL = 20       # 追蹤時補進動態的文章數
+    FEED_PAGE_SIZE = 20
+
+    # 相關文章（TF-IDF 餘弦相似度，發文或編輯時增量計算）
+    RELATED_POSTS_COUNT = 5            # 每篇文章保存的相關文章數
+    RELATED_POSTS_MIN_SCORE = 0.05     # 低於此相似度不列入
+    RELATED_POSTS_MAX_TERMS = 32       # 每篇文章只保留權重最高的詞
+    RELATED_POSTS_MAX_DF = 0.5         # 出現在超過此比例文章中的詞視為常用詞而忽略
+    RELATED_POSTS_CANDIDATES = 50      # 增量更新時重新計算相關文章的相似文章數
+    RELATED_POSTS_INDEX_MAX_AGE = 600  # 行程內索引的有效秒數，過期後文章表有變更才在背景重建
+
+    # 通知
+    NOTIFICATIONS_PER_PAGE = 20
+    NOTIFICATION_DIGEST_MAX_ITEMS = 20  # 摘要郵件中最多列出的通知數
+
+    # 回應壓縮（安裝 brotli 時優先使用 brotli）
+    # 執行 `flask compress-static` 預先壓縮靜態檔案
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_DISABLED') is None
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+
+    # `flask assets build` 保留最近幾次建置的檔案，部署後仍被快取頁面引用的舊版本不會 404
+    ASSETS_KEEP_BUILDS = 3
+
+    # 首頁用戶活動統計的快取秒數（本行程的寫入會立即失效，其他工作行程的寫入最晚在此時間後反映）
+    USER_STATS_CACHE_TTL = 60
+
+    # 管理後台分析資料的快取秒數（依時間範圍）
+    ANALYTICS_CACHE_TTL = 300
+
+    # 文章與留言內容以 Markdown 轉換（需安裝 markdown 套件，否則只轉換換行）
+    # 轉換結果於儲存時產生，調整後執行 `flask posts render --all` 重新產生
+    CONTENT_MARKDOWN_ENABLED = os.environ.get('CONTENT_MARKDOWN_ENABLED') is not None
 
     # 用戶大頭貼
     POSTS_PER_PAGE = 10
     DEFAULT_PAGE_SIZE = 10
     UPLOAD_FOLDER = 'static/uploads'
     MAX_CONTENT_LENGTH = 1 * 1024 * 1024  # 1MB
+
+
+class ProductionConfig(Config):
+    """
+    正式環境配置（APP_ENV=production）
+
+    - SQLite 啟用 WAL：讀取不再被寫入阻擋，搭配 synchronous=NORMAL 減少每次提交的 fsync
+    - 伺服器資料庫使用固定大小的連線池，借出前先檢查連線，並定期回收避免被伺服器端逾時關閉
+    - 啟動時不建立資料表，部署時先執行 `flask db upgrade`
+    - 必須設定 SECRET_KEY 環境變數，不沿用開發用的預設值（未設定時 create_app 拒絕啟動）
+    """
+    SECRET_KEY = os.environ.get('SECRET_KEY')
+
+    AUTO_CREATE_TABLES = os.environ.get('AUTO_CREATE_TABLES') is not None
+
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT') or 5000),   # 毫秒
+        'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB') or 65536),  # 負值單位為 KiB
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE') or 268435456),    # 位元組
+        'temp_store': 'MEMORY',
+    }
+
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = 10
+    DB_POOL_RECYCLE = 1800
+    DB_POOL_PRE_PING = True
+
+    TEMPLATE_BYTECODE_CACHE = os.environ.get('TEMPLATE_BYTECODE_CACHE_DISABLED') is None
+
+    WARMUP_REQUIRED = True
+    WARMUP_DB_CONNECTIONS = int(os.environ.get('GUNICORN_THREADS') or 4)
+
+    # gunicorn 有多個工作行程，限流計數預設存在 instance 目錄的 SQLite 檔案中共享
+    # （memory:// 會讓每個工作行程各自計數，實際上限變成設定值乘以工作行程數）
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL') or 'sqlite:///ratelimit.db'
+
+    # 即時事件預設經由 instance 目錄的 SQLite 檔案傳到所有工作行程
+    # （memory:// 只會送到處理該請求的工作行程上的連線）
+    EVENTS_BACKEND_URL = os.environ.get('EVENTS_BACKEND_URL') or 'sqlite:///events.db'
+
+    # gunicorn 的 SSE 連線最多佔用每個工作行程一半的執行緒，其餘保留給一般請求
+    EVENTS_MAX_STREAMS = int(os.environ.get('EVENTS_MAX_STREAMS') or
+                             max(1, int(os.environ.get('GUNICORN_THREADS') or 4) // 2))
+    WARMUP_IMPORTS = ['numpy', 'PIL.Image', 'app.utils.tfidf']
+
+
+# APP_ENV 對應的配置類
+config_by_name = {
+    'development': Config,
+    'production': ProductionConfig,
+}
+
+
+def get_config(name: Optional[str] = None):
+    """
+    依名稱取得配置類
+
+    Args:
+        name: 配置名稱，預設讀取環境變數 APP_ENV（未設定時為 development）
+
+    Returns:
+        配置類
+    """
+    name = (name or os.environ.get('APP_ENV') or 'development').lower()
+    try:
+        return config_by_name[name]
+    except KeyError:
+        raise ValueError(f"未知的 APP_ENV: {name}，可用值: {', '.join(config_by_name)}")
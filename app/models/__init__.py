@@ -2,6 +2,11 @@ from .user import User
 from .post import Post
 from .comment import Comment
 from .like import Like
+from .daily_stats import DailyStats
+from .notification import Notification
+from .follow import Follow
+from .feed_entry import FeedEntry
+from .related_post import RelatedPost
 
 
-__all__ = ['User', 'Post', 'Comment', 'Like']
+__all__ = ['User', 'Post', 'Comment', 'Like', 'DailyStats', 'Notification', 'Follow', 'FeedEntry', 'RelatedPost']
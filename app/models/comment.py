@@ -9,6 +9,7 @@ class Comment(db.Model):
     # 基本欄位
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False, comment='留言內容')
+    content_html = db.Column(db.Text, comment='儲存時預先轉換的留言 HTML')
 
     # 時間相關欄位
     created_at = db.Column(db.DateTime, default=datetime.now, comment='創建時間')
@@ -19,18 +20,23 @@ class Comment(db.Model):
     post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False, comment='文章ID')
     parent_id = db.Column(db.Integer, db.ForeignKey('comment.id'), comment='父留言ID，用於回覆功能')
 
-    # 關聯關係
+    # 依時間範圍統計時只需掃描索引（涵蓋用戶ID），不必回表讀取資料列
+    __table_args__ = (
+        db.Index('ix_comment_created_at_user_id', 'created_at', 'user_id'),
+    )
+
+    # 關聯關係（可使用 selectinload 批次預先載入）
     replies = db.relationship(
         'Comment',
         backref=db.backref('parent', remote_side=[id]),
-        lazy='dynamic',
+        order_by='Comment.created_at',
         cascade='all, delete-orphan'
     )
 
     @property
     def reply_count(self):
         """獲取回覆數量"""
-        return self.replies.count()
+        return len(self.replies)
 
     def __repr__(self):
         return f'<Comment {self.id}>'
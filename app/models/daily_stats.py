@@ -0,0 +1,42 @@
+from app import db
+from datetime import datetime
+
+
+class DailyStats(db.Model):
+    """
+    每日統計彙總模型
+    由 `flask stats rollup` 增量寫入；累計欄位讓任意日期區間的總數只需讀取兩筆資料
+    """
+    __tablename__ = 'daily_stats'
+
+    # 日期（主鍵）
+    day = db.Column(db.Date, primary_key=True, comment='統計日期')
+
+    # 當日數量
+    signups = db.Column(db.Integer, nullable=False, default=0, comment='新註冊用戶數')
+    active_users = db.Column(db.Integer, nullable=False, default=0, comment='當日活躍用戶數（發文、留言、按讚或登入）')
+    posts = db.Column(db.Integer, nullable=False, default=0, comment='新文章數')
+    comments = db.Column(db.Integer, nullable=False, default=0, comment='新留言數')
+    likes = db.Column(db.Integer, nullable=False, default=0, comment='新按讚數')
+
+    # 截至當日的累計數量
+    total_users = db.Column(db.Integer, nullable=False, default=0, comment='累計用戶數')
+    total_active_users = db.Column(db.Integer, nullable=False, default=0, comment='累計每日活躍用戶數（人日）')
+    total_posts = db.Column(db.Integer, nullable=False, default=0, comment='累計文章數')
+    total_comments = db.Column(db.Integer, nullable=False, default=0, comment='累計留言數')
+    total_likes = db.Column(db.Integer, nullable=False, default=0, comment='累計按讚數')
+
+    # 時間相關欄位
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='彙總時間')
+
+    # 當日數量欄位與對應的累計欄位
+    COUNTERS = {
+        'signups': 'total_users',
+        'active_users': 'total_active_users',
+        'posts': 'total_posts',
+        'comments': 'total_comments',
+        'likes': 'total_likes',
+    }
+
+    def __repr__(self):
+        return f'<DailyStats {self.day}>'
@@ -0,0 +1,22 @@
+from app import db
+
+
+class FeedEntry(db.Model):
+    """
+    首頁動態項目：發文時推送到每位追蹤者（以及作者本人）的動態
+    只存放ID，以 (user_id, post_id) 為主鍵，一頁動態是一次主鍵範圍讀取；
+    文章ID遞增，依 post_id 排序即為發文時間順序
+    """
+    __tablename__ = 'feed_entry'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, comment='動態擁有者ID')
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), primary_key=True, comment='文章ID')
+    author_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, comment='作者ID（取消追蹤時移除）')
+
+    # SQLite 以主鍵直接組織資料表（WITHOUT ROWID），不需額外的 rowid 與索引
+    __table_args__ = (
+        {'sqlite_with_rowid': False},
+    )
+
+    def __repr__(self):
+        return f'<FeedEntry User {self.user_id}: Post {self.post_id}>'
@@ -0,0 +1,27 @@
+from app import db
+from datetime import datetime
+
+
+class Follow(db.Model):
+    """追蹤關係模型"""
+    __tablename__ = 'follow'
+
+    # 複合主鍵 (follower_id, followed_id)：查詢「我追蹤的人」直接掃描主鍵
+    follower_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True,
+                            comment='追蹤者ID')
+    followed_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True,
+                            comment='被追蹤者ID')
+    created_at = db.Column(db.DateTime, default=datetime.now, comment='追蹤時間')
+
+    # 發文時依被追蹤者找出所有追蹤者（寫入時推送）
+    __table_args__ = (
+        db.Index('ix_follow_followed_id_follower_id', 'followed_id', 'follower_id'),
+    )
+
+    # 關聯關係（用戶端不建立集合，追蹤清單與追蹤者使用 FollowService 查詢；
+    # 刪除用戶時由外鍵的 ON DELETE CASCADE 刪除追蹤關係，SQLite 需啟用 PRAGMA foreign_keys）
+    follower = db.relationship('User', foreign_keys=[follower_id])
+    followed = db.relationship('User', foreign_keys=[followed_id])
+
+    def __repr__(self):
+        return f'<Follow User {self.follower_id} -> User {self.followed_id}>'
@@ -17,6 +17,8 @@ class Like(db.Model):
     # 確保每個用戶只能對同一篇文章按讚一次
     __table_args__ = (
         db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_like'),
+        # 依時間範圍統計時只需掃描索引（涵蓋用戶ID），不必回表讀取資料列
+        db.Index('ix_likes_created_at_user_id', 'created_at', 'user_id'),
     )
 
     def __repr__(self):
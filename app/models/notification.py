@@ -0,0 +1,75 @@
+from app import db
+from datetime import datetime
+
+
+class Notification(db.Model):
+    """通知模型：其他用戶對自己的文章或留言按讚、留言、回覆"""
+    __tablename__ = 'notification'
+
+    # 通知類型
+    KIND_LIKE = 'like'        # 文章被按讚
+    KIND_COMMENT = 'comment'  # 文章有新留言
+    KIND_REPLY = 'reply'      # 留言被回覆
+
+    # 通知頁與摘要郵件顯示的文字
+    VERBS = {
+        KIND_LIKE: '對你的文章按讚',
+        KIND_COMMENT: '在你的文章留言',
+        KIND_REPLY: '回覆了你的留言',
+    }
+
+    # 基本欄位
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(16), nullable=False, comment='通知類型：like、comment、reply')
+
+    # 時間相關欄位
+    created_at = db.Column(db.DateTime, default=datetime.now, nullable=False, comment='創建時間')
+    read_at = db.Column(db.DateTime, comment='已讀時間')
+    emailed_at = db.Column(db.DateTime, comment='寄出摘要郵件的時間')
+
+    # 外鍵關聯
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, comment='接收者ID')
+    actor_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, comment='觸發者ID')
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False, comment='文章ID')
+    comment_id = db.Column(db.Integer, db.ForeignKey('comment.id'), comment='留言ID（按讚時為空）')
+
+    __table_args__ = (
+        # 通知頁依接收者由新到舊分頁
+        db.Index('ix_notification_user_id_id', 'user_id', 'id'),
+        # 摘要郵件只掃描尚未寄出的通知
+        db.Index('ix_notification_emailed_at_user_id', 'emailed_at', 'user_id'),
+    )
+
+    # 關聯關係（通知頁以 selectinload 批次預先載入；刪除文章或留言時一併刪除相關通知）
+    # 用戶端不建立集合，查詢用戶的通知使用 NotificationService；
+    # 刪除用戶時由外鍵的 ON DELETE CASCADE 刪除（SQLite 需啟用 PRAGMA foreign_keys）
+    recipient = db.relationship('User', foreign_keys=[user_id])
+    actor = db.relationship('User', foreign_keys=[actor_id])
+    post = db.relationship('Post', backref=db.backref('notifications', cascade='all, delete-orphan'))
+    comment = db.relationship('Comment', backref=db.backref('notifications', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<Notification {self.id}: {self.kind} User {self.actor_id} -> User {self.user_id}>'
+
+    @property
+    def is_read(self):
+        """是否已讀"""
+        return self.read_at is not None
+
+    @property
+    def verb(self):
+        """通知的動作描述"""
+        return self.VERBS.get(self.kind, '')
+
+    def to_dict(self):
+        """轉換為字典格式（用於API回應）"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'created_at': self.created_at.isoformat(),
+            'read': self.is_read,
+            'user_id': self.user_id,
+            'actor_id': self.actor_id,
+            'post_id': self.post_id,
+            'comment_id': self.comment_id
+        }
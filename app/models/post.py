@@ -1,3 +1,4 @@
+from sqlalchemy import func
 from app import db
 from datetime import datetime
 
@@ -10,6 +11,8 @@ class Post(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False, comment='標題')
     content = db.Column(db.Text, nullable=False, comment='內容')
+    content_html = db.Column(db.Text, comment='儲存時預先轉換的內容 HTML')
+    excerpt = db.Column(db.String(300), comment='儲存時預先產生的摘要')
 
     # 時間相關欄位
     created_at = db.Column(db.DateTime, default=datetime.now, comment='創建時間')
@@ -18,25 +21,54 @@ class Post(db.Model):
     # 外鍵
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, comment='作者ID')
 
-    # 關聯關係
-    comments = db.relationship('Comment', backref='post', lazy='dynamic', cascade='all, delete-orphan')
-    likes = db.relationship('Like', backref='post', lazy='dynamic', cascade='all, delete-orphan')
+    # 依時間範圍統計時只需掃描索引（涵蓋用戶ID），不必回表讀取資料列
+    __table_args__ = (
+        db.Index('ix_post_created_at_user_id', 'created_at', 'user_id'),
+        # 動態讀取時依作者由新到舊取得文章（追蹤者眾多、不推送的作者）
+        db.Index('ix_post_user_id_id', 'user_id', 'id'),
+    )
+
+    # 關聯關係（可使用 selectinload / joinedload 批次預先載入）
+    comments = db.relationship('Comment', backref='post', order_by='Comment.created_at',
+                               cascade='all, delete-orphan')
+    likes = db.relationship('Like', backref='post', cascade='all, delete-orphan')
 
     @property
-    def like_count(self):
-        """獲取按讚數量"""
-        return self.likes.count()
+    def like_count(self) -> int:
+        """
+        獲取按讚數量
+        列表頁可先以 PostService.prefetch_counts 批次載入，避免每篇文章各查詢一次
+        """
+        count = self.__dict__.get('_like_count')
+        if count is None:
+            from app.models.like import Like
+            count = db.session.query(func.count(Like.id)).filter(Like.post_id == self.id).scalar()
+            self._like_count = count
+        return count
 
     @property
     def comments_count(self) -> int:
-        """獲取留言數量"""
-        return self.comments.count()
+        """
+        獲取留言數量（包含回覆）
+        已預先載入留言時直接計算，否則查詢（或由 PostService.prefetch_counts 批次載入）
+        """
+        count = self.__dict__.get('_comments_count')
+        if count is None:
+            if 'comments' in self.__dict__:
+                return len(self.comments)
+            from app.models.comment import Comment
+            count = db.session.query(func.count(Comment.id)).filter(Comment.post_id == self.id).scalar()
+            self._comments_count = count
+        return count
 
     def is_liked_by(self, user):
         """檢查用戶是否已按讚此文章"""
         if not user:
             return False
-        return bool(self.likes.filter_by(user_id=user.id).first())
+        from app.models.like import Like
+        return db.session.query(
+            Like.query.filter_by(post_id=self.id, user_id=user.id).exists()
+        ).scalar()
 
     def __repr__(self):
         return f'<Post {self.id}>'
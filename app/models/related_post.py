@@ -0,0 +1,22 @@
+from app import db
+from datetime import datetime
+
+
+class RelatedPost(db.Model):
+    """
+    相關文章：每篇文章依 TF-IDF 餘弦相似度預先計算的前幾篇相似文章
+    詳情頁以 (post_id, score) 索引一次讀取
+    """
+    __tablename__ = 'related_post'
+
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), primary_key=True, comment='文章ID')
+    related_post_id = db.Column(db.Integer, db.ForeignKey('post.id'), primary_key=True, comment='相關文章ID')
+    score = db.Column(db.Float, nullable=False, comment='餘弦相似度')
+    computed_at = db.Column(db.DateTime, default=datetime.now, nullable=False, comment='計算時間')
+
+    __table_args__ = (
+        db.Index('ix_related_post_post_id_score', 'post_id', 'score'),
+    )
+
+    def __repr__(self):
+        return f'<RelatedPost {self.post_id} -> {self.related_post_id}: {self.score:.3f}>'
@@ -1,6 +1,5 @@
-from app import db, login_manager
+from app import db, login_manager, password_hasher
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
 
@@ -18,21 +17,30 @@ class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(64), unique=True, index=True, nullable=False, comment='用戶名')
     email = db.Column(db.String(120), unique=True, index=True, nullable=False, comment='電子郵件')
-    password_hash = db.Column(db.String(128), comment='密碼雜湊')
+    password_hash = db.Column(db.String(256), comment='密碼雜湊')
     avatar_path = db.Column(db.String(200), nullable=True, comment='頭像路徑')
 
     # 時間相關欄位
-    created_at = db.Column(db.DateTime, default=datetime.now, comment='創建時間')
-    last_login = db.Column(db.DateTime, default=datetime.now, comment='最後登入時間')
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True, comment='創建時間')
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, comment='更新時間')
+    last_login = db.Column(db.DateTime, default=datetime.now, index=True, comment='最後登入時間')
 
     # 狀態欄位
     is_active = db.Column(db.Boolean, default=True, comment='是否啟用')
     is_admin = db.Column(db.Boolean, default=False, comment='是否為管理員')
 
-    # 關聯關係
-    posts = db.relationship('Post', backref='author', lazy='dynamic', cascade='all, delete-orphan')
-    comments = db.relationship('Comment', backref='author', lazy='dynamic', cascade='all, delete-orphan')
-    likes = db.relationship('Like', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    # 計數欄位（寫入通知時同一交易遞增，導覽列不需計算通知表）
+    unread_notifications = db.Column(db.Integer, default=0, server_default='0', nullable=False,
+                                     comment='未讀通知數')
+    # 追蹤數（追蹤時同一交易更新；追蹤者超過 FEED_FANOUT_THRESHOLD 的作者改於讀取時合併其文章）
+    followers_count = db.Column(db.Integer, default=0, server_default='0', nullable=False, comment='追蹤者數')
+    following_count = db.Column(db.Integer, default=0, server_default='0', nullable=False, comment='追蹤中人數')
+
+    # 關聯關係（可使用 selectinload / joinedload 批次預先載入；
+    # 需要篩選、排序或分頁時使用 PostService、CommentService、LikeService 的查詢方法）
+    posts = db.relationship('Post', backref='author', cascade='all, delete-orphan')
+    comments = db.relationship('Comment', backref='author', cascade='all, delete-orphan')
+    likes = db.relationship('Like', backref='user', cascade='all, delete-orphan')
 
     def set_password(self, password: str) -> None:
         """
@@ -41,7 +49,7 @@ class User(UserMixin, db.Model):
         Args:
             password: 原始密碼
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
         """
@@ -53,7 +61,16 @@ class User(UserMixin, db.Model):
         Returns:
             bool: 密碼是否正確
         """
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        """
+        檢查密碼雜湊是否與目前配置的方法或成本不一致
+
+        Returns:
+            bool: 是否需要重新雜湊
+        """
+        return password_hasher.needs_rehash(self.password_hash)
 
     def like_post(self, post) -> None:
         """
@@ -94,15 +111,15 @@ class User(UserMixin, db.Model):
 
     @property
     def posts_count(self) -> int:
-        """獲取發文總數"""
-        return self.posts.count()
+        """獲取發文總數（有快取的活動統計時直接使用，否則只查詢發文數）"""
+        from app.services import StatsService
+        return StatsService.get_user_posts_count(self.id)
 
     @property
     def received_likes_count(self) -> int:
-        """獲取收到的總讚數"""
-        from app.models.like import Like
-        from app.models.post import Post
-        return Like.query.join(Post).filter(Post.user_id == self.id).count()
+        """獲取收到的總讚數（有快取的活動統計時直接使用，否則只查詢讚數）"""
+        from app.services import StatsService
+        return StatsService.get_user_received_likes(self.id)
 
     def __repr__(self) -> str:
         """模型的字符串表示"""
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from functools import wraps
+from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
+from flask_login import login_required, current_user
+from app.services import StatsService, AnalyticsService
+
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+# 配置常量
+DEFAULT_RANGE_DAYS = 30
+MAX_SERIES_DAYS = 366
+
+
+def admin_required(view):
+    """
+    限管理員存取的裝飾器
+
+    Args:
+        view: 視圖函數
+
+    Returns:
+        包裝後的視圖函數
+    """
+    @wraps(view)
+    @login_required
+    def wrapped(*args, **kwargs):
+        if not current_user.is_admin:
+            flash('無權限訪問此頁面', 'danger')
+            return redirect(url_for('main.index'))
+        return view(*args, **kwargs)
+
+    return wrapped
+
+
+def parse_date_arg(name: str, default: date) -> date:
+    """
+    解析 YYYY-MM-DD 格式的查詢參數
+
+    Args:
+        name: 參數名稱
+        default: 未提供或格式錯誤時的預設值
+
+    Returns:
+        date: 日期
+    """
+    value = request.args.get(name)
+    if not value:
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        flash(f'日期格式錯誤: {value}', 'warning')
+        return default
+
+
+@admin_bp.route('/')
+@admin_required
+def dashboard():
+    """
+    管理後台：網站統計
+    支援 ?start=YYYY-MM-DD&end=YYYY-MM-DD 查詢任意日期區間
+    """
+    today = date.today()
+    end = parse_date_arg('end', today)
+    start = parse_date_arg('start', end - timedelta(days=DEFAULT_RANGE_DAYS - 1))
+    if start > end:
+        start, end = end, start
+
+    # 區間總數只讀取兩筆彙總資料；每日明細最多顯示 MAX_SERIES_DAYS 天
+    range_stats = StatsService.get_range_stats(start, end)
+    series_start = max(start, end - timedelta(days=MAX_SERIES_DAYS - 1))
+    series = StatsService.get_daily_series(series_start, end)
+
+    return render_template('admin/dashboard.html',
+                           title='管理後台',
+                           start=start,
+                           end=end,
+                           range_stats=range_stats,
+                           series=series,
+                           series_truncated=series_start > start,
+                           site_stats=StatsService.get_site_statistics())
+
+
+@admin_bp.route('/analytics')
+@admin_required
+def analytics():
+    """
+    管理後台：活動分析（活動分布、留存率、貢獻排行）
+    支援 ?days=7|30|90|365
+    """
+    days = request.args.get('days', AnalyticsService.DEFAULT_WINDOW_DAYS, type=int)
+    dashboard = AnalyticsService.get_dashboard(days)
+    if dashboard is None:
+        flash('分析資料計算失敗', 'danger')
+        return redirect(url_for('admin.dashboard'))
+
+    return render_template('admin/analytics.html',
+                           title='活動分析',
+                           data=dashboard,
+                           window_choices=AnalyticsService.WINDOW_CHOICES)
+
+
+@admin_bp.route('/stats/rollup', methods=['POST'])
+@admin_required
+def rollup():
+    """立即執行每日統計彙總"""
+    try:
+        days = StatsService.rollup_daily_stats()
+        flash(f'已彙總 {days} 天的統計資料', 'success')
+    except Exception as e:
+        current_app.logger.error(f"Error rolling up daily stats: {str(e)}")
+        flash('統計彙總失敗', 'danger')
+    return redirect(url_for('admin.dashboard', **request.args))
@@ -0,0 +1,402 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import Blueprint, current_app, request, abort
+from flask_login import current_user
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import HTTPException
+from app.models import Post, Comment, User, Like
+from app.services import PostService, CommentService, LikeService
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# 分頁設定
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# 各資源可透過 ?fields= 選擇的欄位，以及未指定時的預設欄位
+POST_FIELDS = ('id', 'title', 'content', 'content_html', 'excerpt', 'user_id', 'created_at', 'updated_at')
+POST_DETAIL_FIELDS = ('id', 'title', 'content', 'user_id', 'created_at', 'updated_at')
+POST_LIST_FIELDS = ('id', 'title', 'excerpt', 'user_id', 'created_at', 'updated_at')
+COMMENT_FIELDS = ('id', 'content', 'content_html', 'user_id', 'post_id', 'parent_id', 'created_at', 'updated_at')
+COMMENT_DEFAULT_FIELDS = ('id', 'content', 'user_id', 'post_id', 'parent_id', 'created_at', 'updated_at')
+LIKE_FIELDS = ('id', 'user_id', 'post_id', 'created_at')
+USER_FIELDS = ('id', 'username', 'avatar_path', 'created_at')
+
+
+def json_response(payload, status: int = 200):
+    """
+    建立 JSON 回應，安裝了 orjson 時使用 orjson 序列化
+
+    Args:
+        payload: 回應內容
+        status: HTTP 狀態碼
+
+    Returns:
+        Response: JSON 回應
+    """
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+
+def serialize(obj, fields: Iterable[str]) -> Dict:
+    """
+    依欄位列表將模型實例轉為字典
+
+    Args:
+        obj: 模型實例
+        fields: 欄位名稱列表
+
+    Returns:
+        Dict: 序列化後的字典
+    """
+    data = {}
+    for name in fields:
+        value = getattr(obj, name)
+        data[name] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+def parse_fields(allowed: Tuple[str, ...], default: Tuple[str, ...]) -> List[str]:
+    """
+    解析 ?fields= 參數
+
+    Args:
+        allowed: 可選擇的欄位
+        default: 未指定時的預設欄位
+
+    Returns:
+        List[str]: 欄位名稱列表（必定包含 id）
+    """
+    raw = request.args.get('fields')
+    if not raw:
+        return list(default)
+
+    fields = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        abort(400, description=f"不支援的欄位: {', '.join(unknown)}")
+
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+    return fields
+
+
+def parse_includes(allowed: Tuple[str, ...]) -> set:
+    """
+    解析 ?include= 參數
+
+    Args:
+        allowed: 可包含的關聯
+
+    Returns:
+        set: 要包含的關聯名稱
+    """
+    raw = request.args.get('include')
+    if not raw:
+        return set()
+
+    includes = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = includes - set(allowed)
+    if unknown:
+        abort(400, description=f"不支援的關聯: {', '.join(sorted(unknown))}")
+    return includes
+
+
+def column_options(model, fields: Iterable[str], *required: str):
+    """
+    只載入回應需要的欄位
+
+    Args:
+        model: 模型類別
+        fields: 回應的欄位
+        *required: 其他必須載入的欄位（例如關聯用的外鍵）
+
+    Returns:
+        載入選項
+    """
+    names = dict.fromkeys([*fields, *required])
+    return load_only(*(getattr(model, name) for name in names))
+
+
+def encode_cursor(last_id: int) -> str:
+    """將最後一筆的ID編碼為分頁游標"""
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> int:
+    """解碼分頁游標"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, binascii.Error):
+        abort(400, description='無效的分頁游標')
+
+
+def parse_page_args() -> Tuple[int, Optional[int]]:
+    """
+    解析 ?limit= 與 ?cursor= 參數
+
+    Returns:
+        Tuple[int, Optional[int]]: (每頁數量, 游標對應的ID)
+    """
+    limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+    limit = min(max(limit, 1), MAX_LIMIT)
+
+    cursor = request.args.get('cursor')
+    return limit, decode_cursor(cursor) if cursor else None
+
+
+def split_page(items: list, limit: int) -> Tuple[list, Optional[str]]:
+    """
+    由多取一筆的查詢結果判斷是否還有下一頁
+
+    Args:
+        items: 查詢結果（最多 limit + 1 筆）
+        limit: 每頁數量
+
+    Returns:
+        Tuple[list, Optional[str]]: (資料列表, 下一頁游標)
+    """
+    if len(items) > limit:
+        items = items[:limit]
+        return items, encode_cursor(items[-1].id)
+    return items, None
+
+
+def paginate(query, id_column) -> Tuple[list, Optional[str]]:
+    """
+    以游標分頁（依ID遞減），不需計算總數也不受頁碼偏移影響
+
+    Args:
+        query: 查詢物件
+        id_column: 排序與游標使用的ID欄位
+
+    Returns:
+        Tuple[list, Optional[str]]: (資料列表, 下一頁游標)
+    """
+    limit, before_id = parse_page_args()
+    if before_id is not None:
+        query = query.filter(id_column < before_id)
+
+    # 多取一筆以判斷是否還有下一頁
+    items = query.order_by(id_column.desc()).limit(limit + 1).all()
+    return split_page(items, limit)
+
+
+def attach_users(items: List[Dict], objects: list, key: str) -> None:
+    """
+    以單一查詢批次載入關聯用戶並加入回應
+
+    Args:
+        items: 序列化後的資料列表
+        objects: 對應的模型實例列表（需有 user_id）
+        key: 加入回應的鍵名
+    """
+    user_ids = {obj.user_id for obj in objects}
+    users = {}
+    if user_ids:
+        users = {
+            user.id: user for user in User.query.options(
+                column_options(User, USER_FIELDS)
+            ).filter(User.id.in_(user_ids)).all()
+        }
+    assign_users(items, objects, users, key)
+
+
+def assign_users(items: List[Dict], objects: list, users: Dict[int, User], key: str) -> None:
+    """將已載入的用戶加入回應（用戶ID -> 用戶實例）"""
+    for item, obj in zip(items, objects):
+        user = users.get(obj.user_id)
+        item[key] = serialize(user, USER_FIELDS) if user else None
+
+
+def attach_post_counts(items: List[Dict], posts: List[Post]) -> None:
+    """批次載入文章的按讚數與留言數並加入回應"""
+    post_ids = [post.id for post in posts]
+    assign_post_counts(items, posts,
+                       LikeService.count_likes_by_post(post_ids),
+                       CommentService.count_comments_by_post(post_ids))
+
+
+def assign_post_counts(items: List[Dict], posts: List[Post],
+                       likes: Dict[int, int], comments: Dict[int, int]) -> None:
+    """將已計算的按讚數與留言數加入回應（文章ID -> 數量）"""
+    for item, post in zip(items, posts):
+        item['counts'] = {
+            'likes': likes.get(post.id, 0),
+            'comments': comments.get(post.id, 0)
+        }
+
+
+def attach_liked(items: List[Dict], posts: List[Post]) -> None:
+    """以單一查詢載入目前用戶的按讚狀態並加入回應（未登入時皆為 False）"""
+    liked = set()
+    if current_user.is_authenticated:
+        liked = LikeService.get_liked_post_ids(current_user.id, [post.id for post in posts])
+
+    for item, post in zip(items, posts):
+        item['liked'] = post.id in liked
+
+
+def render_posts(posts: List[Post], fields: List[str], includes: set) -> List[Dict]:
+    """序列化文章列表並附加關聯資料"""
+    items = [serialize(post, fields) for post in posts]
+    if 'author' in includes:
+        attach_users(items, posts, 'author')
+    if 'counts' in includes:
+        attach_post_counts(items, posts)
+    if 'liked' in includes:
+        attach_liked(items, posts)
+    return items
+
+
+@api_bp.errorhandler(HTTPException)
+def handle_http_error(error):
+    """API 錯誤一律以 JSON 回應"""
+    response = json_response({
+        'error': {
+            'code': error.code,
+            'message': error.description
+        }
+    }, status=error.code)
+
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+@api_bp.route('/posts')
+def list_posts():
+    """
+    文章列表
+    支援 ?user_id=、?fields=、?include=author,counts,liked、?cursor=、?limit=
+    """
+    fields = parse_fields(POST_FIELDS, POST_LIST_FIELDS)
+    includes = parse_includes(('author', 'counts', 'liked'))
+
+    query = Post.query.options(column_options(Post, fields, 'id', 'user_id'))
+    user_id = request.args.get('user_id', type=int)
+    if user_id:
+        query = query.filter(Post.user_id == user_id)
+
+    posts, next_cursor = paginate(query, Post.id)
+    return json_response({
+        'data': render_posts(posts, fields, includes),
+        'next_cursor': next_cursor
+    })
+
+
+@api_bp.route('/posts/<int:post_id>')
+def get_post(post_id):
+    """文章詳情"""
+    fields = parse_fields(POST_FIELDS, POST_DETAIL_FIELDS)
+    includes = parse_includes(('author', 'counts', 'liked'))
+
+    post = Post.query.options(
+        column_options(Post, fields, 'id', 'user_id')
+    ).filter_by(id=post_id).first()
+    if not post:
+        abort(404, description='文章不存在')
+
+    return json_response({'data': render_posts([post], fields, includes)[0]})
+
+
+@api_bp.route('/posts/<int:post_id>/comments')
+def list_post_comments(post_id):
+    """
+    文章留言列表（包含回覆，可依 parent_id 組成樹狀結構）
+    支援 ?fields=、?include=author、?cursor=、?limit=
+    """
+    fields = parse_fields(COMMENT_FIELDS, COMMENT_DEFAULT_FIELDS)
+    includes = parse_includes(('author',))
+
+    if not PostService.post_exists(post_id):
+        abort(404, description='文章不存在')
+
+    query = Comment.query.options(
+        column_options(Comment, fields, 'id', 'user_id')
+    ).filter(Comment.post_id == post_id)
+
+    comments, next_cursor = paginate(query, Comment.id)
+    items = [serialize(comment, fields) for comment in comments]
+    if 'author' in includes:
+        attach_users(items, comments, 'author')
+
+    return json_response({'data': items, 'next_cursor': next_cursor})
+
+
+@api_bp.route('/posts/<int:post_id>/likes')
+def list_post_likes(post_id):
+    """
+    文章按讚列表
+    支援 ?fields=、?include=user、?cursor=、?limit=
+    """
+    fields = parse_fields(LIKE_FIELDS, LIKE_FIELDS)
+    includes = parse_includes(('user',))
+
+    if not PostService.post_exists(post_id):
+        abort(404, description='文章不存在')
+
+    query = Like.query.options(
+        column_options(Like, fields, 'id', 'user_id')
+    ).filter(Like.post_id == post_id)
+
+    likes, next_cursor = paginate(query, Like.id)
+    items = [serialize(like, fields) for like in likes]
+    if 'user' in includes:
+        attach_users(items, likes, 'user')
+
+    return json_response({'data': items, 'next_cursor': next_cursor})
+
+
+@api_bp.route('/users')
+def list_users():
+    """
+    用戶列表
+    支援 ?fields=、?include=counts、?cursor=、?limit=
+    """
+    fields = parse_fields(USER_FIELDS, USER_FIELDS)
+    includes = parse_includes(('counts',))
+
+    users, next_cursor = paginate(
+        User.query.options(column_options(User, fields, 'id')), User.id
+    )
+    items = [serialize(user, fields) for user in users]
+    if 'counts' in includes:
+        posts = PostService.count_posts_by_user(user.id for user in users)
+        for item, user in zip(items, users):
+            item['counts'] = {'posts': posts.get(user.id, 0)}
+
+    return json_response({'data': items, 'next_cursor': next_cursor})
+
+
+@api_bp.route('/users/<int:user_id>')
+def get_user(user_id):
+    """用戶資料"""
+    fields = parse_fields(USER_FIELDS, USER_FIELDS)
+    includes = parse_includes(('counts',))
+
+    user = User.query.options(
+        column_options(User, fields, 'id')
+    ).filter_by(id=user_id).first()
+    if not user:
+        abort(404, description='用戶不存在')
+
+    item = serialize(user, fields)
+    if 'counts' in includes:
+        item['counts'] = {'posts': PostService.count_posts_by_user([user.id])[user.id]}
+
+    return json_response({'data': item})
@@ -0,0 +1,178 @@
+"""
+JSON API 唯讀端點的非同步版本（ASGI 模式，見 app/asgi.py）
+
+與 app/routes/api.py 共用參數解析、欄位選擇與序列化，只有資料庫存取改用
+AsyncSession，等待查詢時事件迴圈可以處理其他請求。
+需要目前登入用戶的參數（?include=liked）會引發 WsgiFallback，改由 Flask 處理。
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import abort, request
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from werkzeug.routing import Map, Rule
+from app.models import Post, Comment, User, Like
+from .api import (
+    POST_FIELDS, POST_DETAIL_FIELDS, POST_LIST_FIELDS, USER_FIELDS,
+    json_response, serialize, parse_fields, parse_includes, column_options,
+    parse_page_args, split_page, assign_users, assign_post_counts
+)
+
+
+class WsgiFallback(Exception):
+    """此請求需要交給 Flask（WSGI）處理"""
+
+
+async def paginate(session: AsyncSession, statement, id_column) -> Tuple[list, Optional[str]]:
+    """
+    以游標分頁（依ID遞減），與 api.paginate 相同
+
+    Args:
+        session: 非同步 session
+        statement: 查詢語句
+        id_column: 排序與游標使用的ID欄位
+
+    Returns:
+        Tuple[list, Optional[str]]: (資料列表, 下一頁游標)
+    """
+    limit, before_id = parse_page_args()
+    if before_id is not None:
+        statement = statement.where(id_column < before_id)
+
+    items = (await session.scalars(
+        statement.order_by(id_column.desc()).limit(limit + 1)
+    )).all()
+    return split_page(items, limit)
+
+
+async def count_by(session: AsyncSession, group_column, id_column, keys: Iterable[int]) -> Dict[int, int]:
+    """
+    以單一查詢依欄位分組計數
+
+    Args:
+        session: 非同步 session
+        group_column: 分組欄位（例如 Like.post_id）
+        id_column: 計數欄位
+        keys: 分組欄位的值
+
+    Returns:
+        Dict[int, int]: 值 -> 數量（沒有資料時為 0）
+    """
+    keys = list(set(keys))
+    counts = dict.fromkeys(keys, 0)
+    if keys:
+        counts.update((await session.execute(
+            select(group_column, func.count(id_column))
+            .where(group_column.in_(keys))
+            .group_by(group_column)
+        )).all())
+    return counts
+
+
+async def attach_users(session: AsyncSession, items: List[Dict], objects: list, key: str) -> None:
+    """以單一查詢批次載入關聯用戶並加入回應"""
+    user_ids = {obj.user_id for obj in objects}
+    users = {}
+    if user_ids:
+        users = {
+            user.id: user for user in (await session.scalars(
+                select(User).options(column_options(User, USER_FIELDS)).where(User.id.in_(user_ids))
+            )).all()
+        }
+    assign_users(items, objects, users, key)
+
+
+async def render_posts(session: AsyncSession, posts: List[Post], fields: List[str], includes: set) -> List[Dict]:
+    """序列化文章列表並附加關聯資料"""
+    items = [serialize(post, fields) for post in posts]
+    if 'author' in includes:
+        await attach_users(session, items, posts, 'author')
+    if 'counts' in includes:
+        post_ids = [post.id for post in posts]
+        assign_post_counts(items, posts,
+                           await count_by(session, Like.post_id, Like.id, post_ids),
+                           await count_by(session, Comment.post_id, Comment.id, post_ids))
+    return items
+
+
+def parse_post_includes() -> set:
+    """解析文章的 ?include=，需要目前用戶時改由 Flask 處理"""
+    includes = parse_includes(('author', 'counts', 'liked'))
+    if 'liked' in includes:
+        raise WsgiFallback()
+    return includes
+
+
+async def list_posts(session: AsyncSession):
+    """文章列表（同 GET /api/v1/posts）"""
+    fields = parse_fields(POST_FIELDS, POST_LIST_FIELDS)
+    includes = parse_post_includes()
+
+    statement = select(Post).options(column_options(Post, fields, 'id', 'user_id'))
+    user_id = request.args.get('user_id', type=int)
+    if user_id:
+        statement = statement.where(Post.user_id == user_id)
+
+    posts, next_cursor = await paginate(session, statement, Post.id)
+    return json_response({
+        'data': await render_posts(session, posts, fields, includes),
+        'next_cursor': next_cursor
+    })
+
+
+async def get_post(session: AsyncSession, post_id: int):
+    """文章詳情（同 GET /api/v1/posts/<id>）"""
+    fields = parse_fields(POST_FIELDS, POST_DETAIL_FIELDS)
+    includes = parse_post_includes()
+
+    post = (await session.scalars(
+        select(Post).options(column_options(Post, fields, 'id', 'user_id')).where(Post.id == post_id)
+    )).first()
+    if not post:
+        abort(404, description='文章不存在')
+
+    return json_response({'data': (await render_posts(session, [post], fields, includes))[0]})
+
+
+async def list_users(session: AsyncSession):
+    """用戶列表（同 GET /api/v1/users）"""
+    fields = parse_fields(USER_FIELDS, USER_FIELDS)
+    includes = parse_includes(('counts',))
+
+    users, next_cursor = await paginate(
+        session, select(User).options(column_options(User, fields, 'id')), User.id
+    )
+    items = [serialize(user, fields) for user in users]
+    if 'counts' in includes:
+        posts = await count_by(session, Post.user_id, Post.id, (user.id for user in users))
+        for item, user in zip(items, users):
+            item['counts'] = {'posts': posts.get(user.id, 0)}
+
+    return json_response({'data': items, 'next_cursor': next_cursor})
+
+
+async def get_user(session: AsyncSession, user_id: int):
+    """用戶資料（同 GET /api/v1/users/<id>）"""
+    fields = parse_fields(USER_FIELDS, USER_FIELDS)
+    includes = parse_includes(('counts',))
+
+    user = (await session.scalars(
+        select(User).options(column_options(User, fields, 'id')).where(User.id == user_id)
+    )).first()
+    if not user:
+        abort(404, description='用戶不存在')
+
+    item = serialize(user, fields)
+    if 'counts' in includes:
+        posts = await count_by(session, Post.user_id, Post.id, [user.id])
+        item['counts'] = {'posts': posts[user.id]}
+
+    return json_response({'data': item})
+
+
+# 以非同步方式處理的端點（其餘路徑一律交給 Flask）
+url_map = Map([
+    Rule('/api/v1/posts', endpoint=list_posts, methods=['GET']),
+    Rule('/api/v1/posts/<int:post_id>', endpoint=get_post, methods=['GET']),
+    Rule('/api/v1/users', endpoint=list_users, methods=['GET']),
+    Rule('/api/v1/users/<int:user_id>', endpoint=get_user, methods=['GET']),
+])
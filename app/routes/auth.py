@@ -1,15 +1,18 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
-from app.services import UserService
+from app.services import UserService, AvailabilityService
 from urllib.parse import urlparse
 from app.models.user import User
-from app import db
+from app import db, limiter
+from app.utils.rate_limit import ip_key, account_key
 from app.utils.validators import PasswordValidator
 
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@limiter.limit('RATELIMIT_LOGIN_PER_IP', key_func=ip_key, scope='login:ip', methods=('POST',))
+@limiter.limit('RATELIMIT_LOGIN_PER_ACCOUNT', key_func=account_key, scope='login:account', methods=('POST',))
 def login():
     """
     用戶登入處理
@@ -33,6 +36,11 @@ def login():
             flash('電子郵件或密碼錯誤', 'danger')
             return redirect(url_for('auth.login'))
 
+        # 依目前配置升級舊的密碼雜湊
+        success, error = UserService.rehash_password_if_needed(user, credentials['password'])
+        if not success:
+            current_app.logger.error(f"Failed to rehash password: {error}")
+
         # 更新登入時間
         success, error = UserService.update_last_login(user.id)
         if not success:
@@ -52,6 +60,7 @@ def login():
     return render_template('auth/login.html', title='登入')
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@limiter.limit('RATELIMIT_REGISTER_PER_IP', key_func=ip_key, scope='register:ip', methods=('POST',))
 def register():
     """處理用戶註冊"""
     if current_user.is_authenticated:
@@ -74,13 +83,12 @@ def register():
             flash('密碼不一致', 'danger')
             return redirect(url_for('auth.register'))
 
-        # 檢查電子郵件是否已存在
-        if User.query.filter_by(email=email).first():
+        # 檢查電子郵件與用戶名是否已存在
+        conflict = UserService.find_conflict(username=username, email=email)
+        if conflict == 'email':
             flash('此電子郵件已被註冊', 'danger')
             return redirect(url_for('auth.register'))
-
-        # 檢查用戶名是否已存在
-        if User.query.filter_by(username=username).first():
+        if conflict == 'username':
             flash('此用戶名已被使用', 'danger')
             return redirect(url_for('auth.register'))
 
@@ -96,6 +104,7 @@ def register():
     return render_template('auth/register.html', title='註冊')
 
 @auth_bp.route('/check-password-strength', methods=['POST'])
+@limiter.limit('RATELIMIT_PASSWORD_CHECK_PER_IP', key_func=ip_key, scope='password-check:ip')
 def check_password_strength():
     """檢查密碼強度的API"""
     password = request.json.get('password', '')
@@ -106,6 +115,33 @@ def check_password_strength():
         'message': message
     })
 
+@auth_bp.route('/check-availability')
+@limiter.limit('RATELIMIT_AVAILABILITY_PER_IP', key_func=ip_key, scope='availability:ip')
+def check_availability():
+    """
+    檢查用戶名與電子郵件是否可用的API
+    供註冊表單在輸入時即時檢查，可只帶其中一個參數
+    """
+    result = {}
+
+    username = request.args.get('username', '').strip()
+    if username:
+        available = AvailabilityService.is_username_available(username)
+        result['username'] = {
+            'available': available,
+            'message': '此用戶名可以使用' if available else '此用戶名已被使用'
+        }
+
+    email = request.args.get('email', '').strip()
+    if email:
+        available = AvailabilityService.is_email_available(email)
+        result['email'] = {
+            'available': available,
+            'message': '此電子郵件可以使用' if available else '此電子郵件已被註冊'
+        }
+
+    return jsonify(result)
+
 @auth_bp.route('/logout')
 @login_required
 def logout():
@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify
+from app.utils.warmup import get_warmup
+
+
+health_bp = Blueprint('health', __name__)
+
+
+@health_bp.route('/healthz')
+def liveness():
+    """存活檢查：行程可以回應請求"""
+    return jsonify({'status': 'ok'})
+
+
+@health_bp.route('/readyz')
+def readiness():
+    """就緒檢查：工作行程預熱完成後才回應 200，負載平衡器據此決定是否導入流量"""
+    warmup = get_warmup()
+    if not warmup.is_ready:
+        return jsonify({'status': 'warming_up'}), 503
+    return jsonify({'status': 'ready', 'warmup': warmup.report})
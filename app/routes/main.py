@@ -1,13 +1,15 @@
 from datetime import datetime, timedelta
-from flask import Blueprint, render_template, request
-from flask_login import current_user
-from sqlalchemy.orm import joinedload
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask_login import current_user, login_required
 from app.models import User, Post
-from app.services import StatsService
+from app.services import StatsService, UserService, PostService, LikeService, FeedService, FollowService
+from app.utils.http_cache import conditional_get
+from app.utils.database import replica_reads
 
 
 main_bp = Blueprint('main', __name__, url_prefix='/')
 
+@replica_reads
 def get_active_users(limit: int = 12) -> list:
     """
     獲取活躍用戶列表
@@ -54,9 +56,9 @@ def index():
     site_stats = StatsService.get_site_statistics()
 
     # 獲取最新文章
-    latest_posts = Post.query.options(
-        joinedload(Post.author)
-    ).order_by(Post.created_at.desc()).limit(10).all()
+    latest_posts = PostService.get_latest_posts(10)
+    PostService.prefetch_counts(latest_posts)
+    LikeService.prefetch_liked_posts(post.id for post in latest_posts)
 
     # 模板數據
     template_data = {
@@ -73,27 +75,74 @@ def index():
     if current_user.is_authenticated:
         template_data['user_stats'] = StatsService.get_user_activity_stats(current_user.id)
 
+        # 有追蹤其他用戶時，文章列表改為顯示追蹤動態
+        if current_user.following_count:
+            feed_posts, _ = FeedService.get_feed(current_user.id, limit=10)
+            PostService.prefetch_counts(feed_posts)
+            LikeService.prefetch_liked_posts(post.id for post in feed_posts)
+            template_data['feed_posts'] = feed_posts
+
     return render_template('main/index.html', **template_data)
 
 @main_bp.route('/members')
+@conditional_get(UserService.get_members_cache_validators)
 def members():
     """會員列表視圖"""
     page = request.args.get('page', 1, type=int)
-    per_page = 16  # 每頁顯示的會員數量
+    pagination = UserService.get_members_page(page)
 
-    pagination = User.query.order_by(
-        User.created_at.desc()
-    ).paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    followed_ids = set()
+    if current_user.is_authenticated:
+        followed_ids = FollowService.get_followed_ids(current_user.id, (user.id for user in pagination.items))
 
     return render_template('main/members.html',
                            title='會員列表',
                            users=pagination.items,
+                           followed_ids=followed_ids,
                            pagination=pagination)
 
+@main_bp.route('/members/<int:user_id>/follow', methods=['POST'])
+@login_required
+def follow(user_id):
+    """
+    追蹤用戶
+
+    Args:
+        user_id: 用戶ID
+    """
+    success, error = FollowService.follow(current_user.id, user_id)
+    if not success:
+        flash(error, 'danger')
+    return redirect(request.referrer or url_for('main.members'))
+
+@main_bp.route('/members/<int:user_id>/unfollow', methods=['POST'])
+@login_required
+def unfollow(user_id):
+    """
+    取消追蹤用戶
+
+    Args:
+        user_id: 用戶ID
+    """
+    success, error = FollowService.unfollow(current_user.id, user_id)
+    if not success:
+        flash(error, 'danger')
+    return redirect(request.referrer or url_for('main.members'))
+
+@main_bp.route('/feed')
+@login_required
+def feed():
+    """追蹤動態視圖（以上一頁最後一篇文章的ID翻頁）"""
+    before = request.args.get('before', type=int)
+    posts, next_before = FeedService.get_feed(current_user.id, before)
+    PostService.prefetch_counts(posts)
+    LikeService.prefetch_liked_posts(post.id for post in posts)
+
+    return render_template('main/feed.html',
+                           title='追蹤動態',
+                           posts=posts,
+                           next_before=next_before)
+
 @main_bp.route('/about')
 def about():
     """關於頁面視圖"""
@@ -0,0 +1,31 @@
+from datetime import datetime
+from flask import Blueprint, render_template, request, current_app
+from flask_login import login_required, current_user
+from app.services import NotificationService
+
+
+notifications_bp = Blueprint('notifications', __name__, url_prefix='/notifications')
+
+@notifications_bp.route('/')
+@login_required
+def index():
+    """通知列表視圖，開啟時將通知全部標記為已讀"""
+    page = request.args.get('page', 1, type=int)
+
+    # 先標記已讀再查詢（提交後不需重新載入通知），本次才標記的通知在頁面上以不同樣式標示
+    opened_at = datetime.now()
+    if current_user.unread_notifications:
+        NotificationService.mark_all_read(current_user.id)
+
+    pagination = NotificationService.get_user_notifications(
+        current_user.id, page, current_app.config['NOTIFICATIONS_PER_PAGE']
+    )
+    notifications = pagination.items if pagination else []
+    unread_ids = {notification.id for notification in notifications
+                  if notification.read_at is None or notification.read_at >= opened_at}
+
+    return render_template('notifications/index.html',
+                           title='通知',
+                           notifications=notifications,
+                           unread_ids=unread_ids,
+                           pagination=pagination)
@@ -1,9 +1,12 @@
 from flask import (
     Blueprint, render_template, redirect, url_for,
-    flash, request, jsonify, current_app
+    flash, request, jsonify, current_app, abort, Response
 )
 from flask_login import login_required, current_user
-from app.services import PostService, CommentService, LikeService
+from app import event_broker
+from app.services import PostService, CommentService, LikeService, RelatedPostService
+from app.utils.http_cache import conditional_get
+from app.utils.events import post_channel, stream_subscription
 
 
 post_bp = Blueprint('post', __name__, url_prefix='/posts')
@@ -12,6 +15,7 @@ post_bp = Blueprint('post', __name__, url_prefix='/posts')
 POSTS_PER_PAGE = 10
 
 @post_bp.route('/')
+@conditional_get(PostService.get_posts_cache_validators)
 def index():
     """
     文章列表頁面
@@ -32,6 +36,8 @@ def index():
             page=page,
             per_page=POSTS_PER_PAGE
         )
+    if pagination is not None:
+        PostService.prefetch_counts(pagination.items)
 
     return render_template('posts/index.html',
                            title='文章列表',
@@ -67,6 +73,7 @@ def create():
     return render_template('posts/create.html', title='發布文章')
 
 @post_bp.route('/<int:id>')
+@conditional_get(lambda id: PostService.get_post_cache_validators(id))
 def show(id):
     """
     顯示文章詳情
@@ -74,14 +81,43 @@ def show(id):
     Args:
         id: 文章ID
     """
-    post = PostService.get_post_by_id(id)
+    post = PostService.get_post_for_display(id)
     if not post:
         flash('文章不存在', 'danger')
         return redirect(url_for('post.index'))
 
     return render_template('posts/show.html',
                            title=post.title,
-                           post=post)
+                           post=post,
+                           related_posts=RelatedPostService.get_related_posts(post.id))
+
+@post_bp.route('/<int:post_id>/events')
+def events(post_id):
+    """
+    文章的即時事件（Server-Sent Events）：按讚數更新（likes）、新留言（comment）與刪除留言（comment_deleted）
+    每個連線最多每 EVENTS_MIN_INTERVAL 秒送出一次，期間的事件合併送出
+
+    Args:
+        post_id: 文章ID
+    """
+    if not PostService.post_exists(post_id):
+        abort(404)
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    # HEAD 不會讀取回應內容，不佔用連線名額
+    if request.method == 'HEAD':
+        return Response(mimetype='text/event-stream', headers=headers)
+
+    # 在回應前訂閱，連線數已滿時仍能回應 503；
+    # 產生器未開始迭代就被關閉時不會執行其 finally，改由 call_on_close 釋放名額
+    subscription = event_broker.subscribe(post_channel(post_id))
+    response = Response(
+        stream_subscription(event_broker, subscription),
+        mimetype='text/event-stream',
+        headers=headers
+    )
+    response.call_on_close(subscription.close)
+    return response
 
 @post_bp.route('/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
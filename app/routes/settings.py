@@ -1,9 +1,7 @@
-from datetime import datetime, timedelta
 from flask import Blueprint, render_template, flash, redirect, url_for, request, current_app
 from flask_login import login_required, current_user
 from app import db
-from app.models import User
-from app.services import UserService
+from app.services import UserService, StatsService
 
 
 # 系統配置常量
@@ -24,16 +22,12 @@ def get_system_statistics() -> dict:
         dict: 包含系統統計資訊的字典
     """
     try:
-        # 計算時間閾值
-        active_threshold = datetime.now() - timedelta(days=SystemConfig.ACTIVE_DAYS_THRESHOLD)
-
-        # 獲取用戶統計
-        total_users = User.query.count()
-        active_users = User.query.filter(User.last_login >= active_threshold).count()
+        # 用戶統計由 StatsService 從每日彙總與最近資料計算，不需掃描整個資料表
+        site_stats = StatsService.get_site_statistics(SystemConfig.ACTIVE_DAYS_THRESHOLD)
 
         return {
-            'total_users': total_users,
-            'active_users': active_users,
+            'total_users': site_stats['total_users'],
+            'active_users': site_stats['active_users_count'],
             'system_version': SystemConfig.VERSION,
             'last_update': SystemConfig.LAST_UPDATE,
         }
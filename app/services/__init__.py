@@ -3,6 +3,12 @@ from .user_service import UserService
 from .comment_service import CommentService
 from .like_service import LikeService
 from .stats_service import StatsService
+from .availability_service import AvailabilityService
+from .analytics_service import AnalyticsService
+from .notification_service import NotificationService
+from .feed_service import FeedService
+from .follow_service import FollowService
+from .related_post_service import RelatedPostService
 
 
 __all__ = [
@@ -10,5 +16,11 @@ __all__ = [
     'UserService',
     'CommentService',
     'LikeService',
-    'StatsService'
+    'StatsService',
+    'AvailabilityService',
+    'AnalyticsService',
+    'NotificationService',
+    'FeedService',
+    'FollowService',
+    'RelatedPostService'
 ]
@@ -0,0 +1,309 @@
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, List, Optional
+from flask import current_app
+from sqlalchemy import select, func, cast, Integer
+from app import db
+from app.models import User, Post, Comment, Like
+from app.utils.cache import TTLCache
+from app.utils.database import replica_reads
+from .base_service import BaseService
+
+# NumPy 只在計算分析資料時才匯入，不使用管理後台的工作行程不需負擔其匯入成本
+if TYPE_CHECKING:
+    import numpy as np
+
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_WEEK = SECONDS_PER_DAY * 7
+
+
+def epoch_seconds(column, dialect: str):
+    """
+    將時間欄位轉為 Unix 秒數的 SQL 運算式，讓資料庫直接回傳整數，
+    避免逐列建立 datetime 物件（資料庫中的時間視為 UTC 換算，讀回時以相同方式還原）
+
+    Args:
+        column: 時間欄位
+        dialect: 資料庫方言名稱
+
+    Returns:
+        SQL 運算式；其他資料庫回傳 None，由呼叫端讀取原始時間後在 Python 中轉換
+    """
+    if dialect == 'sqlite':
+        return cast(func.strftime('%s', column), Integer)
+    if dialect == 'postgresql':
+        return cast(func.extract('epoch', column), Integer)
+    if dialect in ('mysql', 'mariadb'):
+        return cast(func.unix_timestamp(column), Integer)
+    return None
+
+
+def to_epoch(value: datetime) -> int:
+    """將 datetime 以與 epoch_seconds 相同的方式轉為 Unix 秒數"""
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+def from_epoch(value: int) -> datetime:
+    """將 Unix 秒數還原為 datetime"""
+    return datetime.fromtimestamp(int(value), tz=timezone.utc).replace(tzinfo=None)
+
+
+class AnalyticsService(BaseService):
+    """
+    管理後台分析服務
+
+    以串流游標分批讀取精簡的欄位（用戶ID與時間戳記）組成 NumPy 陣列，
+    再以向量化運算計算活動分布、留存率與貢獻排行；不建立 ORM 物件，
+    百萬筆按讚也只需數個查詢與數十 MB 記憶體。結果依時間範圍快取
+    """
+
+    # 配置常量
+    STREAM_BATCH_SIZE = 50000
+    DEFAULT_WINDOW_DAYS = 30
+    WINDOW_CHOICES = (7, 30, 90, 365)
+    MAX_COHORT_WEEKS = 12
+    TOP_CONTRIBUTORS = 10
+
+    # 貢獻分數權重
+    CONTRIBUTION_WEIGHTS = {'posts': 5, 'comments': 2, 'likes': 1}
+
+    # 事件來源：名稱 -> (模型, 用戶ID欄位)
+    EVENT_SOURCES = {
+        'posts': (Post, Post.user_id),
+        'comments': (Comment, Comment.user_id),
+        'likes': (Like, Like.user_id),
+    }
+
+    _cache = TTLCache(maxsize=32, ttl=300)
+
+    @classmethod
+    def load_events(cls, user_id_column, time_column, since: Optional[datetime] = None) -> 'np.ndarray':
+        """
+        以串流游標分批讀取 (用戶ID, 時間戳記) 並組成陣列
+
+        Args:
+            user_id_column: 用戶ID欄位
+            time_column: 時間欄位
+            since: 只讀取此時間之後的資料
+
+        Returns:
+            np.ndarray: 形狀為 (n, 2) 的 int64 陣列，欄位為 (用戶ID, Unix 秒數)
+        """
+        import numpy as np
+
+        connection = db.session.connection()
+        seconds = epoch_seconds(time_column, connection.dialect.name)
+        statement = select(user_id_column, time_column if seconds is None else seconds).where(
+            time_column.isnot(None)
+        )
+        if since is not None:
+            statement = statement.where(time_column >= since)
+
+        # 以串流游標分批讀取，每批攤平後以 np.fromiter 建立陣列
+        # （np.array 會逐列探查 Row 物件的陣列介面屬性，慢一個數量級以上）
+        chunks = []
+        with connection.execute(statement.execution_options(yield_per=cls.STREAM_BATCH_SIZE)) as result:
+            for rows in result.partitions():
+                if seconds is None:
+                    rows = [(user_id, to_epoch(value)) for user_id, value in rows]
+                values = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=len(rows) * 2)
+                chunks.append(values.reshape(-1, 2))
+
+        if not chunks:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def activity_histograms(events: Dict[str, 'np.ndarray'], start: int, days: int) -> Dict:
+        """
+        計算每日、每小時與星期幾的活動分布
+
+        Args:
+            events: 事件名稱 -> (用戶ID, Unix 秒數) 陣列
+            start: 時間範圍起點（Unix 秒數，當日零時）
+            days: 天數
+
+        Returns:
+            Dict: daily（事件名稱 -> 每日數量）、hourly 與 weekday（全部事件合計）
+        """
+        import numpy as np
+
+        daily = {}
+        hourly = np.zeros(24, dtype=np.int64)
+        weekday = np.zeros(7, dtype=np.int64)
+
+        for name, data in events.items():
+            timestamps = data[:, 1]
+            day_index = (timestamps - start) // SECONDS_PER_DAY
+            day_index = day_index[(day_index >= 0) & (day_index < days)]
+            daily[name] = np.bincount(day_index, minlength=days).tolist()
+
+            hourly += np.bincount((timestamps // 3600) % 24, minlength=24)
+            # 1970-01-01 為星期四，調整為星期一 = 0
+            weekday += np.bincount((timestamps // SECONDS_PER_DAY + 3) % 7, minlength=7)
+
+        return {
+            'daily': daily,
+            'hourly': hourly.tolist(),
+            'weekday': weekday.tolist()
+        }
+
+    @staticmethod
+    def cohort_retention(signups: 'np.ndarray', activity: 'np.ndarray', start: int, weeks: int) -> List[Dict]:
+        """
+        依註冊週計算每週留存率：註冊後第 N 週仍有活動（發文、留言或按讚）的用戶比例
+
+        Args:
+            signups: (用戶ID, 註冊時間) 陣列，只包含範圍內註冊的用戶
+            activity: (用戶ID, 活動時間) 陣列
+            start: 第一個註冊週的起點（Unix 秒數）
+            weeks: 週數
+
+        Returns:
+            List[Dict]: 每個註冊週的 week_start、size 與 retention（第 0..N 週的比例）
+        """
+        import numpy as np
+
+        if len(signups) == 0:
+            return []
+
+        # 依用戶ID排序，之後以二分搜尋將活動對應到用戶的註冊週
+        order = np.argsort(signups[:, 0])
+        user_ids = signups[order, 0]
+        cohorts = np.clip((signups[order, 1] - start) // SECONDS_PER_WEEK, 0, weeks - 1)
+        sizes = np.bincount(cohorts, minlength=weeks)
+
+        counts = np.zeros((weeks, weeks), dtype=np.int64)
+        if len(activity):
+            index = np.searchsorted(user_ids, activity[:, 0])
+            index = np.minimum(index, len(user_ids) - 1)
+            matched = user_ids[index] == activity[:, 0]
+            index = index[matched]
+
+            cohort = cohorts[index]
+            offset = (activity[matched, 1] - start) // SECONDS_PER_WEEK - cohort
+            valid = (offset >= 0) & (cohort + offset < weeks)
+
+            # 同一用戶同一週只計一次
+            pairs = np.unique(index[valid] * weeks + offset[valid])
+            np.add.at(counts, (cohorts[pairs // weeks], pairs % weeks), 1)
+
+        rows = []
+        for week in range(weeks):
+            if not sizes[week]:
+                continue
+            observed = weeks - week
+            rows.append({
+                'week_start': from_epoch(start + week * SECONDS_PER_WEEK).date(),
+                'size': int(sizes[week]),
+                'retention': (counts[week, :observed] / sizes[week]).round(3).tolist()
+            })
+        return rows
+
+    @classmethod
+    def top_contributors(cls, events: Dict[str, 'np.ndarray'], limit: int) -> List[Dict]:
+        """
+        依加權貢獻分數取得前幾名用戶
+
+        Args:
+            events: 事件名稱 -> (用戶ID, Unix 秒數) 陣列
+            limit: 名次數量
+
+        Returns:
+            List[Dict]: user（id、username、avatar_path）、score 以及各類事件數量
+        """
+        import numpy as np
+
+        all_ids = np.concatenate([data[:, 0] for data in events.values()])
+        if len(all_ids) == 0:
+            return []
+
+        # 將用戶ID壓縮為連續索引後以 bincount 計數
+        user_ids, inverse = np.unique(all_ids, return_inverse=True)
+        per_type = {}
+        position = 0
+        for name, data in events.items():
+            per_type[name] = np.bincount(
+                inverse[position:position + len(data)], minlength=len(user_ids)
+            )
+            position += len(data)
+
+        scores = sum(per_type[name] * weight for name, weight in cls.CONTRIBUTION_WEIGHTS.items())
+        # argpartition 只需線性時間取出前幾名，再對少量結果排序
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        top = top[scores[top] > 0]
+
+        # 結果會跨請求快取，只保留需要的欄位而非 ORM 物件
+        users = {
+            row.id: {'id': row.id, 'username': row.username, 'avatar_path': row.avatar_path}
+            for row in db.session.execute(
+                select(User.id, User.username, User.avatar_path).where(
+                    User.id.in_(user_ids[top].tolist())
+                )
+            )
+        }
+
+        return [{
+            'user': users.get(int(user_ids[i])),
+            'score': int(scores[i]),
+            **{name: int(counts[i]) for name, counts in per_type.items()}
+        } for i in top]
+
+    @classmethod
+    @replica_reads
+    def get_dashboard(cls, days: Optional[int] = None) -> Optional[Dict]:
+        """
+        獲取分析資料（依時間範圍快取）
+
+        Args:
+            days: 時間範圍天數
+
+        Returns:
+            Optional[Dict]: histograms、cohorts、top_contributors 與計算時間，失敗時為 None
+        """
+        import numpy as np
+
+        days = days if days in cls.WINDOW_CHOICES else cls.DEFAULT_WINDOW_DAYS
+        cached = cls._cache.get(days)
+        if cached is not None:
+            return cached
+
+        try:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            since = today - timedelta(days=days - 1)
+            start = to_epoch(since)
+
+            events = {
+                name: cls.load_events(user_id, model.created_at, since)
+                for name, (model, user_id) in cls.EVENT_SOURCES.items()
+            }
+
+            # 留存率以週為單位，範圍最多 MAX_COHORT_WEEKS 週
+            weeks = min(cls.MAX_COHORT_WEEKS, max(1, days // 7))
+            cohort_since = today - timedelta(weeks=weeks - 1, days=today.weekday())
+            cohort_start = to_epoch(cohort_since)
+            signups = cls.load_events(User.id, User.created_at, cohort_since)
+            activity = np.concatenate(list(events.values()))
+            activity = activity[activity[:, 1] >= cohort_start]
+
+            dashboard = {
+                'days': days,
+                'start': since.date(),
+                'dates': [(since + timedelta(days=i)).date() for i in range(days)],
+                'totals': {name: len(data) for name, data in events.items()},
+                'histograms': cls.activity_histograms(events, start, days),
+                'cohorts': cls.cohort_retention(signups, activity, cohort_start, weeks),
+                'cohort_weeks': weeks,
+                'top_contributors': cls.top_contributors(events, cls.TOP_CONTRIBUTORS),
+                'generated_at': datetime.now()
+            }
+
+            cls._cache.set(days, dashboard, ttl=current_app.config.get('ANALYTICS_CACHE_TTL'))
+            return dashboard
+
+        except Exception as e:
+            current_app.logger.error(f"Error building analytics dashboard: {str(e)}")
+            return None
@@ -0,0 +1,160 @@
+import threading
+import time
+from typing import Optional
+from flask import current_app
+from sqlalchemy import event, func, select
+from app import db
+from app.models import User
+from app.utils.bloom_filter import BloomFilter
+from .base_service import BaseService
+
+
+class AvailabilityService(BaseService):
+    """
+    用戶名與電子郵件可用性檢查服務
+
+    以行程內的布隆過濾器先行判斷：過濾器中不存在的值必定可用，不需查詢資料庫；
+    只有可能重複時才以有索引的欄位查詢資料庫確認
+    """
+
+    # 配置常量
+    MIN_CAPACITY = 10000
+    DEFAULT_ERROR_RATE = 0.01
+    DEFAULT_MAX_AGE = 300  # 秒，其他工作行程新增的用戶最晚在此時間後納入
+
+    _username_filter: Optional[BloomFilter] = None
+    _email_filter: Optional[BloomFilter] = None
+    _built_at = 0.0
+    _pending: Optional[list] = None
+    _lock = threading.Lock()          # 保護過濾器的讀寫
+    _rebuild_lock = threading.Lock()  # 同時只有一個執行緒重建
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """從資料庫重建過濾器（同時只有一個執行緒重建）"""
+        with cls._rebuild_lock:
+            cls._build()
+
+    @classmethod
+    def _build(cls) -> None:
+        """掃描用戶表建立新的過濾器後替換，呼叫端需持有 _rebuild_lock"""
+        error_rate = current_app.config.get('AVAILABILITY_FILTER_ERROR_RATE') or cls.DEFAULT_ERROR_RATE
+        total = db.session.query(func.count(User.id)).scalar() or 0
+        capacity = max(cls.MIN_CAPACITY, total * 2)
+
+        usernames = BloomFilter(capacity, error_rate)
+        emails = BloomFilter(capacity, error_rate)
+
+        # 掃描期間新增的用戶可能不在掃描結果中，先記錄下來，替換時一併加入
+        with cls._lock:
+            cls._pending = []
+
+        # 只讀取需要的兩個欄位並分批串流，避免載入完整的用戶物件
+        rows = db.session.execute(
+            select(User.username, User.email).execution_options(yield_per=1000)
+        )
+        for username, email in rows:
+            usernames.add(username)
+            emails.add(email)
+
+        with cls._lock:
+            for username, email in cls._pending:
+                if username:
+                    usernames.add(username)
+                if email:
+                    emails.add(email)
+            cls._pending = None
+            cls._username_filter = usernames
+            cls._email_filter = emails
+            cls._built_at = time.monotonic()
+
+    @classmethod
+    def _ensure_fresh(cls) -> None:
+        """
+        過濾器尚未建立、過期或超出容量時重建
+
+        已有過濾器時只由一個請求重建，其他請求不等待，繼續使用舊的過濾器
+        （舊過濾器判斷為可能重複時仍會查詢資料庫確認，結果依然正確）
+        """
+        max_age = current_app.config.get('AVAILABILITY_FILTER_MAX_AGE') or cls.DEFAULT_MAX_AGE
+        if cls._username_filter is None:
+            with cls._rebuild_lock:
+                # 等待期間可能已由其他執行緒建立
+                if cls._username_filter is None:
+                    cls._build()
+            return
+
+        if (time.monotonic() - cls._built_at > max_age
+                or cls._username_filter.is_full):
+            if not cls._rebuild_lock.acquire(blocking=False):
+                return
+            try:
+                cls._build()
+            finally:
+                cls._rebuild_lock.release()
+
+    @classmethod
+    def add(cls, username: Optional[str] = None, email: Optional[str] = None) -> None:
+        """
+        將新的用戶名與電子郵件加入過濾器
+
+        Args:
+            username: 用戶名
+            email: 電子郵件
+        """
+        with cls._lock:
+            if cls._pending is not None:
+                cls._pending.append((username, email))
+            if cls._username_filter is None:
+                return
+            if username:
+                cls._username_filter.add(username)
+            if email:
+                cls._email_filter.add(email)
+
+    @classmethod
+    def is_username_available(cls, username: str) -> bool:
+        """
+        檢查用戶名是否可用
+
+        Args:
+            username: 用戶名
+
+        Returns:
+            bool: 是否可用
+        """
+        cls._ensure_fresh()
+        if username not in cls._username_filter:
+            return True
+        return not db.session.query(
+            User.query.filter_by(username=username).exists()
+        ).scalar()
+
+    @classmethod
+    def is_email_available(cls, email: str) -> bool:
+        """
+        檢查電子郵件是否可用
+
+        Args:
+            email: 電子郵件
+
+        Returns:
+            bool: 是否可用
+        """
+        cls._ensure_fresh()
+        if email not in cls._email_filter:
+            return True
+        return not db.session.query(
+            User.query.filter_by(email=email).exists()
+        ).scalar()
+
+
+@event.listens_for(User, 'after_insert')
+@event.listens_for(User, 'after_update')
+def _add_to_availability_filter(mapper, connection, target):
+    """用戶新增或修改用戶名、電子郵件後，將新值加入過濾器"""
+    state = db.inspect(target)
+    AvailabilityService.add(
+        target.username if state.attrs.username.history.has_changes() else None,
+        target.email if state.attrs.email.history.has_changes() else None
+    )
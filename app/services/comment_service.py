@@ -1,8 +1,13 @@
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List, Dict, Iterable
 from datetime import datetime
-from flask import current_app
+from flask import current_app, url_for
+from sqlalchemy import func, select, update, bindparam, true
+from app import db
 from app.models import Comment
+from app.utils.text import render_content
+from app.utils.events import publish_post_event
 from .base_service import BaseService
+from .notification_service import NotificationService
 
 
 class CommentService(BaseService):
@@ -11,6 +16,62 @@ class CommentService(BaseService):
     # 配置常量
     DEFAULT_PAGE_SIZE = 20
     MAX_REPLY_DEPTH = 3  # 最大回覆深度
+    RENDER_BATCH_SIZE = 500
+
+    @staticmethod
+    def set_content(comment: Comment, content: str) -> None:
+        """
+        設定留言內容，並同時產生 HTML，頁面顯示時不需再轉換
+
+        Args:
+            comment: 留言實例
+            content: 留言內容
+        """
+        comment.content = content
+        comment.content_html = render_content(
+            content, current_app.config.get('CONTENT_MARKDOWN_ENABLED', False)
+        )
+
+    @classmethod
+    def render_stored_comments(cls, rerender_all: bool = False) -> int:
+        """
+        為既有留言產生 HTML（資料遷移或調整轉換設定後使用）
+
+        Args:
+            rerender_all: 是否重新產生所有留言，否則只處理尚未產生的留言
+
+        Returns:
+            int: 處理的留言數
+        """
+        use_markdown = current_app.config.get('CONTENT_MARKDOWN_ENABLED', False)
+        condition = true() if rerender_all else Comment.content_html.is_(None)
+
+        # 保留原本的更新時間
+        table = Comment.__table__
+        statement = update(table).where(table.c.id == bindparam('comment_id')).values(
+            content_html=bindparam('content_html'),
+            updated_at=table.c.updated_at
+        )
+
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(Comment.id, Comment.content).where(condition, Comment.id > last_id)
+                .order_by(Comment.id).limit(cls.RENDER_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            db.session.execute(statement, [{
+                'comment_id': comment_id,
+                'content_html': render_content(content, use_markdown)
+            } for comment_id, content in rows])
+            db.session.commit()
+
+            total += len(rows)
+            last_id = rows[-1].id
+        return total
 
     @staticmethod
     def create_comment(user_id: int, post_id: int, content: str,
@@ -42,16 +103,47 @@ class CommentService(BaseService):
             comment = Comment(
                 user_id=user_id,
                 post_id=post_id,
-                content=content,
                 parent_id=parent_id
             )
+            CommentService.set_content(comment, content)
+
+            # 取得留言ID後寫入通知，與留言在同一交易提交
+            db.session.add(comment)
+            db.session.flush()
+            NotificationService.notify_comment(comment)
 
-            return CommentService.save_to_db(comment)
+            success, error = CommentService.commit()
+            if success:
+                CommentService.publish_comment_event(comment, 'comment')
+            return success, error
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error creating comment: {str(e)}")
             return False, str(e)
 
+    @staticmethod
+    def publish_comment_event(comment: Comment, event: str) -> None:
+        """
+        通知正在瀏覽文章的用戶端有新留言，內容與文章頁顯示的欄位相同
+
+        Args:
+            comment: 留言實例
+            event: 事件名稱
+        """
+        author = comment.author
+        publish_post_event(comment.post_id, event, {
+            'id': comment.id,
+            'parent_id': comment.parent_id,
+            'html': comment.content_html,
+            'created_at': comment.created_at.strftime('%Y-%m-%d %H:%M'),
+            'author': {
+                'username': author.username,
+                'avatar_url': url_for('static', filename=author.avatar_path) if author.avatar_path else None
+            },
+            'count': CommentService.count_post_comments(comment.post_id)
+        })
+
     @staticmethod
     def get_comment_by_id(comment_id: int) -> Optional[Comment]:
         """
@@ -85,9 +177,19 @@ class CommentService(BaseService):
             if not comment:
                 return False, "留言不存在"
 
-            return CommentService.delete_from_db(comment)
+            post_id = comment.post_id
+            # 通知隨留言與其回覆串聯刪除，先扣除接收者的未讀數
+            NotificationService.discard_comment_notifications(comment_id)
+            success, error = CommentService.delete_from_db(comment)
+            if success:
+                publish_post_event(post_id, 'comment_deleted', {
+                    'id': comment_id,
+                    'count': CommentService.count_post_comments(post_id)
+                })
+            return success, error
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error deleting comment: {str(e)}")
             return False, str(e)
 
@@ -123,6 +225,66 @@ class CommentService(BaseService):
             current_app.logger.error(f"Error getting post comments: {str(e)}")
             return [], 0
 
+    @staticmethod
+    def get_replies(comment_id: int) -> List[Comment]:
+        """
+        獲取留言的直接回覆
+
+        Args:
+            comment_id: 留言ID
+
+        Returns:
+            List[Comment]: 回覆列表（依時間排序）
+        """
+        try:
+            return Comment.query.filter_by(
+                parent_id=comment_id
+            ).order_by(
+                Comment.created_at
+            ).all()
+        except Exception as e:
+            current_app.logger.error(f"Error getting replies: {str(e)}")
+            return []
+
+    @staticmethod
+    def count_post_comments(post_id: int) -> int:
+        """
+        獲取文章的留言數（包含回覆）
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            int: 留言數
+        """
+        return db.session.query(func.count(Comment.id)).filter(Comment.post_id == post_id).scalar()
+
+    @staticmethod
+    def count_comments_by_post(post_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        以單一查詢批次取得多篇文章的留言數（包含回覆）
+
+        Args:
+            post_ids: 文章ID列表
+
+        Returns:
+            Dict[int, int]: 文章ID -> 留言數
+        """
+        post_ids = list(set(post_ids))
+        counts = dict.fromkeys(post_ids, 0)
+        if not post_ids:
+            return counts
+
+        try:
+            counts.update(db.session.query(
+                Comment.post_id, func.count(Comment.id)
+            ).filter(
+                Comment.post_id.in_(post_ids)
+            ).group_by(Comment.post_id).all())
+        except Exception as e:
+            current_app.logger.error(f"Error counting comments: {str(e)}")
+        return counts
+
     @staticmethod
     def get_comment_depth(comment_id: int) -> int:
         """
@@ -198,7 +360,7 @@ class CommentService(BaseService):
             if not comment:
                 return False, "留言不存在"
 
-            comment.content = content
+            CommentService.set_content(comment, content)
             comment.updated_at = datetime.now()
 
             return CommentService.commit()
@@ -0,0 +1,263 @@
+from typing import List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import select, insert, delete, func, literal, bindparam, or_, Integer
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import FeedEntry, Follow, Post, User
+from .base_service import BaseService
+
+
+class FeedService(BaseService):
+    """
+    首頁動態服務類
+
+    - 寫入時推送：一般作者發文時，以單一 INSERT ... SELECT 寫入每位追蹤者的 feed_entry
+    - 讀取時合併：追蹤者達 FEED_FANOUT_THRESHOLD 的作者不推送，讀取動態時再依 (user_id, id) 索引取得其文章
+    - 每位用戶最多保留 FEED_MAX_ENTRIES 筆，由 `flask feed trim` 定期刪除較舊的項目
+
+    作者的追蹤者數跨過門檻後，已推送的文章仍在動態中（讀取時去除重複）；
+    從門檻以上降到以下時，先前未推送的文章需執行 `flask feed rebuild` 補上
+    """
+
+    # 配置常量
+    REBUILD_BATCH_SIZE = 500
+
+    @staticmethod
+    def is_pushed(followers_count: int) -> bool:
+        """
+        作者的文章是否於發文時推送
+
+        Args:
+            followers_count: 作者的追蹤者數
+
+        Returns:
+            bool: 是否推送
+        """
+        return followers_count < current_app.config['FEED_FANOUT_THRESHOLD']
+
+    @classmethod
+    def fan_out_post(cls, post: Post) -> None:
+        """
+        將新文章寫入作者本人與追蹤者的動態（不提交交易，由呼叫端與文章一起提交）
+
+        Args:
+            post: 已取得ID的文章
+        """
+        db.session.execute(insert(FeedEntry).values(
+            user_id=post.user_id, post_id=post.id, author_id=post.user_id
+        ))
+
+        followers_count = db.session.scalar(select(User.followers_count).where(User.id == post.user_id))
+        if not cls.is_pushed(followers_count or 0):
+            return
+
+        db.session.execute(insert(FeedEntry).from_select(
+            ['user_id', 'post_id', 'author_id'],
+            select(Follow.follower_id, literal(post.id), literal(post.user_id))
+            .where(Follow.followed_id == post.user_id)
+        ))
+
+    @classmethod
+    def add_author(cls, user_id: int, author_id: int) -> None:
+        """
+        追蹤後將作者最近的文章補進動態（不提交交易）；不推送的作者在讀取時合併，不需補上
+
+        Args:
+            user_id: 追蹤者ID
+            author_id: 作者ID
+        """
+        followers_count = db.session.scalar(select(User.followers_count).where(User.id == author_id))
+        if not cls.is_pushed(followers_count or 0):
+            return
+
+        db.session.execute(insert(FeedEntry).from_select(
+            ['user_id', 'post_id', 'author_id'],
+            select(literal(user_id), Post.id, Post.user_id)
+            .where(Post.user_id == author_id)
+            .order_by(Post.id.desc())
+            .limit(current_app.config['FEED_BACKFILL'])
+        ))
+
+    @staticmethod
+    def remove_author(user_id: int, author_id: int) -> None:
+        """
+        取消追蹤後移除動態中該作者的文章（不提交交易）
+
+        Args:
+            user_id: 追蹤者ID
+            author_id: 作者ID
+        """
+        db.session.execute(delete(FeedEntry).where(
+            FeedEntry.user_id == user_id,
+            FeedEntry.author_id == author_id
+        ))
+
+    @staticmethod
+    def remove_post(post_id: int) -> None:
+        """
+        刪除文章時移除所有動態中的項目（不提交交易）
+
+        Args:
+            post_id: 文章ID
+        """
+        db.session.execute(delete(FeedEntry).where(FeedEntry.post_id == post_id))
+
+    @staticmethod
+    def get_pulled_author_ids(user_id: int) -> List[int]:
+        """
+        獲取用戶追蹤的作者中，於讀取時合併的作者（追蹤者達門檻）
+
+        Args:
+            user_id: 用戶ID
+
+        Returns:
+            List[int]: 作者ID列表
+        """
+        return db.session.scalars(
+            select(Follow.followed_id).join(
+                User, User.id == Follow.followed_id
+            ).where(
+                Follow.follower_id == user_id,
+                User.followers_count >= current_app.config['FEED_FANOUT_THRESHOLD']
+            )
+        ).all()
+
+    @classmethod
+    def get_feed_post_ids(cls, user_id: int, before: Optional[int] = None,
+                          limit: int = None) -> List[int]:
+        """
+        獲取動態中的文章ID（由新到舊）：動態表的一次主鍵範圍讀取，
+        再合併不推送的作者在同一範圍內的文章
+
+        Args:
+            user_id: 用戶ID
+            before: 只取ID小於此值的文章（上一頁最後一篇）
+            limit: 數量
+
+        Returns:
+            List[int]: 文章ID列表
+        """
+        limit = limit or current_app.config['FEED_PAGE_SIZE']
+
+        statement = select(FeedEntry.post_id).where(FeedEntry.user_id == user_id)
+        if before:
+            statement = statement.where(FeedEntry.post_id < before)
+        post_ids = set(db.session.scalars(statement.order_by(FeedEntry.post_id.desc()).limit(limit)))
+
+        pulled = cls.get_pulled_author_ids(user_id)
+        if pulled:
+            statement = select(Post.id).where(Post.user_id.in_(pulled))
+            if before:
+                statement = statement.where(Post.id < before)
+            post_ids.update(db.session.scalars(statement.order_by(Post.id.desc()).limit(limit)))
+
+        return sorted(post_ids, reverse=True)[:limit]
+
+    @classmethod
+    def get_feed(cls, user_id: int, before: Optional[int] = None,
+                 limit: int = None) -> Tuple[List[Post], Optional[int]]:
+        """
+        獲取用戶的首頁動態
+
+        Args:
+            user_id: 用戶ID
+            before: 只取ID小於此值的文章（上一頁最後一篇）
+            limit: 數量
+
+        Returns:
+            Tuple[List[Post], Optional[int]]: (文章列表, 下一頁的 before 參數；沒有下一頁時為 None)
+        """
+        from .post_service import PostService
+
+        limit = limit or current_app.config['FEED_PAGE_SIZE']
+        try:
+            post_ids = cls.get_feed_post_ids(user_id, before, limit)
+            if not post_ids:
+                return [], None
+
+            posts = {post.id: post for post in Post.query.options(
+                PostService.list_options(),
+                joinedload(Post.author)
+            ).filter(Post.id.in_(post_ids))}
+            next_before = post_ids[-1] if len(post_ids) == limit else None
+            # 已刪除的文章直接略過
+            return [posts[post_id] for post_id in post_ids if post_id in posts], next_before
+        except Exception as e:
+            current_app.logger.error(f"Error getting feed: {str(e)}")
+            return [], None
+
+    @staticmethod
+    def trim(max_entries: int = None) -> int:
+        """
+        每位用戶只保留最新的 max_entries 筆動態（建議以排程定期執行）
+
+        Args:
+            max_entries: 保留筆數，預設使用 FEED_MAX_ENTRIES
+
+        Returns:
+            int: 刪除的項目數
+        """
+        max_entries = max_entries or current_app.config['FEED_MAX_ENTRIES']
+        table = FeedEntry.__table__
+
+        user_ids = db.session.scalars(
+            select(table.c.user_id).group_by(table.c.user_id)
+            .having(func.count() > max_entries)
+        ).all()
+        if not user_ids:
+            return 0
+
+        # 每位用戶保留的最舊一筆
+        cutoff = select(table.c.post_id).where(
+            table.c.user_id == bindparam('owner_id')
+        ).order_by(table.c.post_id.desc()).limit(1).offset(max_entries - 1).scalar_subquery()
+        result = db.session.execute(
+            delete(table).where(table.c.user_id == bindparam('owner_id'), table.c.post_id < cutoff),
+            [{'owner_id': user_id} for user_id in user_ids]
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        依追蹤關係重建所有用戶的動態（既有資料初次建立，或作者的追蹤者數降到門檻以下後補上文章）
+
+        Returns:
+            int: 重建的用戶數
+        """
+        db.session.execute(delete(FeedEntry))
+        db.session.commit()
+
+        # 每位用戶的動態：本人與推送作者最新的 FEED_MAX_ENTRIES 篇文章
+        threshold = current_app.config['FEED_FANOUT_THRESHOLD']
+        owner_id = bindparam('owner_id', type_=Integer)
+        pushed_authors = select(Follow.followed_id).join(
+            User, User.id == Follow.followed_id
+        ).where(
+            Follow.follower_id == owner_id,
+            User.followers_count < threshold
+        )
+        statement = insert(FeedEntry.__table__).from_select(
+            ['user_id', 'post_id', 'author_id'],
+            select(owner_id, Post.id, Post.user_id).where(
+                or_(Post.user_id == owner_id, Post.user_id.in_(pushed_authors))
+            ).order_by(Post.id.desc()).limit(current_app.config['FEED_MAX_ENTRIES'])
+        )
+
+        total = 0
+        last_id = 0
+        while True:
+            user_ids = db.session.scalars(
+                select(User.id).where(User.id > last_id)
+                .order_by(User.id).limit(cls.REBUILD_BATCH_SIZE)
+            ).all()
+            if not user_ids:
+                break
+
+            db.session.execute(statement, [{'owner_id': user_id} for user_id in user_ids])
+            db.session.commit()
+
+            total += len(user_ids)
+            last_id = user_ids[-1]
+        return total
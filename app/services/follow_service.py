@@ -0,0 +1,130 @@
+from typing import Iterable, Optional, Set, Tuple
+from flask import current_app
+from sqlalchemy import select, update
+from app import db
+from app.models import Follow, User
+from .base_service import BaseService
+from .feed_service import FeedService
+
+
+class FollowService(BaseService):
+    """追蹤服務類"""
+
+    @staticmethod
+    def _adjust_counts(follower_id: int, followed_id: int, delta: int) -> None:
+        """
+        更新追蹤數計數（同時更新兩位用戶的更新時間，會員列表的快取隨之失效）
+
+        Args:
+            follower_id: 追蹤者ID
+            followed_id: 被追蹤者ID
+            delta: 增減量
+        """
+        db.session.execute(
+            update(User).where(User.id == followed_id)
+            .values(followers_count=User.followers_count + delta)
+        )
+        db.session.execute(
+            update(User).where(User.id == follower_id)
+            .values(following_count=User.following_count + delta)
+        )
+
+    @staticmethod
+    def follow(follower_id: int, followed_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        追蹤用戶，並將其最近的文章補進追蹤者的動態
+
+        Args:
+            follower_id: 追蹤者ID
+            followed_id: 被追蹤者ID
+
+        Returns:
+            Tuple[bool, Optional[str]]: (是否成功, 錯誤訊息)
+        """
+        try:
+            if follower_id == followed_id:
+                return False, "不能追蹤自己"
+            if db.session.get(User, followed_id) is None:
+                return False, "用戶不存在"
+            if db.session.get(Follow, (follower_id, followed_id)) is not None:
+                return True, None
+
+            db.session.add(Follow(follower_id=follower_id, followed_id=followed_id))
+            db.session.flush()
+            # 先補上動態再更新計數，以追蹤前的追蹤者數判斷是否推送
+            FeedService.add_author(follower_id, followed_id)
+            FollowService._adjust_counts(follower_id, followed_id, 1)
+            return FollowService.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error following user: {str(e)}")
+            return False, str(e)
+
+    @staticmethod
+    def unfollow(follower_id: int, followed_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        取消追蹤用戶，並移除動態中該用戶的文章
+
+        Args:
+            follower_id: 追蹤者ID
+            followed_id: 被追蹤者ID
+
+        Returns:
+            Tuple[bool, Optional[str]]: (是否成功, 錯誤訊息)
+        """
+        try:
+            follow = db.session.get(Follow, (follower_id, followed_id))
+            if follow is None:
+                return True, None
+
+            db.session.delete(follow)
+            FeedService.remove_author(follower_id, followed_id)
+            FollowService._adjust_counts(follower_id, followed_id, -1)
+            return FollowService.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error unfollowing user: {str(e)}")
+            return False, str(e)
+
+    @staticmethod
+    def is_following(follower_id: int, followed_id: int) -> bool:
+        """
+        檢查是否已追蹤用戶
+
+        Args:
+            follower_id: 追蹤者ID
+            followed_id: 被追蹤者ID
+
+        Returns:
+            bool: 是否已追蹤
+        """
+        return db.session.get(Follow, (follower_id, followed_id)) is not None
+
+    @staticmethod
+    def get_followed_ids(follower_id: int, user_ids: Iterable[int]) -> Set[int]:
+        """
+        以單一查詢取得用戶在指定用戶中已追蹤的用戶ID（使用主鍵）
+
+        Args:
+            follower_id: 追蹤者ID
+            user_ids: 用戶ID列表
+
+        Returns:
+            Set[int]: 已追蹤的用戶ID
+        """
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return set()
+
+        try:
+            return set(db.session.scalars(
+                select(Follow.followed_id).where(
+                    Follow.follower_id == follower_id,
+                    Follow.followed_id.in_(user_ids)
+                )
+            ))
+        except Exception as e:
+            current_app.logger.error(f"Error getting followed users: {str(e)}")
+            return set()
@@ -1,10 +1,13 @@
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Iterable, Set
 from datetime import datetime, timedelta
-from flask import current_app
+from flask import current_app, g
+from flask_login import current_user
 from sqlalchemy import func
 from app import db
 from app.models import Like, Post
+from app.utils.events import publish_post_event
 from .base_service import BaseService
+from .notification_service import NotificationService
 
 
 class LikeService(BaseService):
@@ -24,8 +27,7 @@ class LikeService(BaseService):
         """
         try:
             # 檢查文章是否存在
-            post = Post.query.get(post_id)
-            if not post:
+            if not db.session.query(Post.query.filter_by(id=post_id).exists()).scalar():
                 return False, False, 0
 
             # 檢查是否已經按讚
@@ -38,19 +40,52 @@ class LikeService(BaseService):
                 # 取消按讚
                 db.session.delete(existing_like)
                 db.session.commit()
-                return True, False, post.like_count
+                LikeService._remember_liked(post_id, False)
+                liked = False
             else:
                 # 新增按讚
                 new_like = Like(post_id=post_id, user_id=user_id)
                 db.session.add(new_like)
+                # 通知與按讚在同一交易寫入
+                NotificationService.notify_like(user_id, post_id)
                 db.session.commit()
-                return True, True, post.like_count
+                LikeService._remember_liked(post_id, True)
+                liked = True
+
+            count = LikeService.count_post_likes(post_id)
+            LikeService.publish_like_count(post_id, count)
+            return True, liked, count
 
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f"Error toggling like: {str(e)}")
             return False, False, 0
 
+    @staticmethod
+    def publish_like_count(post_id: int, count: int) -> None:
+        """
+        通知正在瀏覽文章的用戶端最新的按讚數
+        連續的更新只會送出最新值
+
+        Args:
+            post_id: 文章ID
+            count: 按讚數
+        """
+        publish_post_event(post_id, 'likes', {'post_id': post_id, 'count': count}, key='likes')
+
+    @staticmethod
+    def count_post_likes(post_id: int) -> int:
+        """
+        獲取文章的按讚數
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            int: 按讚數
+        """
+        return db.session.query(func.count(Like.id)).filter(Like.post_id == post_id).scalar()
+
     @staticmethod
     def is_post_liked_by_user(post_id: int, user_id: int) -> bool:
         """
@@ -72,6 +107,112 @@ class LikeService(BaseService):
             current_app.logger.error(f"Error checking like status: {str(e)}")
             return False
 
+    @staticmethod
+    def get_liked_post_ids(user_id: int, post_ids: Iterable[int]) -> Set[int]:
+        """
+        以單一查詢取得用戶在指定文章中已按讚的文章ID（使用 user_id + post_id 唯一索引）
+
+        Args:
+            user_id: 用戶ID
+            post_ids: 文章ID列表
+
+        Returns:
+            Set[int]: 已按讚的文章ID
+        """
+        post_ids = list(set(post_ids))
+        if not post_ids:
+            return set()
+
+        try:
+            return set(db.session.scalars(
+                db.select(Like.post_id).where(
+                    Like.user_id == user_id,
+                    Like.post_id.in_(post_ids)
+                )
+            ))
+        except Exception as e:
+            current_app.logger.error(f"Error getting liked posts: {str(e)}")
+            return set()
+
+    @staticmethod
+    def _liked_cache() -> Dict[str, Set[int]]:
+        """目前請求的按讚狀態快取：已查詢過的文章ID與其中已按讚的文章ID"""
+        if 'liked_posts' not in g:
+            g.liked_posts = {'checked': set(), 'liked': set()}
+        return g.liked_posts
+
+    @staticmethod
+    def _remember_liked(post_id: int, liked: bool) -> None:
+        """按讚狀態改變後更新本次請求的快取"""
+        if 'liked_posts' not in g:
+            return
+        g.liked_posts['checked'].add(post_id)
+        if liked:
+            g.liked_posts['liked'].add(post_id)
+        else:
+            g.liked_posts['liked'].discard(post_id)
+
+    @classmethod
+    def prefetch_liked_posts(cls, post_ids: Iterable[int]) -> None:
+        """
+        批次載入目前用戶對多篇文章的按讚狀態，存入本次請求的快取
+        列表頁在渲染前呼叫一次，模板中的 liked_by_current_user() 就不需再逐篇查詢
+
+        Args:
+            post_ids: 文章ID列表
+        """
+        if not current_user.is_authenticated:
+            return
+
+        cache = cls._liked_cache()
+        missing = set(post_ids) - cache['checked']
+        if missing:
+            cache['liked'] |= cls.get_liked_post_ids(current_user.id, missing)
+            cache['checked'] |= missing
+
+    @classmethod
+    def is_liked_by_current_user(cls, post_id: int) -> bool:
+        """
+        檢查目前用戶是否已對文章按讚，優先使用本次請求的快取
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            bool: 是否已按讚（未登入時為 False）
+        """
+        if not current_user.is_authenticated:
+            return False
+
+        cls.prefetch_liked_posts([post_id])
+        return post_id in cls._liked_cache()['liked']
+
+    @staticmethod
+    def count_likes_by_post(post_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        以單一查詢批次取得多篇文章的按讚數
+
+        Args:
+            post_ids: 文章ID列表
+
+        Returns:
+            Dict[int, int]: 文章ID -> 按讚數
+        """
+        post_ids = list(set(post_ids))
+        counts = dict.fromkeys(post_ids, 0)
+        if not post_ids:
+            return counts
+
+        try:
+            counts.update(db.session.query(
+                Like.post_id, func.count(Like.id)
+            ).filter(
+                Like.post_id.in_(post_ids)
+            ).group_by(Like.post_id).all())
+        except Exception as e:
+            current_app.logger.error(f"Error counting likes: {str(e)}")
+        return counts
+
     @staticmethod
     def get_user_liked_posts(user_id: int, page: int = 1,
                              per_page: int = 10) -> Tuple[List[Post], int]:
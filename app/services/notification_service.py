@@ -0,0 +1,383 @@
+import smtplib
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from flask import current_app, render_template
+from sqlalchemy import select, insert, update, bindparam, func, exists
+from sqlalchemy.orm import selectinload, load_only
+from app import db
+from app.models import Notification, User, Post, Comment
+from .base_service import BaseService
+
+
+class NotificationService(BaseService):
+    """通知服務類"""
+
+    # 配置常量
+    DEFAULT_PAGE_SIZE = 20
+    DIGEST_BATCH_SIZE = 100  # 每批處理的收件用戶數
+
+    @staticmethod
+    def add_notifications(rows: List[Dict]) -> int:
+        """
+        批次寫入通知並遞增接收者的未讀數
+        不提交交易，由呼叫端與觸發通知的留言或按讚一起提交
+
+        Args:
+            rows: 通知欄位（user_id、actor_id、kind、post_id、comment_id）
+
+        Returns:
+            int: 寫入的通知數
+        """
+        if not rows:
+            return 0
+
+        now = datetime.now()
+        db.session.execute(insert(Notification), [{
+            'comment_id': None, **row, 'created_at': now
+        } for row in rows])
+
+        counts = defaultdict(int)
+        for row in rows:
+            counts[row['user_id']] += 1
+
+        # 以單一 executemany 遞增計數，保留原本的更新時間（會員列表以此判斷快取是否有效）
+        table = User.__table__
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('recipient_id')).values(
+                unread_notifications=table.c.unread_notifications + bindparam('increment'),
+                updated_at=table.c.updated_at
+            ),
+            [{'recipient_id': user_id, 'increment': count} for user_id, count in counts.items()]
+        )
+        return len(rows)
+
+    @staticmethod
+    def _discard_unread(condition) -> int:
+        """
+        扣除即將被刪除的未讀通知所計入的未讀數
+        通知隨文章或留言串聯刪除，刪除前呼叫，不提交交易
+
+        Args:
+            condition: 篩選即將刪除的通知的條件
+
+        Returns:
+            int: 扣除的未讀通知數
+        """
+        counts = db.session.execute(
+            select(Notification.user_id, func.count(Notification.id)).where(
+                condition,
+                Notification.read_at.is_(None)
+            ).group_by(Notification.user_id)
+        ).all()
+        if not counts:
+            return 0
+
+        # 與 add_notifications 相同，以單一 executemany 遞減計數並保留原本的更新時間
+        table = User.__table__
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('recipient_id')).values(
+                unread_notifications=table.c.unread_notifications - bindparam('decrement'),
+                updated_at=table.c.updated_at
+            ),
+            [{'recipient_id': user_id, 'decrement': count} for user_id, count in counts]
+        )
+        return sum(count for _, count in counts)
+
+    @classmethod
+    def discard_post_notifications(cls, post_id: int) -> int:
+        """
+        刪除文章前扣除其未讀通知（包含文章下所有留言的通知）的未讀數，不提交交易
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            int: 扣除的未讀通知數
+        """
+        return cls._discard_unread(Notification.post_id == post_id)
+
+    @classmethod
+    def discard_comment_notifications(cls, comment_id: int) -> int:
+        """
+        刪除留言前扣除其未讀通知的未讀數，不提交交易
+        回覆會隨留言串聯刪除，以遞迴查詢一併取得所有下層回覆
+
+        Args:
+            comment_id: 留言ID
+
+        Returns:
+            int: 扣除的未讀通知數
+        """
+        tree = select(Comment.id).where(Comment.id == comment_id).cte('comment_tree', recursive=True)
+        tree = tree.union_all(select(Comment.id).where(Comment.parent_id == tree.c.id))
+        return cls._discard_unread(Notification.comment_id.in_(select(tree.c.id)))
+
+    @staticmethod
+    def build_comment_notifications(comment: Comment) -> List[Dict]:
+        """
+        產生留言觸發的通知：文章作者收到新留言通知，被回覆的留言作者收到回覆通知
+        同一用戶只收到一則（回覆優先），留言者本人不會收到通知
+
+        Args:
+            comment: 已取得ID的留言
+
+        Returns:
+            List[Dict]: 通知欄位
+        """
+        recipients = {}
+        if comment.parent_id:
+            parent_author_id = db.session.scalar(
+                select(Comment.user_id).where(Comment.id == comment.parent_id)
+            )
+            if parent_author_id is not None:
+                recipients[parent_author_id] = Notification.KIND_REPLY
+
+        post_author_id = db.session.scalar(select(Post.user_id).where(Post.id == comment.post_id))
+        if post_author_id is not None:
+            recipients.setdefault(post_author_id, Notification.KIND_COMMENT)
+
+        recipients.pop(comment.user_id, None)
+        return [{
+            'user_id': user_id,
+            'actor_id': comment.user_id,
+            'kind': kind,
+            'post_id': comment.post_id,
+            'comment_id': comment.id
+        } for user_id, kind in recipients.items()]
+
+    @classmethod
+    def notify_comment(cls, comment: Comment) -> int:
+        """
+        寫入留言觸發的通知（不提交交易）
+
+        Args:
+            comment: 已取得ID的留言
+
+        Returns:
+            int: 寫入的通知數
+        """
+        return cls.add_notifications(cls.build_comment_notifications(comment))
+
+    @classmethod
+    def notify_like(cls, user_id: int, post_id: int) -> int:
+        """
+        寫入按讚觸發的通知（不提交交易）
+        對自己的文章按讚、或同一用戶對同一文章已有未讀的按讚通知（反覆取消再按讚）時不寫入
+
+        Args:
+            user_id: 按讚的用戶ID
+            post_id: 文章ID
+
+        Returns:
+            int: 寫入的通知數
+        """
+        post_author_id = db.session.scalar(select(Post.user_id).where(Post.id == post_id))
+        if post_author_id is None or post_author_id == user_id:
+            return 0
+
+        duplicate = db.session.scalar(select(exists().where(
+            Notification.user_id == post_author_id,
+            Notification.actor_id == user_id,
+            Notification.post_id == post_id,
+            Notification.kind == Notification.KIND_LIKE,
+            Notification.read_at.is_(None)
+        )))
+        if duplicate:
+            return 0
+
+        return cls.add_notifications([{
+            'user_id': post_author_id,
+            'actor_id': user_id,
+            'kind': Notification.KIND_LIKE,
+            'post_id': post_id
+        }])
+
+    @classmethod
+    def get_user_notifications(cls, user_id: int, page: int = 1,
+                               per_page: int = None):
+        """
+        獲取用戶的通知（由新到舊），並預先載入觸發者與文章標題
+
+        Args:
+            user_id: 用戶ID
+            page: 頁碼
+            per_page: 每頁數量
+
+        Returns:
+            Pagination: 分頁物件（發生錯誤時為 None）
+        """
+        try:
+            return Notification.query.options(
+                selectinload(Notification.actor).load_only(User.id, User.username, User.avatar_path),
+                selectinload(Notification.post).load_only(Post.id, Post.title)
+            ).filter(
+                Notification.user_id == user_id
+            ).order_by(
+                Notification.id.desc()
+            ).paginate(
+                page=page,
+                per_page=per_page or cls.DEFAULT_PAGE_SIZE,
+                error_out=False
+            )
+        except Exception as e:
+            current_app.logger.error(f"Error getting notifications: {str(e)}")
+            return None
+
+    @staticmethod
+    def mark_all_read(user_id: int) -> Tuple[bool, Optional[str]]:
+        """
+        將用戶的通知全部標記為已讀並將未讀數歸零
+
+        Args:
+            user_id: 用戶ID
+
+        Returns:
+            Tuple[bool, Optional[str]]: (是否成功, 錯誤訊息)
+        """
+        try:
+            db.session.execute(
+                update(Notification).where(
+                    Notification.user_id == user_id,
+                    Notification.read_at.is_(None)
+                ).values(read_at=datetime.now())
+            )
+            table = User.__table__
+            db.session.execute(
+                update(table).where(table.c.id == user_id).values(
+                    unread_notifications=0,
+                    updated_at=table.c.updated_at
+                )
+            )
+            return NotificationService.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error marking notifications read: {str(e)}")
+            return False, str(e)
+
+    @staticmethod
+    def recount_unread() -> int:
+        """
+        依通知表重新計算所有用戶的未讀數（計數與通知表不一致時修正）
+
+        Returns:
+            int: 更新的用戶數
+        """
+        table = User.__table__
+        unread = select(func.count(Notification.id)).where(
+            Notification.user_id == table.c.id,
+            Notification.read_at.is_(None)
+        ).scalar_subquery()
+        result = db.session.execute(
+            update(table).where(table.c.unread_notifications != unread).values(
+                unread_notifications=unread,
+                updated_at=table.c.updated_at
+            )
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def render_digest(user: User, notifications: List[Notification], max_items: int):
+        """
+        產生用戶的通知摘要郵件
+
+        Args:
+            user: 收件用戶
+            notifications: 未讀且尚未寄出的通知（由新到舊）
+            max_items: 郵件中最多列出的通知數
+
+        Returns:
+            EmailMessage: 郵件
+        """
+        from app.utils.mail import build_message
+
+        total = len(notifications)
+        body = render_template('emails/notification_digest.txt',
+                               user=user,
+                               notifications=notifications[:max_items],
+                               total=total,
+                               more=max(0, total - max_items))
+        return build_message(current_app.config['MAIL_DEFAULT_SENDER'], user.email,
+                             f'你有 {total} 則新通知', body)
+
+    @classmethod
+    def send_digests(cls) -> Tuple[int, int]:
+        """
+        寄出通知摘要郵件：每位有未讀且尚未寄出通知的用戶一封，
+        所有郵件在同一條 SMTP 連線上送出，每批用戶寄出後以單一 UPDATE 標記已寄出並提交
+
+        只處理開始執行時已存在的通知，執行期間新增的通知留待下次寄出
+
+        Returns:
+            Tuple[int, int]: (寄出的郵件數, 包含的通知數)
+        """
+        from app.utils.mail import smtp_connection
+
+        app = current_app._get_current_object()
+        max_items = app.config['NOTIFICATION_DIGEST_MAX_ITEMS']
+        cutoff = db.session.scalar(select(func.max(Notification.id)))
+        if cutoff is None:
+            return 0, 0
+
+        pending = (
+            Notification.emailed_at.is_(None),
+            Notification.read_at.is_(None),
+            Notification.id <= cutoff
+        )
+
+        sent = 0
+        included = 0
+        last_user_id = 0
+        # 郵件中的連結以 SITE_URL 產生完整網址
+        with smtp_connection(app) as client, app.test_request_context(base_url=app.config['SITE_URL']):
+            while True:
+                user_ids = db.session.scalars(
+                    select(Notification.user_id).distinct().where(
+                        *pending, Notification.user_id > last_user_id
+                    ).order_by(Notification.user_id).limit(cls.DIGEST_BATCH_SIZE)
+                ).all()
+                if not user_ids:
+                    break
+                last_user_id = user_ids[-1]
+
+                users = {user.id: user for user in db.session.scalars(
+                    select(User).options(load_only(User.id, User.username, User.email, User.is_active))
+                    .where(User.id.in_(user_ids))
+                )}
+                grouped = defaultdict(list)
+                for notification in db.session.scalars(
+                    select(Notification).options(
+                        selectinload(Notification.actor).load_only(User.id, User.username),
+                        selectinload(Notification.post).load_only(Post.id, Post.title)
+                    ).where(
+                        *pending, Notification.user_id.in_(user_ids)
+                    ).order_by(Notification.user_id, Notification.id.desc())
+                ):
+                    grouped[notification.user_id].append(notification)
+
+                emailed_user_ids = []
+                for user_id, notifications in grouped.items():
+                    user = users.get(user_id)
+                    if user is None or not user.is_active:
+                        continue
+                    try:
+                        client.send_message(cls.render_digest(user, notifications, max_items))
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                            smtplib.SMTPDataError) as e:
+                        # 單一收件者被拒絕不影響其他人，未標記的通知下次再寄
+                        app.logger.error(f"Error sending digest to user {user_id}: {str(e)}")
+                        continue
+                    emailed_user_ids.append(user_id)
+                    included += len(notifications)
+
+                if emailed_user_ids:
+                    db.session.execute(
+                        update(Notification).where(
+                            *pending, Notification.user_id.in_(emailed_user_ids)
+                        ).values(emailed_at=datetime.now())
+                    )
+                db.session.commit()
+                sent += len(emailed_user_ids)
+
+        return sent, included
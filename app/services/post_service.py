@@ -1,9 +1,18 @@
-from typing import Tuple, Optional, Any, List
+from typing import Tuple, Optional, Any, List, Dict, Iterable
 from datetime import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, func, select, update, bindparam, true
+from sqlalchemy.orm import load_only, defer, joinedload, selectinload
 from flask import current_app
-from app.models import Post
+from app import db
+from app.models import Post, User, Comment, Like, RelatedPost
+from app.utils.text import render_content, make_excerpt
+from app.utils.database import replica_reads
 from .base_service import BaseService
+from .like_service import LikeService
+from .comment_service import CommentService
+from .feed_service import FeedService
+from .notification_service import NotificationService
+from .related_post_service import RelatedPostService
 
 
 class PostService(BaseService):
@@ -12,6 +21,100 @@ class PostService(BaseService):
     # 配置常量
     DEFAULT_PAGE_SIZE = 10
     EXCERPT_LENGTH = 200
+    RENDER_BATCH_SIZE = 500
+
+    # 列表頁卡片需要的欄位（不含 content 與 content_html）
+    LIST_COLUMNS = (Post.id, Post.title, Post.excerpt, Post.user_id, Post.created_at, Post.updated_at)
+
+    @classmethod
+    def list_options(cls):
+        """
+        列表查詢的載入選項：只載入卡片需要的欄位，
+        文章內容在實際存取時才另外載入（例如尚未產生摘要的舊文章）
+
+        Returns:
+            載入選項
+        """
+        return load_only(*cls.LIST_COLUMNS)
+
+    @staticmethod
+    def prefetch_counts(posts: List[Post]) -> List[Post]:
+        """
+        以兩個查詢批次載入多篇文章的按讚數與留言數，
+        之後存取 post.like_count / post.comments_count 不會再逐篇查詢
+
+        Args:
+            posts: 文章列表
+
+        Returns:
+            List[Post]: 同一個文章列表
+        """
+        post_ids = [post.id for post in posts]
+        likes = LikeService.count_likes_by_post(post_ids)
+        comments = CommentService.count_comments_by_post(post_ids)
+        for post in posts:
+            post._like_count = likes.get(post.id, 0)
+            post._comments_count = comments.get(post.id, 0)
+        return posts
+
+    @classmethod
+    def set_content(cls, post: Post, content: str) -> None:
+        """
+        設定文章內容，並同時產生 HTML 與摘要，頁面顯示時不需再轉換
+
+        Args:
+            post: 文章實例
+            content: 文章內容
+        """
+        post.content = content
+        post.content_html = render_content(
+            content, current_app.config.get('CONTENT_MARKDOWN_ENABLED', False)
+        )
+        post.excerpt = make_excerpt(content, cls.EXCERPT_LENGTH)
+
+    @classmethod
+    def render_stored_posts(cls, rerender_all: bool = False) -> int:
+        """
+        為既有文章產生 HTML 與摘要（資料遷移或調整轉換設定後使用）
+
+        Args:
+            rerender_all: 是否重新產生所有文章，否則只處理尚未產生的文章
+
+        Returns:
+            int: 處理的文章數
+        """
+        use_markdown = current_app.config.get('CONTENT_MARKDOWN_ENABLED', False)
+        condition = true() if rerender_all else or_(Post.content_html.is_(None), Post.excerpt.is_(None))
+
+        # 保留原本的更新時間（否則 onupdate 會把所有文章標記為已編輯）
+        table = Post.__table__
+        statement = update(table).where(table.c.id == bindparam('post_id')).values(
+            content_html=bindparam('content_html'),
+            excerpt=bindparam('excerpt'),
+            updated_at=table.c.updated_at
+        )
+
+        # 依ID分批處理，只讀取需要的欄位
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(Post.id, Post.content).where(condition, Post.id > last_id)
+                .order_by(Post.id).limit(cls.RENDER_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            db.session.execute(statement, [{
+                'post_id': post_id,
+                'content_html': render_content(content, use_markdown),
+                'excerpt': make_excerpt(content, cls.EXCERPT_LENGTH)
+            } for post_id, content in rows])
+            db.session.commit()
+
+            total += len(rows)
+            last_id = rows[-1].id
+        return total
 
     @staticmethod
     def create_post(user_id: int, title: str, content: str) -> Tuple[Optional[Post], Optional[str]]:
@@ -36,14 +139,25 @@ class PostService(BaseService):
             # 創建文章
             post = Post(
                 title=title,
-                content=content,
                 user_id=user_id
             )
+            PostService.set_content(post, content)
+
+            # 取得文章ID後推送到追蹤者的動態，與文章在同一交易提交
+            db.session.add(post)
+            db.session.flush()
+            FeedService.fan_out_post(post)
 
-            success, error = PostService.save_to_db(post)
-            return (post, None) if success else (None, error)
+            success, error = PostService.commit()
+            if not success:
+                return None, error
+
+            # 提交後再計算相關文章，失敗時不影響發文
+            RelatedPostService.refresh_post(post.id, title, content)
+            return post, None
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error creating post: {str(e)}")
             return None, str(e)
 
@@ -64,7 +178,92 @@ class PostService(BaseService):
             current_app.logger.error(f"Error getting post: {str(e)}")
             return None
 
+    @staticmethod
+    def get_post_for_display(post_id: int) -> Optional[Post]:
+        """
+        取得詳情頁顯示的文章：頁面輸出預先轉換的 content_html，
+        原始內容延後到實際存取時才載入（只有尚未產生 HTML 的舊文章會用到）；
+        留言與回覆一併預先載入
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            Optional[Post]: 文章實例或None
+        """
+        try:
+            # 作者、留言、回覆及其作者以固定數量的查詢一併載入
+            return Post.query.options(
+                defer(Post.content),
+                joinedload(Post.author),
+                selectinload(Post.comments).options(
+                    joinedload(Comment.author),
+                    selectinload(Comment.replies).joinedload(Comment.author)
+                )
+            ).filter_by(id=post_id).first()
+        except Exception as e:
+            current_app.logger.error(f"Error getting post: {str(e)}")
+            return None
+
+    @staticmethod
+    def post_exists(post_id: int) -> bool:
+        """
+        檢查文章是否存在（不載入文章內容）
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            bool: 是否存在
+        """
+        return db.session.query(Post.query.filter_by(id=post_id).exists()).scalar()
+
+    @staticmethod
+    def get_post_cache_validators(post_id: int) -> Optional[tuple]:
+        """
+        以單一輕量查詢取得文章詳情頁的版本資訊，用於條件式 GET
+
+        Args:
+            post_id: 文章ID
+
+        Returns:
+            Optional[tuple]: 版本資訊，文章不存在時為 None
+        """
+        comments = select(Comment.id).where(Comment.post_id == post_id)
+        row = db.session.query(
+            Post.updated_at,
+            User.updated_at,
+            select(func.count(Comment.id)).where(Comment.post_id == post_id).scalar_subquery(),
+            select(func.max(Comment.updated_at)).where(Comment.post_id == post_id).scalar_subquery(),
+            select(func.max(User.updated_at)).where(
+                User.id.in_(select(Comment.user_id).where(Comment.id.in_(comments)))
+            ).scalar_subquery(),
+            select(func.count(Like.id)).where(Like.post_id == post_id).scalar_subquery(),
+            select(func.max(Like.created_at)).where(Like.post_id == post_id).scalar_subquery(),
+            select(func.count()).where(RelatedPost.post_id == post_id).scalar_subquery(),
+            select(func.max(RelatedPost.computed_at)).where(RelatedPost.post_id == post_id).scalar_subquery()
+        ).join(
+            User, User.id == Post.user_id
+        ).filter(Post.id == post_id).first()
+
+        return tuple(row) if row is not None else None
+
+    @staticmethod
+    def get_posts_cache_validators() -> tuple:
+        """
+        取得文章列表頁的版本資訊，用於條件式 GET
+
+        Returns:
+            tuple: 版本資訊
+        """
+        post_count, posts_updated = db.session.query(
+            func.count(Post.id), func.max(Post.updated_at)
+        ).one()
+        authors_updated = db.session.query(func.max(User.updated_at)).scalar()
+        return post_count, posts_updated, authors_updated
+
     @classmethod
+    @replica_reads
     def get_posts_page(cls, page: int = 1, per_page: int = None) -> Any:
         """
         獲取分頁的文章列表
@@ -78,7 +277,10 @@ class PostService(BaseService):
         """
         try:
             per_page = per_page or cls.DEFAULT_PAGE_SIZE
-            return Post.query.order_by(
+            return Post.query.options(
+                cls.list_options(),
+                joinedload(Post.author)
+            ).order_by(
                 Post.created_at.desc()
             ).paginate(
                 page=page,
@@ -115,10 +317,13 @@ class PostService(BaseService):
 
             # 更新文章
             post.title = title
-            post.content = content
+            PostService.set_content(post, content)
             post.updated_at = datetime.now()
 
-            return PostService.commit()
+            success, error = PostService.commit()
+            if success:
+                RelatedPostService.refresh_post(post_id, title, content)
+            return success, error
 
         except Exception as e:
             current_app.logger.error(f"Error updating post: {str(e)}")
@@ -140,13 +345,19 @@ class PostService(BaseService):
             if not post:
                 return False, "文章不存在"
 
+            FeedService.remove_post(post_id)
+            RelatedPostService.remove_post(post_id)
+            # 通知隨文章串聯刪除，先扣除接收者的未讀數
+            NotificationService.discard_post_notifications(post_id)
             return PostService.delete_from_db(post)
 
         except Exception as e:
+            db.session.rollback()
             current_app.logger.error(f"Error deleting post: {str(e)}")
             return False, str(e)
 
     @classmethod
+    @replica_reads
     def get_user_posts(cls, user_id: int, page: int = 1, per_page: int = None) -> Any:
         """
         獲取指定用戶的文章列表
@@ -161,7 +372,10 @@ class PostService(BaseService):
         """
         try:
             per_page = per_page or cls.DEFAULT_PAGE_SIZE
-            return Post.query.filter_by(
+            return Post.query.options(
+                cls.list_options(),
+                joinedload(Post.author)
+            ).filter_by(
                 user_id=user_id
             ).order_by(
                 Post.created_at.desc()
@@ -175,6 +389,7 @@ class PostService(BaseService):
             return None
 
     @classmethod
+    @replica_reads
     def search_posts(cls, query: str, page: int = 1, per_page: int = None) -> Any:
         """
         搜索文章
@@ -189,7 +404,10 @@ class PostService(BaseService):
         """
         try:
             per_page = per_page or cls.DEFAULT_PAGE_SIZE
-            return Post.query.filter(
+            return Post.query.options(
+                cls.list_options(),
+                joinedload(Post.author)
+            ).filter(
                 or_(
                     Post.title.ilike(f'%{query}%'),
                     Post.content.ilike(f'%{query}%')
@@ -205,8 +423,9 @@ class PostService(BaseService):
             current_app.logger.error(f"Error searching posts: {str(e)}")
             return None
 
-    @staticmethod
-    def get_latest_posts(limit: int = 5) -> List[Post]:
+    @classmethod
+    @replica_reads
+    def get_latest_posts(cls, limit: int = 5) -> List[Post]:
         """
         獲取最新文章
 
@@ -217,9 +436,38 @@ class PostService(BaseService):
             List[Post]: 文章列表
         """
         try:
-            return Post.query.order_by(
+            return Post.query.options(
+                cls.list_options(),
+                joinedload(Post.author)
+            ).order_by(
                 Post.created_at.desc()
             ).limit(limit).all()
         except Exception as e:
             current_app.logger.error(f"Error getting latest posts: {str(e)}")
             return []
+
+    @staticmethod
+    def count_posts_by_user(user_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        以單一查詢批次取得多位用戶的發文數
+
+        Args:
+            user_ids: 用戶ID列表
+
+        Returns:
+            Dict[int, int]: 用戶ID -> 發文數
+        """
+        user_ids = list(set(user_ids))
+        counts = dict.fromkeys(user_ids, 0)
+        if not user_ids:
+            return counts
+
+        try:
+            counts.update(db.session.query(
+                Post.user_id, func.count(Post.id)
+            ).filter(
+                Post.user_id.in_(user_ids)
+            ).group_by(Post.user_id).all())
+        except Exception as e:
+            current_app.logger.error(f"Error counting user posts: {str(e)}")
+        return counts
@@ -0,0 +1,342 @@
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+from flask import current_app
+from sqlalchemy import select, insert, delete, or_, func
+from sqlalchemy.orm import load_only, joinedload
+from app import db
+from app.models import Post, RelatedPost
+from .base_service import BaseService
+
+# NumPy 只在計算相關文章時才匯入（正式環境於預熱時預先匯入）
+if TYPE_CHECKING:
+    from app.utils.tfidf import TfidfIndex
+
+
+class RelatedPostService(BaseService):
+    """
+    相關文章服務
+
+    以行程內的 TF-IDF 索引（app.utils.tfidf）計算文章間的餘弦相似度，
+    每篇文章的前 RELATED_POSTS_COUNT 篇存入 related_post，詳情頁只需一次查詢：
+    - 發文、編輯或刪除時增量更新：重新計算該文章，以及列表中原本有它或應該加入它的文章的完整列表，
+      同一列表的分數來自同一次計算，原本有它的列表會由下一名遞補
+    - 索引只在背景執行緒中從資料庫建立（同時只有一個），請求不等待：
+      索引過期時繼續使用舊的索引，尚未建立時先記錄下來，建立後再補算；
+      過期時先比對文章數與最後更新時間，文章表沒有變更（例如其他工作行程沒有發文或編輯）就不重新讀取
+    - 鎖只保護索引的寫入與狀態的記錄，相似度計算在鎖外進行
+    - 增量更新沿用索引建立時的 IDF，分數只是近似值，`flask posts related` 重新計算所有文章後才與完整計算一致
+    """
+
+    # 配置常量
+    DEFAULT_MAX_AGE = 600  # 秒
+    TITLE_WEIGHT = 2       # 標題的詞重複計算的次數
+    INSERT_BATCH_SIZE = 1000
+
+    _index: Optional['TfidfIndex'] = None
+    _built_at = 0.0
+    _snapshot: Optional[Tuple[int, Optional[datetime]]] = None  # 建立索引時的文章數與最後更新時間
+    _pending: Optional[Dict[int, Optional[str]]] = None  # 建立索引期間的文章變更（文字為 None 表示刪除）
+    _deferred_posts: Set[int] = set()   # 索引尚未建立時待計算的文章
+    _deferred_owners: Set[int] = set()  # 索引尚未建立時待遞補的列表
+    _loader: Optional[threading.Thread] = None
+    _lock = threading.Lock()          # 保護索引與上述狀態
+    _rebuild_lock = threading.Lock()  # 同時只有一個執行緒建立索引
+
+    @classmethod
+    def document(cls, title: str, content: str) -> str:
+        """
+        組成計算 TF-IDF 的文字（標題加重）
+
+        Args:
+            title: 標題
+            content: 內容
+
+        Returns:
+            str: 文字
+        """
+        return '\n'.join([title] * cls.TITLE_WEIGHT + [content or ''])
+
+    @classmethod
+    def load_index(cls) -> 'TfidfIndex':
+        """
+        從資料庫建立 TF-IDF 索引（只讀取ID、標題與內容並分批串流）
+
+        Returns:
+            TfidfIndex: 索引
+        """
+        from app.utils.tfidf import TfidfIndex
+
+        config = current_app.config
+        rows = db.session.execute(
+            select(Post.id, Post.title, Post.content).order_by(Post.id).execution_options(yield_per=1000)
+        )
+        return TfidfIndex.build(
+            ((post_id, cls.document(title, content)) for post_id, title, content in rows),
+            max_terms=config['RELATED_POSTS_MAX_TERMS'],
+            max_df=config['RELATED_POSTS_MAX_DF']
+        )
+
+    @staticmethod
+    def table_snapshot() -> Tuple[int, Optional[datetime]]:
+        """
+        文章表的文章數與最後更新時間，用來判斷索引建立後文章表是否有變更
+
+        Returns:
+            Tuple[int, Optional[datetime]]: (文章數, 最後更新時間)
+        """
+        count, updated_at = db.session.execute(select(func.count(Post.id), func.max(Post.updated_at))).one()
+        return count, updated_at
+
+    @classmethod
+    def _build(cls) -> 'TfidfIndex':
+        """建立新的索引後替換，呼叫端需持有 _rebuild_lock"""
+        # 掃描期間的新增、編輯與刪除可能不在掃描結果中，先記錄下來，替換時重新套用
+        with cls._lock:
+            if cls._pending is None:
+                cls._pending = {}
+
+        # 在掃描前取得，掃描期間的變更會讓下次比對不一致而重新建立
+        snapshot = cls.table_snapshot()
+        index = cls.load_index()
+
+        with cls._lock:
+            for post_id, text in cls._pending.items():
+                if text is None:
+                    index.remove(post_id)
+                else:
+                    index.upsert(post_id, text)
+            cls._pending = None
+            cls._index = index
+            cls._snapshot = snapshot
+            cls._built_at = time.monotonic()
+        return index
+
+    @classmethod
+    def _load_in_background(cls, app) -> None:
+        """背景執行緒：建立索引後補算索引尚未建立時延後的文章與列表"""
+        with app.app_context():
+            try:
+                with cls._rebuild_lock:
+                    index = cls._index
+                    if index is not None and cls.table_snapshot() == cls._snapshot:
+                        # 文章表沒有變更，沿用目前的索引
+                        with cls._lock:
+                            cls._built_at = time.monotonic()
+                    else:
+                        index = cls._build()
+                with cls._lock:
+                    posts, cls._deferred_posts = cls._deferred_posts, set()
+                    owners, cls._deferred_owners = cls._deferred_owners, set()
+
+                for post_id, title, content in db.session.execute(
+                    select(Post.id, Post.title, Post.content).where(Post.id.in_(posts))
+                ):
+                    cls.refresh_post(post_id, title, content)
+
+                if owners:
+                    cls._replace_lists(cls._top_k(index, owners))
+                    db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Error loading related posts index: {str(e)}")
+
+    @classmethod
+    def _current_index(cls) -> Optional['TfidfIndex']:
+        """
+        取得行程內的索引，尚未建立或過期時在背景建立（文章表沒有變更時沿用），不等待
+        呼叫端需持有 _lock
+
+        Returns:
+            Optional[TfidfIndex]: 索引，尚未建立時為 None
+        """
+        max_age = current_app.config.get('RELATED_POSTS_INDEX_MAX_AGE') or cls.DEFAULT_MAX_AGE
+        if cls._index is None or time.monotonic() - cls._built_at > max_age:
+            if cls._loader is None or not cls._loader.is_alive():
+                cls._loader = threading.Thread(
+                    target=cls._load_in_background, args=(current_app._get_current_object(),),
+                    name='related-posts-index', daemon=True
+                )
+                cls._loader.start()
+        return cls._index
+
+    @classmethod
+    def _record(cls, post_id: int, text: Optional[str]) -> None:
+        """建立索引期間（或尚未建立時）記錄文章變更，替換索引時重新套用；呼叫端需持有 _lock"""
+        if cls._pending is None and cls._index is None:
+            cls._pending = {}
+        if cls._pending is not None:
+            cls._pending[post_id] = text
+
+    @classmethod
+    def _top_k(cls, index: 'TfidfIndex', post_ids: Iterable[int]) -> Dict[int, List[Tuple[int, float]]]:
+        """
+        以同一份索引重新計算多篇文章的完整相關文章列表（不需持有 _lock）
+
+        Args:
+            index: 索引
+            post_ids: 文章ID
+
+        Returns:
+            Dict[int, List[Tuple[int, float]]]: 文章ID -> [(相關文章ID, 相似度)]（不在索引中的文章略過）
+        """
+        config = current_app.config
+        vectors = {post_id: index.vector(post_id) for post_id in post_ids}
+        owners = [post_id for post_id, vector in vectors.items() if vector is not None]
+        neighbours = index.similar_many([vectors[post_id] for post_id in owners], config['RELATED_POSTS_COUNT'],
+                                        exclude_ids=owners, min_score=config['RELATED_POSTS_MIN_SCORE'])
+        return dict(zip(owners, neighbours))
+
+    @staticmethod
+    def _replace_lists(lists: Dict[int, List[Tuple[int, float]]]) -> None:
+        """
+        以重新計算的結果取代這些文章的相關文章列表（不提交交易）
+        索引可能還有其他工作行程已刪除的文章，只寫入仍存在的文章
+
+        Args:
+            lists: 文章ID -> [(相關文章ID, 相似度)]
+        """
+        if not lists:
+            return
+
+        db.session.execute(delete(RelatedPost).where(RelatedPost.post_id.in_(list(lists))))
+        related_ids = {related_id for neighbours in lists.values() for related_id, _ in neighbours}
+        existing = set(db.session.scalars(select(Post.id).where(Post.id.in_(related_ids)))) if related_ids else set()
+
+        now = datetime.now()
+        rows = [{'post_id': post_id, 'related_post_id': related_id, 'score': score, 'computed_at': now}
+                for post_id, neighbours in lists.items()
+                for related_id, score in neighbours if related_id in existing]
+        if rows:
+            db.session.execute(insert(RelatedPost), rows)
+
+    @staticmethod
+    def _referrers(post_id: int) -> Set[int]:
+        """列表中有此文章的其他文章"""
+        return set(db.session.scalars(
+            select(RelatedPost.post_id).where(RelatedPost.related_post_id == post_id)
+        )) - {post_id}
+
+    @classmethod
+    def refresh_post(cls, post_id: int, title: str, content: str) -> None:
+        """
+        發文或編輯後增量更新相關文章（失敗時只記錄錯誤，不影響文章本身的儲存）
+        索引尚未建立時先記錄下來，由背景執行緒建立索引後補算
+
+        Args:
+            post_id: 文章ID
+            title: 標題
+            content: 內容
+        """
+        config = current_app.config
+        text = cls.document(title, content)
+        try:
+            referrers = cls._referrers(post_id)
+            with cls._lock:
+                cls._record(post_id, text)
+                index = cls._current_index()
+                if index is None:
+                    cls._deferred_posts.add(post_id)
+                    return
+
+                indices, weights = index.upsert(post_id, text)
+
+            candidates = index.similar(indices, weights, config['RELATED_POSTS_CANDIDATES'],
+                                       exclude_id=post_id, min_score=config['RELATED_POSTS_MIN_SCORE'])
+            # 相似度是對稱的：列表中原本有它（編輯後可能已不相關）或應該加入它的文章都重新計算
+            lists = cls._top_k(index, referrers | {related_id for related_id, _ in candidates})
+
+            lists = {owner_id: neighbours for owner_id, neighbours in lists.items()
+                     if owner_id in referrers or any(related_id == post_id for related_id, _ in neighbours)}
+            lists[post_id] = candidates[:config['RELATED_POSTS_COUNT']]
+
+            db.session.execute(delete(RelatedPost).where(RelatedPost.related_post_id == post_id))
+            cls._replace_lists(lists)
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Error updating related posts: {str(e)}")
+
+    @classmethod
+    def remove_post(cls, post_id: int) -> None:
+        """
+        刪除文章時移除其相關文章資料，並遞補列表中原本有它的文章（不提交交易）
+
+        Args:
+            post_id: 文章ID
+        """
+        referrers = cls._referrers(post_id)
+        db.session.execute(delete(RelatedPost).where(
+            or_(RelatedPost.post_id == post_id, RelatedPost.related_post_id == post_id)
+        ))
+
+        with cls._lock:
+            cls._record(post_id, None)
+            cls._deferred_posts.discard(post_id)
+            index = cls._current_index()
+            if index is None:
+                cls._deferred_owners |= referrers
+                return
+            index.remove(post_id)
+        cls._replace_lists(cls._top_k(index, referrers))
+
+    @classmethod
+    def rebuild(cls) -> int:
+        """
+        重新建立索引並計算所有文章的相關文章
+
+        Returns:
+            int: 處理的文章數
+        """
+        config = current_app.config
+        with cls._rebuild_lock:
+            index = cls._build()
+        with cls._lock:
+            cls._deferred_posts.clear()
+            cls._deferred_owners.clear()
+
+        db.session.execute(delete(RelatedPost))
+        now = datetime.now()
+        total = 0
+        rows = []
+        for post_id, neighbours in index.iter_top_k(config['RELATED_POSTS_COUNT'],
+                                                    config['RELATED_POSTS_MIN_SCORE']):
+            rows.extend({'post_id': post_id, 'related_post_id': related_id, 'score': score, 'computed_at': now}
+                        for related_id, score in neighbours)
+            total += 1
+            if len(rows) >= cls.INSERT_BATCH_SIZE:
+                db.session.execute(insert(RelatedPost), rows)
+                rows = []
+        if rows:
+            db.session.execute(insert(RelatedPost), rows)
+        db.session.commit()
+        return total
+
+    @staticmethod
+    def get_related_posts(post_id: int, limit: int = None) -> List[Post]:
+        """
+        獲取文章的相關文章（一次查詢，包含作者）
+
+        Args:
+            post_id: 文章ID
+            limit: 數量
+
+        Returns:
+            List[Post]: 文章列表，依相似度由高到低
+        """
+        try:
+            return Post.query.options(
+                load_only(Post.id, Post.title, Post.user_id, Post.created_at),
+                joinedload(Post.author)
+            ).join(
+                RelatedPost, RelatedPost.related_post_id == Post.id
+            ).filter(
+                RelatedPost.post_id == post_id
+            ).order_by(
+                RelatedPost.score.desc()
+            ).limit(limit or current_app.config['RELATED_POSTS_COUNT']).all()
+        except Exception as e:
+            current_app.logger.error(f"Error getting related posts: {str(e)}")
+            return []
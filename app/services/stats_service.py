@@ -1,62 +1,263 @@
-from datetime import datetime, timedelta
-from typing import Dict
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
 from flask import current_app
-from sqlalchemy import func, distinct
+from sqlalchemy import event, func, distinct, select, union_all, update, bindparam
 from app import db
-from app.models import User, Post, Comment, Like
+from app.models import User, Post, Comment, Like, DailyStats
+from app.utils.cache import TTLCache
+from app.utils.database import replica_reads
 from .base_service import BaseService
 
 
 class StatsService(BaseService):
     """統計服務類"""
 
+    # 用戶活動統計快取（依用戶ID），寫入時由下方的 session 事件失效
+    _user_stats_cache = TTLCache(maxsize=10000, ttl=60)
+
+    # 彙總來源：當日數量欄位 -> 模型
+    ROLLUP_SOURCES = {
+        'signups': User,
+        'posts': Post,
+        'comments': Comment,
+        'likes': Like,
+    }
+
+    @staticmethod
+    def _to_date(value) -> date:
+        """將資料庫 date() 的結果轉為 date（SQLite 回傳字串）"""
+        return value if isinstance(value, date) else date.fromisoformat(str(value))
+
     @staticmethod
-    def get_site_statistics() -> Dict:
+    def _day_start(day: date) -> datetime:
+        """取得日期的起始時間"""
+        return datetime.combine(day, time.min)
+
+    @staticmethod
+    def _latest_rollup(before: date) -> Optional[DailyStats]:
+        """取得指定日期之前最後一筆彙總"""
+        return DailyStats.query.filter(
+            DailyStats.day < before
+        ).order_by(DailyStats.day.desc()).first()
+
+    @classmethod
+    def rollup_daily_stats(cls, full: bool = False, today: Optional[date] = None) -> int:
         """
-        獲取網站統計數據
+        將每日統計彙總寫入 daily_stats
+
+        增量處理：從最後一筆彙總的日期（可能是當時尚未結束的一天）重新計算到今天，
+        每個來源資料表只需一個依日期分組的查詢
+
+        注意：活躍用戶包含當日的發文、留言、按讚與最後登入；用戶的最後登入時間會被下次登入覆蓋，
+        因此已彙總的日期在完整重建時登入部分可能減少
+
+        Args:
+            full: 是否清除後完整重建（例如大量刪除資料後）
+            today: 彙總到哪一天，預設為今天
+
         Returns:
-            Dict: 包含網站統計資訊的字典
+            int: 寫入的天數
         """
-        try:
-            # 計算本月新增用戶
-            first_day_of_month = datetime.now().replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
+        today = today or date.today()
+
+        if full:
+            DailyStats.query.delete()
+
+        start = db.session.query(func.max(DailyStats.day)).scalar()
+        if start is None:
+            first = [
+                db.session.query(func.min(model.created_at)).scalar()
+                for model in cls.ROLLUP_SOURCES.values()
+            ]
+            first = [value for value in first if value is not None]
+            if not first:
+                db.session.commit()
+                return 0
+            start = min(first).date()
+        if start > today:
+            return 0
+
+        begin = cls._day_start(start)
+        end = cls._day_start(today + timedelta(days=1))
+        daily = defaultdict(lambda: dict.fromkeys(DailyStats.COUNTERS, 0))
+
+        # 每日新增數量
+        for field, model in cls.ROLLUP_SOURCES.items():
+            day_column = func.date(model.created_at)
+            rows = db.session.query(day_column, func.count(model.id)).filter(
+                model.created_at >= begin,
+                model.created_at < end
+            ).group_by(day_column)
+            for day, count in rows:
+                daily[cls._to_date(day)][field] = count
+
+        # 每日活躍用戶（發文、留言、按讚或登入，依用戶去重）
+        activity = union_all(*(
+            select(func.date(column).label('day'), user_id.label('user_id')).where(
+                column >= begin, column < end
+            ) for column, user_id in (
+                (Post.created_at, Post.user_id),
+                (Comment.created_at, Comment.user_id),
+                (Like.created_at, Like.user_id),
+                (User.last_login, User.id),
             )
+        )).subquery()
+        rows = db.session.query(
+            activity.c.day, func.count(distinct(activity.c.user_id))
+        ).group_by(activity.c.day)
+        for day, count in rows:
+            daily[cls._to_date(day)]['active_users'] = count
 
-            # 使用者統計
-            total_users = User.query.count()
-            new_users_this_month = User.query.filter(
-                User.created_at >= first_day_of_month
-            ).count()
+        # 從前一天的累計值接續計算
+        previous = cls._latest_rollup(start)
+        totals = {
+            total: getattr(previous, total) if previous else 0
+            for total in DailyStats.COUNTERS.values()
+        }
+        existing = {
+            row.day: row for row in DailyStats.query.filter(DailyStats.day >= start).all()
+        }
 
-            # 文章統計
-            total_posts = Post.query.count()
+        empty = dict.fromkeys(DailyStats.COUNTERS, 0)
+        day = start
+        written = 0
+        while day <= today:
+            row = existing.get(day)
+            if row is None:
+                row = DailyStats(day=day)
+                db.session.add(row)
 
-            # 最後更新時間
-            latest_updates = []
+            counts = daily.get(day, empty)
+            for field, total in DailyStats.COUNTERS.items():
+                totals[total] += counts[field]
+                setattr(row, field, counts[field])
+                setattr(row, total, totals[total])
+
+            day += timedelta(days=1)
+            written += 1
+
+        db.session.commit()
+        return written
 
-            latest_user = User.query.order_by(User.created_at.desc()).first()
-            if latest_user:
-                latest_updates.append(latest_user.created_at)
+    @classmethod
+    def _count_since(cls, field: str, start: Optional[date], latest: Optional[DailyStats]) -> int:
+        """
+        計算某日起的新增數量：已彙總的完整日期以累計欄位相減，之後的部分即時查詢
+
+        Args:
+            field: 當日數量欄位（ROLLUP_SOURCES 的鍵）
+            start: 起始日期，None 表示全部
+            latest: 最後一筆完整日期的彙總
+
+        Returns:
+            int: 新增數量
+        """
+        model = cls.ROLLUP_SOURCES[field]
+        total = DailyStats.COUNTERS[field]
+        query = db.session.query(func.count(model.id))
+
+        if latest is not None and (start is None or latest.day >= start):
+            before = cls._latest_rollup(start) if start else None
+            rolled = getattr(latest, total) - (getattr(before, total) if before else 0)
+            live = query.filter(
+                model.created_at >= cls._day_start(latest.day + timedelta(days=1))
+            ).scalar()
+            return rolled + live
 
-            latest_post = Post.query.order_by(Post.created_at.desc()).first()
-            if latest_post:
-                latest_updates.append(latest_post.created_at)
+        if start is not None:
+            query = query.filter(model.created_at >= cls._day_start(start))
+        return query.scalar()
+
+    @classmethod
+    @replica_reads
+    def get_range_stats(cls, start: date, end: date) -> Dict:
+        """
+        獲取任意日期區間的統計（只讀取兩筆彙總資料）
+
+        Args:
+            start: 起始日期（含）
+            end: 結束日期（含）
+
+        Returns:
+            Dict: 區間內的新註冊、文章、留言、按讚數與平均每日活躍用戶數；
+                  rolled_up_until 為最後彙總日期，之後的資料尚未納入
+        """
+        last = DailyStats.query.filter(
+            DailyStats.day <= end
+        ).order_by(DailyStats.day.desc()).first()
+        before = cls._latest_rollup(start)
+
+        stats = {}
+        for field, total in DailyStats.COUNTERS.items():
+            value = getattr(last, total) if last and last.day >= start else 0
+            if value and before:
+                value -= getattr(before, total)
+            stats[field] = value
+
+        days = (end - start).days + 1
+        stats['avg_active_users'] = round(stats.pop('active_users') / days, 1) if days > 0 else 0
+        stats.update({
+            'start': start,
+            'end': end,
+            'days': days,
+            'rolled_up_until': db.session.query(func.max(DailyStats.day)).scalar()
+        })
+        return stats
+
+    @staticmethod
+    @replica_reads
+    def get_daily_series(start: date, end: date) -> List[DailyStats]:
+        """
+        獲取日期區間內的每日彙總
+
+        Args:
+            start: 起始日期（含）
+            end: 結束日期（含）
+
+        Returns:
+            List[DailyStats]: 每日彙總（依日期排序）
+        """
+        return DailyStats.query.filter(
+            DailyStats.day >= start,
+            DailyStats.day <= end
+        ).order_by(DailyStats.day).all()
+
+    @classmethod
+    @replica_reads
+    def get_site_statistics(cls, active_days: int = 30) -> Dict:
+        """
+        獲取網站統計數據
+        已彙總的日期讀取 daily_stats，只有最後彙總之後的資料即時查詢（皆使用 created_at 索引）
+        Args:
+            active_days: 活躍用戶的最後登入天數
+        Returns:
+            Dict: 包含網站統計資訊的字典
+        """
+        try:
+            today = date.today()
+            latest = cls._latest_rollup(today)
 
-            latest_comment = Comment.query.order_by(Comment.created_at.desc()).first()
-            if latest_comment:
-                latest_updates.append(latest_comment.created_at)
+            # 使用者統計
+            total_users = cls._count_since('signups', None, latest)
+            new_users_this_month = cls._count_since('signups', today.replace(day=1), latest)
 
-            latest_like = Like.query.order_by(Like.created_at.desc()).first()
-            if latest_like:
-                latest_updates.append(latest_like.created_at)
+            # 文章統計
+            total_posts = cls._count_since('posts', None, latest)
 
+            # 最後更新時間
+            latest_updates = [
+                value for value in db.session.query(*(
+                    select(func.max(model.created_at)).scalar_subquery()
+                    for model in cls.ROLLUP_SOURCES.values()
+                )).one() if value is not None
+            ]
             last_update = max(latest_updates).strftime('%Y-%m-%d %H:%M') if latest_updates else '無資料'
 
-            # 活躍用戶數（30天內有活動的用戶）
-            thirty_days_ago = datetime.now() - timedelta(days=30)
+            # 活躍用戶數（預設30天內有登入的用戶）
+            active_threshold = datetime.now() - timedelta(days=active_days)
             active_users = User.query.filter(
-                User.last_login >= thirty_days_ago
+                User.last_login >= active_threshold
             ).count()
 
             return {
@@ -77,8 +278,9 @@ class StatsService(BaseService):
                 'active_users_count': 0
             }
 
-    @staticmethod
-    def get_new_users_count(days: int = 30) -> int:
+    @classmethod
+    @replica_reads
+    def get_new_users_count(cls, days: int = 30) -> int:
         """
         獲取指定天數內的新增用戶數
         Args:
@@ -87,49 +289,60 @@ class StatsService(BaseService):
             新增用戶數
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            return User.query.filter(User.created_at >= cutoff_date).count()
+            today = date.today()
+            return cls._count_since('signups', today - timedelta(days=days), cls._latest_rollup(today))
         except Exception as e:
             current_app.logger.error(f"Error getting new users count: {str(e)}")
             return 0
 
-    @staticmethod
-    def get_user_activity_stats(user_id: int) -> Dict:
+    @classmethod
+    def get_user_activity_stats(cls, user_id: int) -> Dict:
         """
         獲取指定用戶的活動統計
+        以單一查詢計算所有數值，並依用戶快取；該用戶的文章、留言或收到的讚有變動時自動失效
         Args:
             user_id: 用戶ID
         Returns:
             用戶活動統計資料
         """
-        try:
-            # 發文統計
-            posts_count = Post.query.filter_by(user_id=user_id).count()
-
-            # 留言統計
-            comments_count = Comment.query.filter_by(user_id=user_id).count()
+        stats = cls._user_stats_cache.get(user_id)
+        if stats is not None:
+            return dict(stats)
 
-            # 獲得的讚
-            received_likes = Like.query.join(Post).filter(
-                Post.user_id == user_id
-            ).count()
-
-            # 最近活動
-            last_post = Post.query.filter_by(user_id=user_id).order_by(
-                Post.created_at.desc()
-            ).first()
-
-            last_comment = Comment.query.filter_by(user_id=user_id).order_by(
-                Comment.created_at.desc()
-            ).first()
+        try:
+            row = db.session.query(
+                # 發文統計
+                select(func.count(Post.id)).where(
+                    Post.user_id == user_id
+                ).scalar_subquery(),
+                # 留言統計
+                select(func.count(Comment.id)).where(
+                    Comment.user_id == user_id
+                ).scalar_subquery(),
+                # 獲得的讚
+                select(func.count(Like.id)).join(
+                    Post, Post.id == Like.post_id
+                ).where(Post.user_id == user_id).scalar_subquery(),
+                # 最近活動
+                select(func.max(Post.created_at)).where(
+                    Post.user_id == user_id
+                ).scalar_subquery(),
+                select(func.max(Comment.created_at)).where(
+                    Comment.user_id == user_id
+                ).scalar_subquery()
+            ).one()
 
-            return {
-                'posts_count': posts_count,
-                'comments_count': comments_count,
-                'received_likes': received_likes,
-                'last_post_date': last_post.created_at if last_post else None,
-                'last_comment_date': last_comment.created_at if last_comment else None
+            stats = {
+                'posts_count': row[0],
+                'comments_count': row[1],
+                'received_likes': row[2],
+                'last_post_date': row[3],
+                'last_comment_date': row[4]
             }
+            cls._user_stats_cache.set(
+                user_id, stats, ttl=current_app.config.get('USER_STATS_CACHE_TTL')
+            )
+            return dict(stats)
         except Exception as e:
             current_app.logger.error(f"Error getting user activity stats: {str(e)}")
             return {
@@ -140,7 +353,53 @@ class StatsService(BaseService):
                 'last_comment_date': None
             }
 
+    @classmethod
+    def get_user_posts_count(cls, user_id: int) -> int:
+        """
+        獲取用戶的發文數：已有快取的統計時直接使用，否則只執行一個 COUNT 查詢
+
+        Args:
+            user_id: 用戶ID
+
+        Returns:
+            int: 發文數
+        """
+        stats = cls._user_stats_cache.get(user_id)
+        if stats is not None:
+            return stats['posts_count']
+        return db.session.scalar(select(func.count(Post.id)).where(Post.user_id == user_id)) or 0
+
+    @classmethod
+    def get_user_received_likes(cls, user_id: int) -> int:
+        """
+        獲取用戶收到的讚數：已有快取的統計時直接使用，否則只執行一個 COUNT 查詢
+
+        Args:
+            user_id: 用戶ID
+
+        Returns:
+            int: 收到的讚數
+        """
+        stats = cls._user_stats_cache.get(user_id)
+        if stats is not None:
+            return stats['received_likes']
+        return db.session.scalar(
+            select(func.count(Like.id)).join(Post, Post.id == Like.post_id).where(Post.user_id == user_id)
+        ) or 0
+
+    @classmethod
+    def invalidate_user_stats(cls, *user_ids: int) -> None:
+        """
+        清除用戶活動統計的快取
+
+        Args:
+            *user_ids: 用戶ID
+        """
+        for user_id in user_ids:
+            cls._user_stats_cache.delete(user_id)
+
     @staticmethod
+    @replica_reads
     def get_trending_content(days: int = 7) -> Dict:
         """
         獲取趨勢內容統計
@@ -199,3 +458,93 @@ class StatsService(BaseService):
                 'trending_posts': [],
                 'active_users': []
             }
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_stats_changes(session, flush_context, instances):
+    """
+    記錄本次寫入影響了哪些用戶的活動統計：文章與留言的作者、被按讚或取消讚的文章作者，
+    以及被刪除文章底下的所有留言者（不論留言是否已載入到 session，連帶刪除時都會受影響）
+    """
+    affected = session.info.setdefault('stats_affected_users', set())
+    deleted_post_ids = []
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, (Post, Comment)):
+            affected.add(obj.user_id)
+            if isinstance(obj, Post) and obj in session.deleted:
+                deleted_post_ids.append(obj.id)
+        elif isinstance(obj, Like):
+            with session.no_autoflush:
+                post = session.get(Post, obj.post_id)
+            if post is not None:
+                affected.add(post.user_id)
+
+    if deleted_post_ids:
+        with session.no_autoflush:
+            affected.update(session.scalars(
+                select(Comment.user_id).distinct().where(Comment.post_id.in_(deleted_post_ids))
+            ))
+
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_stats_cache(session):
+    """提交後才清除快取，避免其他請求在提交前重新快取舊的數值"""
+    affected = session.info.pop('stats_affected_users', None)
+    if affected:
+        StatsService.invalidate_user_stats(*affected)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_stats_changes(session):
+    """交易回滾時捨棄記錄"""
+    session.info.pop('stats_affected_users', None)
+    session.info.pop('rollup_deletions', None)
+
+
+def _record_rollup_deletion(mapper, connection, target):
+    """
+    記錄被刪除的用戶、文章、留言或按讚的建立日期（包含連帶刪除的資料），
+    flush 結束前由 _apply_rollup_deletions 從已彙總的統計中扣除
+    """
+    session = db.inspect(target).session
+    if session is None or target.created_at is None:
+        return
+    field = next(field for field, model in StatsService.ROLLUP_SOURCES.items() if isinstance(target, model))
+    deletions = session.info.setdefault('rollup_deletions', defaultdict(int))
+    deletions[field, target.created_at.date()] += 1
+
+
+for _model in StatsService.ROLLUP_SOURCES.values():
+    event.listen(_model, 'before_delete', _record_rollup_deletion)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _apply_rollup_deletions(session, flush_context):
+    """
+    從已彙總的統計扣除刪除的資料：建立當日的數量與當日起的累計值
+    與刪除在同一交易中執行，累計值與完整重建（只計算仍存在的資料）的結果一致；
+    尚未彙總的日期沒有資料列，由即時查詢計算
+    """
+    deletions = session.info.pop('rollup_deletions', None)
+    if not deletions:
+        return
+
+    table = DailyStats.__table__
+    connection = session.connection()
+    for field, total in DailyStats.COUNTERS.items():
+        if field not in StatsService.ROLLUP_SOURCES:
+            continue
+        rows = [{'created_day': day, 'removed': count}
+                for (deleted_field, day), count in deletions.items() if deleted_field == field]
+        if not rows:
+            continue
+        connection.execute(
+            update(table).where(table.c.day == bindparam('created_day'))
+            .values({field: table.c[field] - bindparam('removed')}),
+            rows
+        )
+        connection.execute(
+            update(table).where(table.c.day >= bindparam('created_day'))
+            .values({total: table.c[total] - bindparam('removed')}),
+            rows
+        )
@@ -1,10 +1,13 @@
 import os
-from typing import Tuple, Optional
+from typing import Any, Tuple, Optional, Dict, Iterable
 from datetime import datetime
 from werkzeug.utils import secure_filename
-from PIL import Image
 from flask import current_app
+from sqlalchemy import or_, func
+from app import db
 from app.models import User
+from app.utils.security import HashingPoolSaturated
+from app.utils.database import replica_reads
 from .base_service import BaseService
 
 
@@ -15,6 +18,7 @@ class UserService(BaseService):
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     AVATAR_SIZE = (300, 300)  # 頭像尺寸
     AVATAR_QUALITY = 85  # 圖片品質
+    MEMBERS_PER_PAGE = 16  # 會員列表每頁數量
 
     @staticmethod
     def create_user(username: str, email: str, password: str) -> Tuple[Optional[User], Optional[str]]:
@@ -31,9 +35,10 @@ class UserService(BaseService):
         """
         try:
             # 檢查用戶名和郵箱是否已存在
-            if User.query.filter_by(username=username).first():
+            conflict = UserService.find_conflict(username=username, email=email)
+            if conflict == 'username':
                 return None, "用戶名已被使用"
-            if User.query.filter_by(email=email).first():
+            if conflict == 'email':
                 return None, "郵箱已被註冊"
 
             # 創建新用戶
@@ -43,15 +48,99 @@ class UserService(BaseService):
             success, error = UserService.save_to_db(user)
             return (user, None) if success else (None, error)
 
+        except HashingPoolSaturated:
+            raise
         except Exception as e:
             current_app.logger.error(f"Error creating user: {str(e)}")
             return None, str(e)
 
+    @staticmethod
+    def find_conflict(username: Optional[str] = None, email: Optional[str] = None,
+                      exclude_user_id: Optional[int] = None) -> Optional[str]:
+        """
+        以單一查詢檢查用戶名與郵箱是否已被其他用戶使用
+
+        Args:
+            username: 用戶名
+            email: 電子郵件
+            exclude_user_id: 排除的用戶ID（更新自己的資料時使用）
+
+        Returns:
+            Optional[str]: 衝突的欄位 'email' 或 'username'，沒有衝突時為 None
+        """
+        conditions = []
+        if username:
+            conditions.append(User.username == username)
+        if email:
+            conditions.append(User.email == email)
+        if not conditions:
+            return None
+
+        query = User.query.with_entities(User.username, User.email).filter(or_(*conditions))
+        if exclude_user_id is not None:
+            query = query.filter(User.id != exclude_user_id)
+
+        matches = query.limit(2).all()
+        if email and any(row.email == email for row in matches):
+            return 'email'
+        if username and any(row.username == username for row in matches):
+            return 'username'
+        return None
+
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[User]:
         """根據ID獲取用戶"""
         return User.query.get(user_id)
 
+    @staticmethod
+    def get_users_by_ids(user_ids: Iterable[int]) -> Dict[int, User]:
+        """
+        以單一查詢批次取得多位用戶
+
+        Args:
+            user_ids: 用戶ID列表
+
+        Returns:
+            Dict[int, User]: 用戶ID -> 用戶實例
+        """
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return {}
+        return {user.id: user for user in User.query.filter(User.id.in_(user_ids)).all()}
+
+    @classmethod
+    @replica_reads
+    def get_members_page(cls, page: int = 1, per_page: int = None) -> Any:
+        """
+        獲取分頁的會員列表（依註冊時間由新到舊）
+
+        Args:
+            page: 頁碼
+            per_page: 每頁數量
+
+        Returns:
+            分頁對象
+        """
+        return User.query.order_by(
+            User.created_at.desc()
+        ).paginate(
+            page=page,
+            per_page=per_page or cls.MEMBERS_PER_PAGE,
+            error_out=False
+        )
+
+    @staticmethod
+    def get_members_cache_validators() -> tuple:
+        """
+        取得會員列表頁的版本資訊，用於條件式 GET
+
+        Returns:
+            tuple: 版本資訊
+        """
+        return tuple(db.session.query(
+            func.count(User.id), func.max(User.updated_at)
+        ).one())
+
     @staticmethod
     def get_user_by_email(email: str) -> Optional[User]:
         """根據郵箱獲取用戶"""
@@ -76,16 +165,19 @@ class UserService(BaseService):
             if not user:
                 return False, "用戶不存在"
 
+            conflict = UserService.find_conflict(
+                username=username,
+                email=email,
+                exclude_user_id=user_id
+            )
+            if conflict == 'username':
+                return False, "用戶名已被使用"
+            if conflict == 'email':
+                return False, "郵箱已被註冊"
+
             if username:
-                existing_user = User.query.filter_by(username=username).first()
-                if existing_user and existing_user.id != user_id:
-                    return False, "用戶名已被使用"
                 user.username = username
-
             if email:
-                existing_user = User.query.filter_by(email=email).first()
-                if existing_user and existing_user.id != user_id:
-                    return False, "郵箱已被註冊"
                 user.email = email
 
             return UserService.commit()
@@ -125,10 +217,35 @@ class UserService(BaseService):
             user.set_password(new_password)
             return UserService.commit()
 
+        except HashingPoolSaturated:
+            raise
         except Exception as e:
             current_app.logger.error(f"Error updating password: {str(e)}")
             return False, str(e)
 
+    @staticmethod
+    def rehash_password_if_needed(user: User, password: str) -> Tuple[bool, Optional[str]]:
+        """
+        登入成功後，若密碼雜湊的方法或成本與目前配置不同則重新雜湊
+
+        Args:
+            user: 已通過密碼驗證的用戶實例
+            password: 用戶剛輸入的原始密碼
+
+        Returns:
+            Tuple[bool, Optional[str]]: (是否成功, 錯誤訊息)
+        """
+        try:
+            if not user.password_needs_rehash():
+                return True, None
+
+            user.set_password(password)
+            return UserService.commit()
+
+        except Exception as e:
+            current_app.logger.error(f"Error rehashing password: {str(e)}")
+            return False, str(e)
+
     @staticmethod
     def update_last_login(user_id: int) -> Tuple[bool, Optional[str]]:
         """
@@ -181,7 +298,9 @@ class UserService(BaseService):
 
             filepath = os.path.join(upload_dir, filename)
 
-            # 處理圖片
+            # 處理圖片（Pillow 只在上傳大頭貼時才匯入）
+            from PIL import Image
+
             image = Image.open(file)
             if image.mode in ('RGBA', 'P'):
                 image = image.convert('RGB')
@@ -241,6 +360,8 @@ class UserService(BaseService):
             # 處理並保存圖片
             try:
                 # 打開圖片
+                from PIL import Image
+
                 image = Image.open(file)
 
                 # 轉換格式
@@ -0,0 +1,193 @@
+// 按讚功能
+document.querySelectorAll('.like-btn').forEach(button => {
+    button.addEventListener('click', async function () {
+        const postId = this.dataset.postId;
+        try {
+            const response = await fetch(`/posts/${postId}/like`, {
+                method: 'POST',
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            });
+            const data = await response.json();
+
+            if (data.success) {
+                // 更新按鈕狀態
+                this.classList.toggle('btn-primary', data.liked);
+                this.classList.toggle('btn-outline-primary', !data.liked);
+
+                // 更新按讚數
+                this.querySelector('.like-count').textContent = data.count;
+            } else {
+                alert(data.message || '操作失敗');
+            }
+        } catch (error) {
+            console.error('Error:', error);
+            alert('操作失敗');
+        }
+    });
+});
+
+// 刪除留言功能
+document.querySelectorAll('.delete-comment').forEach(button => {
+    button.addEventListener('click', async function () {
+        if (!confirm('確定要刪除這條留言嗎？')) return;
+
+        const commentId = this.dataset.commentId;
+        try {
+            const response = await fetch(`/posts/comments/${commentId}`, {
+                method: 'DELETE',
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest'
+                }
+            });
+            const data = await response.json();
+
+            if (data.success) {
+                this.closest('.comment-item, .reply-item').remove();
+            } else {
+                alert(data.message || '刪除失敗');
+            }
+        } catch (error) {
+            console.error('Error:', error);
+            alert('操作失敗');
+        }
+    });
+});
+
+// 回覆功能
+document.querySelectorAll('.reply-btn').forEach(button => {
+    button.addEventListener('click', function () {
+        const commentId = this.dataset.commentId;
+        const replyForm = document.getElementById(`reply-form-${commentId}`);
+
+        // 隱藏其他所有回覆表單
+        document.querySelectorAll('.reply-form').forEach(form => {
+            if (form !== replyForm) {
+                form.style.display = 'none';
+            }
+        });
+
+        // 切換當前回覆表單的顯示狀態
+        replyForm.style.display = replyForm.style.display === 'none' ? 'block' : 'none';
+    });
+});
+
+// 取消回覆
+document.querySelectorAll('.cancel-reply').forEach(button => {
+    button.addEventListener('click', function () {
+        this.closest('.reply-form').style.display = 'none';
+    });
+});
+
+// 即時更新：按讚數與新留言（Server-Sent Events）
+const live = document.getElementById('post-live');
+
+function buildAvatar(author, size, fontSize, margin) {
+    if (author.avatar_url) {
+        const img = document.createElement('img');
+        img.src = author.avatar_url;
+        img.className = `rounded-circle ${margin}`;
+        img.style.cssText = `width: ${size}px; height: ${size}px; object-fit: cover;`;
+        return img;
+    }
+    const circle = document.createElement('div');
+    circle.className = `avatar-circle bg-primary text-white d-flex align-items-center justify-content-center ${margin}`;
+    circle.style.cssText = `width: ${size}px; height: ${size}px; border-radius: 50%; font-size: ${fontSize};`;
+    circle.textContent = author.username[0].toUpperCase();
+    return circle;
+}
+
+function buildComment(comment, isReply) {
+    const item = document.createElement('div');
+    item.className = isReply ? 'reply-item mb-3' : 'comment-item mb-4';
+    item.id = `comment-${comment.id}`;
+    item.dataset.commentId = comment.id;
+
+    const row = document.createElement('div');
+    row.className = 'd-flex';
+    row.appendChild(isReply
+        ? buildAvatar(comment.author, 32, '1rem', 'me-2')
+        : buildAvatar(comment.author, 40, '1.2rem', 'me-2'));
+
+    const body = document.createElement('div');
+    body.className = 'flex-grow-1';
+    const name = document.createElement('h6');
+    name.className = 'mb-0';
+    name.textContent = comment.author.username;
+    const time = document.createElement('small');
+    time.className = 'text-muted';
+    time.textContent = comment.created_at;
+    const content = document.createElement('div');
+    content.className = 'mt-2';
+    // 留言 HTML 由伺服器於儲存時轉換並跳脫
+    content.innerHTML = comment.html;
+
+    const header = document.createElement('div');
+    header.append(name, time);
+    body.append(header, content);
+    row.appendChild(body);
+    item.appendChild(row);
+    return item;
+}
+
+function updateCommentCount(count) {
+    const badge = document.querySelector('.comments-count');
+    if (badge && typeof count === 'number') badge.textContent = count;
+}
+
+function insertComment(comment) {
+    // 自己送出的留言或重新連線後重複的事件
+    if (document.querySelector(`[data-comment-id="${comment.id}"]`)) return;
+
+    if (comment.parent_id) {
+        const parent = document.querySelector(`.comment-item[data-comment-id="${comment.parent_id}"]`);
+        if (!parent) return;
+        let replies = parent.querySelector('.replies');
+        if (!replies) {
+            replies = document.createElement('div');
+            replies.className = 'replies ms-4 mt-3';
+            parent.querySelector('.flex-grow-1').appendChild(replies);
+        }
+        replies.appendChild(buildComment(comment, true));
+    } else {
+        const list = document.querySelector('.comments-list');
+        if (!list) return;
+        list.querySelector('.no-comments')?.remove();
+        list.appendChild(buildComment(comment, false));
+    }
+}
+
+function connectEvents(url) {
+    const source = new EventSource(url);
+
+    source.addEventListener('likes', event => {
+        const data = JSON.parse(event.data);
+        document.querySelectorAll('.like-count').forEach(span => {
+            span.textContent = data.count;
+        });
+    });
+
+    source.addEventListener('comment', event => {
+        const data = JSON.parse(event.data);
+        insertComment(data);
+        updateCommentCount(data.count);
+    });
+
+    source.addEventListener('comment_deleted', event => {
+        const data = JSON.parse(event.data);
+        document.querySelector(`[data-comment-id="${data.id}"]`)?.remove();
+        updateCommentCount(data.count);
+    });
+
+    // 伺服器回應錯誤（例如連線數已滿的 503）時瀏覽器不會自動重連，稍後再試
+    source.addEventListener('error', () => {
+        if (source.readyState === EventSource.CLOSED) {
+            setTimeout(() => connectEvents(url), 15000);
+        }
+    });
+}
+
+if (live && live.dataset.eventsUrl && window.EventSource) {
+    connectEvents(live.dataset.eventsUrl);
+}
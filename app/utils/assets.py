@@ -0,0 +1,486 @@
+import hashlib
+import json
+import os
+import posixpath
+import re
+import urllib.request
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+from flask import request, url_for
+
+
+# 第三方資源（固定版本），由 `flask assets vendor` 下載到 static/vendor
+VENDOR_FILES = [
+    ('https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.min.css',
+     'vendor/bootstrap/bootstrap.min.css'),
+    ('https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js',
+     'vendor/bootstrap/bootstrap.bundle.min.js'),
+    ('https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css',
+     'vendor/bootstrap-icons/bootstrap-icons.css'),
+    ('https://fonts.googleapis.com/css2?family=Noto+Sans+TC:wght@400;500;700&display=swap',
+     'vendor/fonts/noto-sans-tc.css'),
+]
+
+# Google Fonts 依 User-Agent 回傳字型格式，使用現代瀏覽器的 UA 取得 woff2
+VENDOR_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+# 打包設定：輸出名稱 -> 來源檔案（相對於 static 目錄）
+BUNDLES = {
+    'app.css': [
+        'vendor/bootstrap/bootstrap.min.css',
+        'vendor/bootstrap-icons/bootstrap-icons.css',
+        'vendor/fonts/noto-sans-tc.css',
+        'css/style.css',
+    ],
+    'app.js': [
+        'vendor/bootstrap/bootstrap.bundle.min.js',
+    ],
+    'post_show.js': [
+        'js/post_show.js',
+    ],
+}
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+HISTORY_NAME = 'manifest-history.json'  # 最近幾次建置的 manifest（新到舊），清除舊檔案時保留其引用的檔案
+KEEP_BUILDS = 3
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+CSS_URL_PATTERN = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def minify_css(css: str) -> str:
+    """
+    精簡 CSS：移除註解（保留 /*! 授權註解）與多餘空白
+
+    Args:
+        css: CSS 原始碼
+
+    Returns:
+        str: 精簡後的 CSS
+    """
+    css = re.sub(r'/\*(?!!).*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,])\s*', r'\1', css)
+    return css.replace(';}', '}').strip()
+
+
+# 出現在這些字元或關鍵字之後的 / 是正規表示式的開頭，否則是除號
+REGEX_PRECEDING_CHARS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_PRECEDING_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new',
+                         'delete', 'void', 'throw', 'instanceof', 'yield', 'await'}
+WORD_PATTERN = re.compile(r'[\w$]+$')
+
+
+def _regex_allowed(out: List[str]) -> bool:
+    """依已輸出的最後一個非空白記號判斷 / 是否為正規表示式"""
+    tail = ''.join(out[-32:]).rstrip()
+    if not tail:
+        return True
+    if tail[-1] in REGEX_PRECEDING_CHARS:
+        return True
+    word = WORD_PATTERN.search(tail)
+    return bool(word) and word.group(0) in REGEX_PRECEDING_WORDS
+
+
+def _skip_quoted(js: str, i: int, quote: str) -> int:
+    """回傳字串（或正規表示式）結束後的位置；i 為開頭引號之後"""
+    in_class = False
+    while i < len(js):
+        char = js[i]
+        if char == '\\':
+            i += 2
+            continue
+        if quote == '/' and char == '[':
+            in_class = True
+        elif quote == '/' and char == ']':
+            in_class = False
+        elif char == quote and not in_class:
+            return i + 1
+        elif char == '\n' and quote != '`':
+            # 未結束的字串或正規表示式：不是預期的語法，原樣保留
+            return i
+        i += 1
+    return i
+
+
+def minify_js(js: str) -> str:
+    """
+    保守地精簡 JavaScript：移除註解（保留 /*! 授權註解）、縮排、行尾空白與空行，
+    保留換行以免影響自動分號插入；字串、樣板字串與正規表示式的內容不變
+
+    Args:
+        js: JavaScript 原始碼
+
+    Returns:
+        str: 精簡後的 JavaScript
+    """
+    out: List[str] = []
+    # 樣板字串中 ${...} 的巢狀層級：每層記錄進入時的大括號深度
+    templates: List[int] = []
+    depth = 0
+    line_start = True
+    i = 0
+    length = len(js)
+
+    def newline():
+        while out and out[-1] in (' ', '\t'):
+            out.pop()
+        if out and out[-1] != '\n':
+            out.append('\n')
+
+    while i < length:
+        char = js[i]
+        following = js[i + 1] if i + 1 < length else ''
+
+        if char in ' \t\r':
+            if not line_start:
+                out.append(' ' if char != '\r' else '')
+            i += 1
+            continue
+        if char == '\n':
+            newline()
+            line_start = True
+            i += 1
+            continue
+        line_start = False
+
+        if char == '/' and following == '/':
+            end = js.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        if char == '/' and following == '*':
+            end = js.find('*/', i + 2)
+            end = length if end == -1 else end + 2
+            comment = js[i:end]
+            if comment.startswith('/*!'):
+                out.append(comment)
+            elif '\n' in comment:
+                newline()
+                line_start = True
+            else:
+                out.append(' ')
+            i = end
+            continue
+
+        if char in '\'"' or (char == '/' and _regex_allowed(out)):
+            end = _skip_quoted(js, i + 1, char)
+            out.append(js[i:end])
+            i = end
+            continue
+
+        if char == '`' or (char == '}' and templates and templates[-1] == depth):
+            # 樣板字串（或 ${...} 結束後的其餘部分）：複製到結尾的 ` 或下一個 ${
+            if char == '}':
+                templates.pop()
+            j = i + 1
+            while j < length:
+                if js[j] == '\\':
+                    j += 2
+                    continue
+                if js[j] == '`':
+                    j += 1
+                    break
+                if js[j] == '$' and j + 1 < length and js[j + 1] == '{':
+                    j += 2
+                    templates.append(depth)
+                    break
+                j += 1
+            out.append(js[i:j])
+            i = j
+            continue
+
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        out.append(char)
+        i += 1
+
+    newline()
+    return ''.join(out).strip('\n')
+
+
+def fingerprint(name: str, data: bytes) -> str:
+    """
+    依內容雜湊產生檔名，例如 app.css -> app.3f2a9c1d0b.css
+
+    Args:
+        name: 原始檔名
+        data: 檔案內容
+
+    Returns:
+        str: 含內容雜湊的檔名
+    """
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return f'{stem}.{digest}{ext}'
+
+
+def _download(url: str) -> bytes:
+    """下載檔案"""
+    req = urllib.request.Request(url, headers={'User-Agent': VENDOR_USER_AGENT})
+    with urllib.request.urlopen(req, timeout=30) as response:
+        return response.read()
+
+
+def missing_vendor_files(static_folder: str) -> List[str]:
+    """
+    尚未下載的第三方資源
+
+    Args:
+        static_folder: 靜態檔案目錄
+
+    Returns:
+        List[str]: 缺少的檔案（相對於 static 目錄）
+    """
+    return [relative_path for _, relative_path in VENDOR_FILES
+            if not os.path.isfile(os.path.join(static_folder, relative_path))]
+
+
+def vendor_assets(static_folder: str, only_missing: bool = False) -> List[str]:
+    """
+    下載第三方資源到 static/vendor，CSS 中引用的字型等檔案一併下載並改為相對路徑
+
+    Args:
+        static_folder: 靜態檔案目錄
+        only_missing: 只下載尚未存在的檔案
+
+    Returns:
+        List[str]: 已下載的檔案（相對於 static 目錄）
+    """
+    written = []
+    missing = set(missing_vendor_files(static_folder)) if only_missing else None
+
+    def save(relative_path: str, data: bytes) -> None:
+        target = os.path.join(static_folder, relative_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(data)
+        written.append(relative_path)
+
+    for url, relative_path in VENDOR_FILES:
+        if missing is not None and relative_path not in missing:
+            continue
+        data = _download(url)
+
+        if relative_path.endswith('.css'):
+            css_dir = posixpath.dirname(relative_path)
+            resource_dir = posixpath.splitext(posixpath.basename(relative_path))[0]
+            downloaded = {}
+
+            def localize(match):
+                ref = match.group(2)
+                if ref.startswith('data:'):
+                    return match.group(0)
+
+                absolute = urljoin(url, ref)
+                if absolute not in downloaded:
+                    filename = posixpath.basename(urlsplit(absolute).path)
+                    local = posixpath.join(resource_dir, filename)
+                    save(posixpath.join(css_dir, local), _download(absolute))
+                    downloaded[absolute] = local
+                return f'url("{downloaded[absolute]}")'
+
+            data = CSS_URL_PATTERN.sub(localize, data.decode('utf-8')).encode('utf-8')
+
+        save(relative_path, data)
+
+    return written
+
+
+def _read_json(path: str, default):
+    """讀取 JSON 檔案，不存在或格式錯誤時回傳預設值"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def prune_dist(dist: str, manifests: List[Dict[str, str]]) -> List[str]:
+    """
+    刪除 dist 中不屬於任何保留的 manifest 的檔案（含預先壓縮的 .gz/.br）
+
+    Args:
+        dist: dist 目錄
+        manifests: 保留的 manifest
+
+    Returns:
+        List[str]: 已刪除的檔名
+    """
+    keep = {MANIFEST_NAME, HISTORY_NAME}
+    for manifest in manifests:
+        keep.update(manifest.values())
+
+    removed = []
+    for name in os.listdir(dist):
+        base = name[:-3] if name.endswith(('.gz', '.br')) else name
+        if base not in keep and os.path.isfile(os.path.join(dist, name)):
+            os.remove(os.path.join(dist, name))
+            removed.append(name)
+    return removed
+
+
+def build_assets(static_folder: str, keep_builds: int = KEEP_BUILDS) -> Dict[str, str]:
+    """
+    打包、精簡並以內容雜湊命名資源，輸出到 static/dist 並寫入 manifest
+
+    CSS 引用的本地檔案（字型、圖片）也會複製為含雜湊的檔名，
+    讓 dist 內所有檔案都能使用 immutable 快取。
+    先前建置的檔案保留 keep_builds 次建置，部署後仍被快取頁面引用的舊版本不會變成 404
+
+    Args:
+        static_folder: 靜態檔案目錄
+        keep_builds: 保留最近幾次建置的檔案（含本次）
+
+    Returns:
+        Dict[str, str]: 資源名稱 -> dist 內的檔名
+    """
+    dist = os.path.join(static_folder, DIST_FOLDER)
+    os.makedirs(dist, exist_ok=True)
+
+    # 先前的建置紀錄；升級前建置的 dist 沒有紀錄，以目前的 manifest 作為上一次建置
+    history = _read_json(os.path.join(dist, HISTORY_NAME), None)
+    if history is None:
+        previous = _read_json(os.path.join(dist, MANIFEST_NAME), None)
+        history = [previous] if previous else []
+
+    manifest = {}
+
+    def emit(name: str, data: bytes) -> str:
+        output = fingerprint(name, data)
+        with open(os.path.join(dist, output), 'wb') as f:
+            f.write(data)
+        return output
+
+    for bundle, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(static_folder, source), encoding='utf-8') as f:
+                text = f.read()
+
+            if bundle.endswith('.css'):
+                source_dir = posixpath.dirname(source)
+
+                def relocate(match):
+                    ref = match.group(2)
+                    if ref.startswith(('data:', 'http:', 'https:', '//', '#')):
+                        return match.group(0)
+                    path = urlsplit(ref).path
+                    local = posixpath.normpath(posixpath.join(source_dir, path))
+                    if local not in manifest:
+                        with open(os.path.join(static_folder, local), 'rb') as f:
+                            manifest[local] = emit(posixpath.basename(local), f.read())
+                    return f'url("{manifest[local]}")'
+
+                text = minify_css(CSS_URL_PATTERN.sub(relocate, text))
+            elif not source.endswith('.min.js'):
+                text = minify_js(text)
+
+            parts.append(text)
+
+        separator = '\n' if bundle.endswith('.css') else ';\n'
+        manifest[bundle] = emit(bundle, separator.join(parts).encode('utf-8'))
+
+    # 新的 manifest 最後才寫入，建置過程中仍以舊版本提供服務
+    history = ([manifest] + [old for old in history if old != manifest])[:max(1, keep_builds)]
+    for name, data in ((HISTORY_NAME, history), (MANIFEST_NAME, manifest)):
+        temporary = os.path.join(dist, name + '.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(temporary, os.path.join(dist, name))
+
+    prune_dist(dist, history)
+    return manifest
+
+
+def static_cache_control(path: str) -> str:
+    """
+    靜態檔案的 Cache-Control：dist 內的檔案名稱含內容雜湊，可永久快取
+
+    Args:
+        path: 相對於 static 目錄的路徑
+
+    Returns:
+        str: Cache-Control 標頭值
+    """
+    if path.startswith(DIST_FOLDER + '/'):
+        return IMMUTABLE_CACHE_CONTROL
+    return 'no-cache'
+
+
+class Assets:
+    """
+    靜態資源管理
+    提供 asset_url() 模板函數；尚未建置時退回原始檔案（單一來源的資源）
+    """
+
+    def __init__(self, app=None):
+        self.manifest: Dict[str, str] = {}
+        self.version: Optional[str] = None
+        self.static_folder: Optional[str] = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """
+        載入 manifest 並註冊模板函數與快取標頭
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        self.static_folder = app.static_folder
+        self.load_manifest()
+
+        app.add_template_global(self.asset_url, 'asset_url')
+        app.add_template_global(self.assets_built, 'assets_built')
+
+        @app.after_request
+        def set_immutable_cache(response):
+            """含內容雜湊的資源使用 immutable 快取"""
+            if request.endpoint == 'static' and response.status_code == 200:
+                filename = (request.view_args or {}).get('filename', '')
+                if filename.startswith(DIST_FOLDER + '/'):
+                    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+            return response
+
+        app.extensions['assets'] = self
+
+    def load_manifest(self) -> None:
+        """讀取 dist/manifest.json，不存在時視為尚未建置；version 為 manifest 內容的雜湊"""
+        path = os.path.join(self.static_folder, DIST_FOLDER, MANIFEST_NAME)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            self.manifest = json.loads(data)
+            self.version = hashlib.sha256(data).hexdigest()[:10]
+        except (OSError, ValueError):
+            self.manifest = {}
+            self.version = None
+
+    def assets_built(self) -> bool:
+        """是否已執行 `flask assets build`"""
+        return bool(self.manifest)
+
+    def asset_url(self, name: str) -> str:
+        """
+        取得資源網址
+
+        Args:
+            name: 資源名稱（BUNDLES 的鍵）或相對於 static 目錄的路徑
+
+        Returns:
+            str: 資源網址
+        """
+        if name in self.manifest:
+            return url_for('static', filename=f'{DIST_FOLDER}/{self.manifest[name]}')
+
+        sources = BUNDLES.get(name)
+        if sources and len(sources) == 1:
+            return url_for('static', filename=sources[0])
+        return url_for('static', filename=name)
@@ -0,0 +1,68 @@
+import hashlib
+import math
+from typing import Iterable
+
+
+class BloomFilter:
+    """
+    布隆過濾器
+    不存在於過濾器中的值必定未被加入過；存在時則可能是誤判，需要再查詢資料庫確認
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: 預計容納的元素數量
+            error_rate: 可接受的誤判率
+        """
+        if capacity <= 0:
+            raise ValueError('capacity 必須大於 0')
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate 必須介於 0 與 1 之間')
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        # 依容量與誤判率計算位元數 m 與雜湊函數數量 k
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        """以雙重雜湊產生 k 個位元位置"""
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, value: str) -> None:
+        """
+        加入一個值
+
+        Args:
+            value: 要加入的字串
+        """
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, values: Iterable[str]) -> None:
+        """
+        批次加入多個值
+
+        Args:
+            values: 要加入的字串集合
+        """
+        for value in values:
+            self.add(value)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(value))
+
+    @property
+    def is_full(self) -> bool:
+        """加入的元素數量是否已超過設計容量（誤判率會開始上升）"""
+        return self.count > self.capacity
@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    行程內的有效期限快取
+
+    - 每個項目在 ttl 秒後過期，超過 maxsize 時淘汰最久未使用的項目
+    - 快取只存在於單一工作行程，其他行程的寫入無法主動失效，
+      因此 ttl 也是跨行程資料延遲的上限
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        """
+        Args:
+            maxsize: 最大項目數
+            ttl: 有效期限（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        取得快取值
+
+        Args:
+            key: 鍵
+            default: 不存在或已過期時的預設值
+
+        Returns:
+            快取值或預設值
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        設定快取值
+
+        Args:
+            key: 鍵
+            value: 值
+            ttl: 有效期限（秒），預設使用建立時的設定
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        取得快取值，不存在時以 factory 計算並存入
+
+        Args:
+            key: 鍵
+            factory: 計算值的函數（在鎖外執行，同時的請求可能各自計算一次）
+
+        Returns:
+            快取值
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def delete(self, key: Hashable) -> None:
+        """刪除快取值"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """清除所有快取"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
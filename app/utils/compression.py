@@ -0,0 +1,320 @@
+import gzip
+import mimetypes
+import os
+import zlib
+from typing import Callable, Iterable, List, Optional
+from werkzeug.http import parse_accept_header, http_date, quote_etag, unquote_etag
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# 可壓縮的內容類型（text/event-stream 需要即時送出，不壓縮）
+COMPRESSIBLE_TYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/javascript', 'text/xml',
+    'application/javascript', 'application/json', 'application/xml',
+    'application/manifest+json', 'image/svg+xml',
+)
+
+# 建置時預先壓縮的靜態檔案副檔名
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.xml', '.map', '.html', '.webmanifest')
+
+# 預先壓縮檔的副檔名
+ENCODING_EXTENSIONS = {'br': '.br', 'gzip': '.gz'}
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """
+    依 Accept-Encoding 選擇壓縮格式，brotli 優先
+
+    Args:
+        accept_encoding: Accept-Encoding 標頭
+        available: 可使用的壓縮格式（依偏好排序）
+
+    Returns:
+        Optional[str]: 'br'、'gzip' 或 None
+    """
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding)
+    for encoding in available:
+        if accept.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """判斷內容類型是否值得壓縮"""
+    if not content_type:
+        return False
+    return content_type.split(';', 1)[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+class StreamingCompressor:
+    """逐塊壓縮回應內容，不需先把整個回應讀入記憶體"""
+
+    def __init__(self, encoding: str, level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 產生含 gzip 標頭的輸出
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes, flush: bool = False) -> bytes:
+        """
+        壓縮一個區塊
+
+        Args:
+            chunk: 原始資料
+            flush: 是否立即送出目前為止的壓縮結果（串流回應使用）
+
+        Returns:
+            bytes: 壓縮後的資料（可能為空）
+        """
+        if self.encoding == 'br':
+            data = self._compressor.process(chunk)
+            return data + self._compressor.flush() if flush else data
+
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else data
+
+    def finish(self) -> bytes:
+        """結束壓縮並取得剩餘資料"""
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    回應壓縮 WSGI 中介層
+
+    - 依 Accept-Encoding 協商 brotli / gzip，僅壓縮超過大小門檻的可壓縮內容
+    - 沒有 Content-Length 的串流回應會逐塊壓縮並即時送出
+    - 靜態檔案若有建置時產生的 .br / .gz 檔，直接以 wsgi.file_wrapper（sendfile）送出
+    """
+
+    def __init__(self, app, min_size: int = 500, level: int = 6, brotli_quality: int = 4,
+                 static_folder: Optional[str] = None, static_url_path: str = '/static',
+                 static_cache_control: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            app: 被包裝的 WSGI 應用程式
+            min_size: 壓縮的最小位元組數
+            level: gzip 壓縮等級
+            brotli_quality: brotli 動態壓縮品質（預先壓縮的檔案使用最高品質）
+            static_folder: 靜態檔案目錄
+            static_url_path: 靜態檔案網址前綴
+            static_cache_control: 依靜態檔案路徑回傳 Cache-Control 的函數
+        """
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+        self.static_folder = static_folder
+        self.static_prefix = static_url_path.rstrip('/') + '/'
+        self.static_cache_control = static_cache_control or (lambda path: 'no-cache')
+        self.encodings = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def __call__(self, environ, start_response):
+        method = environ.get('REQUEST_METHOD', 'GET')
+        accept_encoding = environ.get('HTTP_ACCEPT_ENCODING', '')
+
+        if method not in ('GET', 'HEAD') or not accept_encoding:
+            return self.app(environ, start_response)
+
+        # 預先壓縮的靜態檔案
+        path = environ.get('PATH_INFO', '')
+        if self.static_folder and path.startswith(self.static_prefix):
+            response = self._serve_precompressed(environ, start_response, path, accept_encoding)
+            if response is not None:
+                return response
+
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None or method == 'HEAD':
+            return self.app(environ, start_response)
+
+        return self._compress_response(environ, start_response, encoding)
+
+    def _compress_response(self, environ, start_response, encoding: str):
+        """包裝應用程式的回應，決定是否壓縮並逐塊處理"""
+        state = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            compressor, streaming = self._prepare_headers(status, headers, encoding)
+            state['compressor'] = compressor
+            state['streaming'] = streaming
+            return start_response(status, headers, exc_info)
+
+        body = self.app(environ, capture_start_response)
+        iterator = iter(body)
+
+        # 若應用程式在第一次迭代時才呼叫 start_response，先取出第一個區塊
+        first: List[bytes] = []
+        if 'compressor' not in state:
+            try:
+                first.append(next(iterator))
+            except StopIteration:
+                pass
+
+        compressor = state.get('compressor')
+        if compressor is None:
+            return self._passthrough(body, first, iterator)
+        return self._compress_iter(body, first, iterator, compressor, state['streaming'])
+
+    def _prepare_headers(self, status: str, headers: list, encoding: str):
+        """
+        依回應標頭判斷是否壓縮，需要壓縮時就地修改標頭
+
+        Returns:
+            Tuple[Optional[StreamingCompressor], bool]: (壓縮器, 是否為串流回應)
+        """
+        code = int(status.split(' ', 1)[0])
+        values = {name.lower(): value for name, value in headers}
+
+        if (code < 200 or code in (204, 206, 304)
+                or 'content-encoding' in values
+                or 'no-transform' in values.get('cache-control', '')
+                or not is_compressible(values.get('content-type'))):
+            return None, False
+
+        content_length = values.get('content-length')
+        if content_length is not None and int(content_length) < self.min_size:
+            return None, False
+
+        headers[:] = [(name, value) for name, value in headers
+                      if name.lower() not in ('content-length', 'etag')]
+        headers.append(('Content-Encoding', encoding))
+
+        # 壓縮後內容不同，強 ETag 改為弱 ETag
+        etag = values.get('etag')
+        if etag:
+            tag, weak = unquote_etag(etag)
+            headers.append(('ETag', quote_etag(tag, weak=True)))
+
+        vary = values.get('vary')
+        if not vary:
+            headers.append(('Vary', 'Accept-Encoding'))
+        elif 'accept-encoding' not in vary.lower():
+            headers[:] = [(name, value) for name, value in headers if name.lower() != 'vary']
+            headers.append(('Vary', f'{vary}, Accept-Encoding'))
+
+        compressor = StreamingCompressor(encoding, self.level, self.brotli_quality)
+        return compressor, content_length is None
+
+    @staticmethod
+    def _passthrough(body, first: List[bytes], iterator):
+        """不壓縮，原樣送出"""
+        try:
+            yield from first
+            yield from iterator
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+    @staticmethod
+    def _compress_iter(body, first: List[bytes], iterator, compressor: StreamingCompressor,
+                       streaming: bool):
+        """逐塊壓縮送出，串流回應每個區塊都立即 flush"""
+        try:
+            for chunk in first:
+                data = compressor.compress(chunk, flush=streaming)
+                if data:
+                    yield data
+            for chunk in iterator:
+                data = compressor.compress(chunk, flush=streaming)
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+    def _serve_precompressed(self, environ, start_response, path: str, accept_encoding: str):
+        """
+        送出建置時預先壓縮的靜態檔案
+
+        Returns:
+            回應內容，沒有可用的預先壓縮檔時為 None
+        """
+        relative_path = path[len(self.static_prefix):]
+        source = safe_join(self.static_folder, relative_path)
+        if source is None or not os.path.isfile(source):
+            return None
+
+        candidates = [encoding for encoding in ('br', 'gzip')
+                      if os.path.isfile(source + ENCODING_EXTENSIONS[encoding])]
+        encoding = negotiate_encoding(accept_encoding, candidates)
+        if encoding is None:
+            return None
+
+        compressed = source + ENCODING_EXTENSIONS[encoding]
+        stat = os.stat(compressed)
+        if stat.st_mtime < os.stat(source).st_mtime:
+            # 原始檔案比壓縮檔新，壓縮檔已過期
+            return None
+
+        etag = quote_etag(f'{int(stat.st_mtime)}-{stat.st_size}-{encoding}')
+        headers = [
+            ('Content-Type', mimetypes.guess_type(source)[0] or 'application/octet-stream'),
+            ('Content-Encoding', encoding),
+            ('Vary', 'Accept-Encoding'),
+            ('ETag', etag),
+            ('Last-Modified', http_date(stat.st_mtime)),
+            ('Cache-Control', self.static_cache_control(relative_path)),
+        ]
+
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            start_response('304 Not Modified', headers)
+            return []
+
+        headers.append(('Content-Length', str(stat.st_size)))
+        start_response('200 OK', headers)
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return []
+        return wrap_file(environ, open(compressed, 'rb'))
+
+
+def precompress_static(folder: str, min_size: int = 500) -> List[str]:
+    """
+    預先壓縮靜態檔案，產生 .gz 與 .br（若已安裝 brotli）
+
+    Args:
+        folder: 靜態檔案目錄
+        min_size: 壓縮的最小位元組數
+
+    Returns:
+        List[str]: 新產生的壓縮檔路徑
+    """
+    written = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+
+            source = os.path.join(root, name)
+            if os.path.getsize(source) < min_size:
+                continue
+
+            with open(source, 'rb') as f:
+                data = f.read()
+
+            outputs = {'.gz': lambda: gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                outputs['.br'] = lambda: brotli.compress(data, quality=11)
+
+            for extension, compress in outputs.items():
+                target = source + extension
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compress())
+                written.append(target)
+
+    return written
@@ -0,0 +1,233 @@
+import os
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Mapping, Optional
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.sql.dml import UpdateBase
+
+
+# 唯讀副本在 SQLALCHEMY_BINDS 中的名稱
+REPLICA_BIND_KEY = 'replica'
+
+# session.info 中的路由狀態
+USE_REPLICA = 'use_replica'
+HAS_WRITTEN = 'has_written'
+
+
+# 伺服器資料庫連線池設定：配置名稱 -> create_engine 參數
+POOL_OPTIONS = {
+    'DB_POOL_SIZE': 'pool_size',
+    'DB_MAX_OVERFLOW': 'max_overflow',
+    'DB_POOL_TIMEOUT': 'pool_timeout',
+    'DB_POOL_RECYCLE': 'pool_recycle',
+    'DB_POOL_PRE_PING': 'pool_pre_ping',
+}
+
+
+def is_sqlite(uri: str) -> bool:
+    """
+    資料庫位址是否為 SQLite
+
+    Args:
+        uri: 資料庫位址
+
+    Returns:
+        bool: 是否為 SQLite
+    """
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def sqlite_file_path(url: str, instance_path: Optional[str] = None) -> str:
+    """
+    取得 'sqlite:///<路徑>' 位址的檔案路徑
+    與 Flask-SQLAlchemy 相同，相對路徑放在 instance 目錄下（目錄不存在時建立）
+
+    Args:
+        url: 'sqlite:///<路徑>' 位址
+        instance_path: 應用程式的 instance 目錄
+
+    Returns:
+        str: 檔案路徑
+    """
+    path = url[len('sqlite:///'):]
+    if instance_path and not os.path.isabs(path):
+        os.makedirs(instance_path, exist_ok=True)
+        path = os.path.join(instance_path, path)
+    return path
+
+
+def build_engine_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    依配置產生 SQLALCHEMY_ENGINE_OPTIONS
+    SQLite 使用 Flask-SQLAlchemy 的預設連線池，只有伺服器資料庫套用連線池設定；
+    SQLALCHEMY_ENGINE_OPTIONS 中明確指定的參數優先
+
+    Args:
+        config: 應用程式配置
+
+    Returns:
+        Dict[str, Any]: create_engine 參數
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return options
+
+    for option, value in pool_options(config).items():
+        options.setdefault(option, value)
+    return options
+
+
+def pool_options(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    由 DB_POOL_* 配置產生伺服器資料庫的連線池參數
+
+    Args:
+        config: 應用程式配置
+
+    Returns:
+        Dict[str, Any]: create_engine 參數（只包含有設定的項目）
+    """
+    return {
+        option: config[name] for name, option in POOL_OPTIONS.items()
+        if config.get(name) is not None
+    }
+
+
+def format_pragma(name: str, value: Any) -> str:
+    """
+    產生 PRAGMA 語句
+
+    Args:
+        name: PRAGMA 名稱
+        value: 值（整數、布林值或關鍵字，例如 WAL、NORMAL）
+
+    Returns:
+        str: PRAGMA 語句
+    """
+    if not name.isidentifier():
+        raise ValueError(f'無效的 PRAGMA 名稱: {name}')
+    if isinstance(value, bool):
+        value = int(value)
+    elif not isinstance(value, int) and not str(value).isidentifier():
+        raise ValueError(f'無效的 PRAGMA 值: {name}={value}')
+    return f'PRAGMA {name}={value}'
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, Any]) -> None:
+    """
+    在每個新連線建立時設定 SQLite PRAGMA
+
+    大部分 PRAGMA（synchronous、cache_size、mmap_size、busy_timeout）只對單一連線有效，
+    因此必須在 connect 事件中設定；journal_mode=WAL 會寫入資料庫檔案，對記憶體資料庫無效
+
+    Args:
+        engine: SQLite 引擎
+        pragmas: PRAGMA 名稱 -> 值
+    """
+    statements = [format_pragma(name, value) for name, value in pragmas.items()]
+    if not statements:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+class RoutingSession(Session):
+    """
+    讀寫分離的 session
+
+    - 在 use_replica() 範圍內（或以 @replica_reads 裝飾的函數中）的查詢使用唯讀副本
+    - 寫入（flush 或 INSERT/UPDATE/DELETE 語句）一律使用主資料庫；
+      同一個 session（即同一個請求）寫入後的所有讀取也改用主資料庫，確保讀得到剛寫入的資料
+    - 未設定副本時行為與預設 session 相同
+
+    注意：以 text() 執行的寫入無法辨識，請勿在 use_replica() 範圍內使用
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None:
+            return engine
+
+        if isinstance(clause, UpdateBase):
+            self.info[HAS_WRITTEN] = True
+            return engine
+
+        if self.info.get(USE_REPLICA) and not self.info.get(HAS_WRITTEN):
+            engines = self._db.engines
+            replica = engines.get(REPLICA_BIND_KEY)
+            # 只轉送原本使用預設資料庫的查詢
+            if replica is not None and engine is engines.get(None):
+                return replica
+        return engine
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _mark_session_written(session, flush_context, instances):
+    """flush 之前標記 session 已寫入，之後的讀取改用主資料庫"""
+    session.info[HAS_WRITTEN] = True
+
+
+@contextmanager
+def use_replica():
+    """
+    在此範圍內的唯讀查詢使用副本（可巢狀使用）
+
+    範圍結束後才觸發的延遲載入（例如模板中存取關聯）仍使用主資料庫
+    """
+    from app import db
+
+    info = db.session.info
+    previous = info.get(USE_REPLICA, False)
+    info[USE_REPLICA] = True
+    try:
+        yield
+    finally:
+        info[USE_REPLICA] = previous
+
+
+def replica_reads(func: Callable) -> Callable:
+    """
+    唯讀函數的裝飾器：函數內的查詢使用副本
+
+    Args:
+        func: 只讀取資料的函數
+
+    Returns:
+        包裝後的函數
+    """
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+
+    return wrapped
+
+
+def sync_sqlite_replica(primary: Engine, replica: Engine) -> None:
+    """
+    以 SQLite 線上備份 API 將主資料庫完整複製到副本
+    用於在本機以兩個 SQLite 檔案模擬主從架構（正式環境由資料庫本身的複寫處理）
+
+    Args:
+        primary: 主資料庫引擎
+        replica: 副本引擎
+    """
+    if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        raise ValueError('只支援 SQLite 資料庫')
+
+    source = primary.raw_connection()
+    target = replica.raw_connection()
+    try:
+        source.driver_connection.backup(target.driver_connection)
+    finally:
+        target.close()
+        source.close()
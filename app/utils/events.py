@@ -0,0 +1,479 @@
+"""
+文章即時事件（Server-Sent Events）
+
+服務層以 publish_post_event() 發布按讚數與留言的變更，經由後端傳到每個工作行程，
+再由 EventBroker 分派給本行程中訂閱該文章的連線：
+- MemoryBackend：只在同一行程內傳遞（開發環境）
+- SQLiteBackend：同一台機器的多個工作行程共用一個 SQLite 檔案（正式環境預設）
+- RedisBackend：多台機器以 Redis pub/sub 傳遞
+"""
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from flask import current_app
+from werkzeug.exceptions import ServiceUnavailable
+from app.utils.database import sqlite_file_path
+
+
+# 瀏覽器 EventSource 斷線後重新連線的等待時間
+RECONNECT_DELAY_MS = 3000
+
+
+class TooManyStreams(ServiceUnavailable):
+    """本行程的即時事件連線數已達上限，回應 503 並附上 Retry-After"""
+    description = '目前即時更新連線過多，請稍後再試'
+
+
+def post_channel(post_id: int) -> str:
+    """文章的事件頻道名稱"""
+    return f'post:{post_id}'
+
+
+def publish_post_event(post_id: int, event: str, data: dict, key: Optional[str] = None) -> None:
+    """
+    發布文章的事件，失敗時只記錄錯誤，不影響原本的操作
+
+    Args:
+        post_id: 文章ID
+        event: 事件名稱
+        data: 事件資料
+        key: 合併鍵，見 Subscription.put
+    """
+    try:
+        current_app.extensions['events'].publish(post_channel(post_id), event, data, key)
+    except Exception as e:
+        current_app.logger.error(f"Error publishing {event} event: {str(e)}")
+
+
+def format_event(event: str, data) -> str:
+    """
+    產生 Server-Sent Events 格式的訊息
+
+    Args:
+        event: 事件名稱
+        data: 可序列化為 JSON 的資料
+
+    Returns:
+        str: SSE 訊息
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """
+    單一用戶端對頻道的訂閱
+
+    同一個 key 的事件（例如按讚數）只保留最新的一筆，其餘事件依序累積；
+    距離上次送出未滿 min_interval 秒時不送出，讓熱門文章的連續事件合併成一次送出
+    """
+
+    def __init__(self, broker: 'EventBroker', channel: str, min_interval: float,
+                 max_pending: int, notify: Optional[Callable[[], None]] = None):
+        self.broker = broker
+        self.channel = channel
+        self.min_interval = min_interval
+        self.max_pending = max_pending
+        self.notify = notify
+        self.closed = False
+        self._pending: 'OrderedDict[object, Tuple[str, dict]]' = OrderedDict()
+        self._sequence = itertools.count()
+        self._last_flush = 0.0
+        self._condition = threading.Condition()
+
+    def put(self, event: str, data: dict, key: Optional[str] = None) -> None:
+        """
+        加入待送出的事件
+
+        Args:
+            event: 事件名稱
+            data: 事件資料
+            key: 合併鍵，相同鍵的事件只保留最新一筆；None 表示不合併
+        """
+        with self._condition:
+            if key is None:
+                key = next(self._sequence)
+            else:
+                self._pending.pop(key, None)
+            self._pending[key] = (event, data)
+            # 用戶端長時間未讀取時捨棄最舊的事件，避免佔用過多記憶體
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+            self._condition.notify_all()
+
+        if self.notify is not None:
+            self.notify()
+
+    def ready_in(self) -> Optional[float]:
+        """
+        距離可以送出的秒數
+
+        Returns:
+            Optional[float]: 沒有待送出的事件時為 None，可立即送出時為 0
+        """
+        with self._condition:
+            if not self._pending:
+                return None
+            return max(0.0, self._last_flush + self.min_interval - time.monotonic())
+
+    def drain(self) -> List[Tuple[str, dict]]:
+        """取出所有待送出的事件"""
+        with self._condition:
+            events = list(self._pending.values())
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+        return events
+
+    def wait(self, timeout: float) -> List[Tuple[str, dict]]:
+        """
+        等待可以送出的事件（WSGI 串流使用，會阻塞目前執行緒）
+
+        Args:
+            timeout: 最長等待秒數
+
+        Returns:
+            List[Tuple[str, dict]]: (事件名稱, 資料)，逾時或已關閉時為空列表
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                delay = self.ready_in()
+                if delay == 0:
+                    return self.drain()
+                self._condition.wait(remaining if delay is None else min(delay, remaining))
+        return []
+
+    def close(self) -> None:
+        """取消訂閱（可重複呼叫）"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        self.broker.unsubscribe(self)
+
+
+class MemoryBackend:
+    """
+    行程內的事件傳遞
+    僅適用於單一工作行程，多工作行程部署時其他行程的訂閱者收不到事件
+    """
+
+    shared = False
+
+    def publish(self, channel: str, payload: str) -> None:
+        """行程內由 EventBroker 直接分派，不需經過儲存"""
+
+    def listen(self, dispatch: Callable[[str, str], None], stop: threading.Event) -> None:
+        """行程內不需要監聽"""
+
+
+class SQLiteBackend:
+    """
+    以 SQLite 檔案在同一台機器的多個工作行程間傳遞事件
+    發布時寫入一列，各行程的監聽執行緒定期讀取新的事件
+    """
+
+    shared = True
+    POLL_INTERVAL = 0.2  # 秒
+    RETENTION = 60  # 秒，超過此時間的事件會被清除
+    PRUNE_EVERY = 200  # 每發布幾次清除一次舊事件
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._published = 0
+
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS events ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, '
+            'payload TEXT NOT NULL, created_at REAL NOT NULL)'
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """取得目前執行緒的資料庫連線"""
+        conn = getattr(self._local, 'conn', None)
+        # 預載應用程式時，fork 出的工作行程不可沿用主行程的連線
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def publish(self, channel: str, payload: str) -> None:
+        """
+        寫入一個事件
+
+        Args:
+            channel: 頻道名稱
+            payload: 事件內容（JSON）
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute('INSERT INTO events (channel, payload, created_at) VALUES (?, ?, ?)',
+                     (channel, payload, now))
+
+        self._published += 1
+        if self._published % self.PRUNE_EVERY == 0:
+            conn.execute('DELETE FROM events WHERE created_at < ?', (now - self.RETENTION,))
+
+    def listen(self, dispatch: Callable[[str, str], None], stop: threading.Event) -> None:
+        """
+        讀取此後發布的事件並分派，直到 stop 被設定
+
+        Args:
+            dispatch: 分派函數 (頻道, 事件內容)
+            stop: 停止信號
+        """
+        conn = self._connect()
+        last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+        while not stop.wait(self.POLL_INTERVAL):
+            rows = conn.execute(
+                'SELECT id, channel, payload FROM events WHERE id > ? ORDER BY id', (last_id,)
+            ).fetchall()
+            for event_id, channel, payload in rows:
+                dispatch(channel, payload)
+                last_id = event_id
+
+
+class RedisBackend:
+    """
+    以 Redis（或相容協定的服務）的 Pub/Sub 在多台機器間傳遞事件
+    """
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str = 'events:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('使用 Redis 事件傳遞需要安裝 redis 套件')
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channel: str, payload: str) -> None:
+        """
+        發布一個事件
+
+        Args:
+            channel: 頻道名稱
+            payload: 事件內容（JSON）
+        """
+        self.client.publish(self.prefix + channel, payload)
+
+    def listen(self, dispatch: Callable[[str, str], None], stop: threading.Event) -> None:
+        """
+        訂閱所有頻道並分派，直到 stop 被設定
+
+        Args:
+            dispatch: 分派函數 (頻道, 事件內容)
+            stop: 停止信號
+        """
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(f'{self.prefix}*')
+        try:
+            while not stop.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                if message and message['type'] == 'pmessage':
+                    channel = message['channel'].decode()[len(self.prefix):]
+                    dispatch(channel, message['data'].decode())
+        finally:
+            pubsub.close()
+
+
+def create_backend(url: Optional[str], instance_path: Optional[str] = None):
+    """
+    依位址建立事件傳遞後端
+
+    Args:
+        url: 'memory://'、'sqlite:///<檔案路徑>' 或 'redis://...'
+        instance_path: SQLite 相對路徑的基準目錄
+
+    Returns:
+        事件傳遞後端實例
+    """
+    if not url or url == 'memory://':
+        return MemoryBackend()
+    if url.startswith('sqlite:///'):
+        return SQLiteBackend(sqlite_file_path(url, instance_path))
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f"不支援的事件傳遞位址: {url}")
+
+
+class EventBroker:
+    """
+    即時事件的發布與訂閱
+
+    - publish(): 在服務層資料變更後呼叫，經由後端傳到所有工作行程
+    - subscribe(): 每個 SSE 連線一個訂閱，由本行程的監聽執行緒分派事件
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryBackend()
+        self.min_interval = 0.5
+        self.keepalive = 15
+        self.stream_timeout = 300
+        self.max_streams = 100
+        self.max_pending = 100
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._listener_pid: Optional[int] = None
+        self._stop = threading.Event()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """
+        從應用程式配置載入事件設定
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        self.backend = create_backend(app.config.get('EVENTS_BACKEND_URL'), app.instance_path)
+        self.min_interval = app.config.get('EVENTS_MIN_INTERVAL', 0.5)
+        self.keepalive = app.config.get('EVENTS_KEEPALIVE', 15)
+        self.stream_timeout = app.config.get('EVENTS_STREAM_TIMEOUT', 300)
+        self.max_streams = app.config.get('EVENTS_MAX_STREAMS', 100)
+        self.max_pending = app.config.get('EVENTS_MAX_PENDING', 100)
+        app.extensions['events'] = self
+
+    @property
+    def stream_count(self) -> int:
+        """本行程目前的訂閱數"""
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def publish(self, channel: str, event: str, data: dict, key: Optional[str] = None) -> None:
+        """
+        發布事件
+
+        Args:
+            channel: 頻道名稱，例如 post:1
+            event: 事件名稱
+            data: 事件資料
+            key: 合併鍵，見 Subscription.put
+        """
+        payload = json.dumps({'event': event, 'data': data, 'key': key}, separators=(',', ':'))
+        if self.backend.shared:
+            self.backend.publish(channel, payload)
+        else:
+            self._dispatch(channel, payload)
+
+    def subscribe(self, channel: str, notify: Optional[Callable[[], None]] = None,
+                  limit: bool = True) -> Subscription:
+        """
+        訂閱頻道
+
+        Args:
+            channel: 頻道名稱
+            notify: 有新事件時的回呼（非同步串流用來喚醒事件迴圈）
+            limit: 是否套用 EVENTS_MAX_STREAMS（每個連線佔用一個執行緒時才需要）
+
+        Returns:
+            Subscription: 訂閱，用畢須呼叫 close()
+
+        Raises:
+            TooManyStreams: 連線數已達上限
+        """
+        if limit and self.max_streams and self.stream_count >= self.max_streams:
+            error = TooManyStreams()
+            error.retry_after = self.keepalive
+            raise error
+
+        self._ensure_listener()
+        subscription = Subscription(self, channel, self.min_interval, self.max_pending, notify)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """移除訂閱"""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        """將事件交給本行程中訂閱此頻道的連線"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        if not subscriptions:
+            return
+
+        message = json.loads(payload)
+        for subscription in subscriptions:
+            subscription.put(message['event'], message['data'], message.get('key'))
+
+    def _ensure_listener(self) -> None:
+        """第一次訂閱時啟動監聽執行緒（fork 後的工作行程會重新啟動）"""
+        if not self.backend.shared:
+            return
+
+        with self._lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._listener = threading.Thread(
+                target=self._listen, args=(self._stop,), name='event-listener', daemon=True
+            )
+            self._listener_pid = os.getpid()
+            self._listener.start()
+
+    def _listen(self, stop: threading.Event) -> None:
+        """監聽執行緒：連線中斷時稍後重試"""
+        while not stop.is_set():
+            try:
+                self.backend.listen(self._dispatch, stop)
+            except Exception:
+                stop.wait(1.0)
+
+    def close(self) -> None:
+        """停止監聽執行緒並結束本行程所有的串流"""
+        self._stop.set()
+        with self._lock:
+            subscriptions = [subscription for channel in self._subscriptions.values() for subscription in channel]
+        for subscription in subscriptions:
+            subscription.close()
+
+
+def stream_subscription(broker: EventBroker, subscription: Subscription):
+    """
+    產生 SSE 回應內容（WSGI 串流，每個連線佔用一個執行緒）
+
+    連線超過 EVENTS_STREAM_TIMEOUT 後結束，瀏覽器的 EventSource 會自動重新連線
+
+    Args:
+        broker: 事件管理器
+        subscription: 訂閱
+
+    Yields:
+        str: SSE 訊息
+    """
+    try:
+        yield f'retry: {RECONNECT_DELAY_MS}\n\n'
+        deadline = time.monotonic() + broker.stream_timeout
+        while not subscription.closed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            events = subscription.wait(min(broker.keepalive, remaining))
+            if events:
+                yield ''.join(format_event(event, data) for event, data in events)
+            else:
+                # 註解行維持連線，並讓伺服器偵測用戶端是否已斷線
+                yield ': keepalive\n\n'
+    finally:
+        subscription.close()
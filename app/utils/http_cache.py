@@ -0,0 +1,84 @@
+import hashlib
+from functools import wraps
+from typing import Callable, Optional, Sequence
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+
+
+def compute_etag(parts: Sequence) -> str:
+    """
+    由版本資訊計算 ETag
+
+    Args:
+        parts: 會影響頁面內容的值（時間戳、計數等）
+
+    Returns:
+        str: ETag 值
+    """
+    raw = '|'.join(repr(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def build_version() -> tuple:
+    """
+    目前部署的版本：APP_VERSION 與靜態資源 manifest 的雜湊
+    部署後 ETag 隨之改變，瀏覽器不會沿用引用舊模板或已刪除資源的頁面
+
+    Returns:
+        tuple: 版本資訊
+    """
+    assets = current_app.extensions.get('assets')
+    return current_app.config.get('APP_VERSION'), assets.version if assets else None
+
+
+def conditional_get(validator: Callable[..., Optional[Sequence]]):
+    """
+    條件式 GET 裝飾器
+
+    在執行視圖函數（大量查詢與模板渲染）之前，先以 validator 取得輕量的版本資訊，
+    若與用戶端的 If-None-Match 相符則直接回應 304
+
+    頁面包含登入用戶相關的內容，因此 ETag 會納入目前用戶、網址與部署版本，
+    並以 private 快取搭配 Vary: Cookie；有待顯示的 flash 訊息時不做快取。
+    不使用 Last-Modified / If-Modified-Since：修改時間無法區分不同用戶看到的頁面
+
+    Args:
+        validator: 接收與視圖相同參數的函數，回傳會影響頁面內容的版本資訊；
+                   回傳 None 表示不做條件式處理（例如資料不存在）
+
+    Returns:
+        裝飾器
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            parts = validator(*args, **kwargs)
+            if parts is None:
+                return view(*args, **kwargs)
+
+            if current_user.is_authenticated:
+                # 導覽列顯示未讀通知數，數量改變時頁面也要重新產生
+                viewer = (current_user.id, current_user.updated_at, current_user.unread_notifications)
+            else:
+                viewer = None
+            etag = compute_etag([*parts, viewer, request.full_path, build_version()])
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add('Cookie')
+            return response
+
+        return wrapped
+
+    return decorator
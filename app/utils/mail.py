@@ -0,0 +1,63 @@
+import smtplib
+from contextlib import contextmanager
+from email.message import EmailMessage
+from typing import Iterator, Optional
+
+
+def build_message(sender: str, recipient: str, subject: str, body: str,
+                  html: Optional[str] = None) -> EmailMessage:
+    """
+    建立郵件
+
+    Args:
+        sender: 寄件者
+        recipient: 收件者
+        subject: 主旨
+        body: 純文字內容
+        html: HTML 內容（可選）
+
+    Returns:
+        EmailMessage: 郵件
+    """
+    message = EmailMessage()
+    message['From'] = sender
+    message['To'] = recipient
+    message['Subject'] = subject
+    message.set_content(body)
+    if html:
+        message.add_alternative(html, subtype='html')
+    return message
+
+
+@contextmanager
+def smtp_connection(app) -> Iterator[smtplib.SMTP]:
+    """
+    依 MAIL_* 配置開啟一條 SMTP 連線（STARTTLS、登入），離開時關閉
+    大量寄送時在同一條連線上逐封送出，不需每封重新連線與驗證
+
+    本機測試可啟動除錯用 SMTP 伺服器，例如：
+    python -m aiosmtpd -n -l localhost:1025（或 Python 3.11 以前的 python -m smtpd -n -c DebuggingServer localhost:1025）
+
+    Args:
+        app: Flask 應用程式實例
+
+    Yields:
+        smtplib.SMTP: 已連線的 SMTP 用戶端
+    """
+    config = app.config
+    if not config.get('MAIL_SERVER'):
+        raise RuntimeError('未設定 MAIL_SERVER')
+
+    client = smtplib.SMTP(config['MAIL_SERVER'], config['MAIL_PORT'],
+                          timeout=config.get('MAIL_TIMEOUT') or 30)
+    try:
+        if config.get('MAIL_USE_TLS'):
+            client.starttls()
+        if config.get('MAIL_USERNAME'):
+            client.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
+        yield client
+    finally:
+        try:
+            client.quit()
+        except (smtplib.SMTPException, OSError):
+            client.close()
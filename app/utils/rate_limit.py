@@ -0,0 +1,352 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+from flask import current_app, request
+from werkzeug.exceptions import TooManyRequests
+from app.utils.database import sqlite_file_path
+
+
+# 速率單位對應秒數
+RATE_PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+
+class RateLimitExceeded(TooManyRequests):
+    """超過請求速率限制，回應 429 並附上 Retry-After"""
+    description = '請求過於頻繁，請稍後再試'
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    解析速率字串
+
+    Args:
+        rate: 速率字串，例如 '5/minute'、'100/hour'
+
+    Returns:
+        Tuple[int, float]: (桶容量, 每秒補充的令牌數)
+    """
+    try:
+        amount, period = rate.strip().split('/')
+        capacity = int(amount)
+        seconds = RATE_PERIODS[period.strip().lower().rstrip('s')]
+    except (ValueError, KeyError):
+        raise ValueError(f"無效的速率格式: {rate}，應為 '<次數>/<second|minute|hour|day>'")
+
+    if capacity <= 0:
+        raise ValueError(f"速率次數必須大於 0: {rate}")
+
+    return capacity, capacity / seconds
+
+
+def refill_bucket(tokens: float, updated_at: float, now: float,
+                  capacity: int, refill_rate: float) -> Tuple[bool, float, float]:
+    """
+    令牌桶演算法：補充令牌後嘗試取用一個
+
+    Args:
+        tokens: 上次剩餘的令牌數
+        updated_at: 上次更新時間
+        now: 目前時間
+        capacity: 桶容量
+        refill_rate: 每秒補充的令牌數
+
+    Returns:
+        Tuple[bool, float, float]: (是否允許, 剩餘令牌數, 需等待的秒數)
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / refill_rate
+
+
+class MemoryBackend:
+    """
+    行程內的令牌桶儲存
+    僅適用於單一工作行程，多工作行程部署時各行程的計數彼此獨立
+    """
+
+    PRUNE_INTERVAL = 1000  # 每處理多少次請求清理一次已補滿的桶
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+
+    def hit(self, key: str, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        """
+        對指定鍵取用一個令牌
+
+        Args:
+            key: 限流鍵
+            capacity: 桶容量
+            refill_rate: 每秒補充的令牌數
+
+        Returns:
+            Tuple[bool, float]: (是否允許, 需等待的秒數)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at, _ = self._buckets.get(key, (capacity, now, now))
+            allowed, tokens, retry_after = refill_bucket(tokens, updated_at, now, capacity, refill_rate)
+            full_at = now + (capacity - tokens) / refill_rate
+            self._buckets[key] = (tokens, now, full_at)
+
+            self._hits += 1
+            if self._hits % self.PRUNE_INTERVAL == 0:
+                self._prune(now)
+
+        return allowed, retry_after
+
+    def _prune(self, now: float) -> None:
+        """移除已經補滿的桶，它們與不存在時的行為相同"""
+        expired = [key for key, (_, _, full_at) in self._buckets.items() if full_at <= now]
+        for key in expired:
+            del self._buckets[key]
+
+    def reset(self) -> None:
+        """清空所有計數"""
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBackend:
+    """
+    以 SQLite 檔案共享的令牌桶儲存
+    同一台機器上的多個工作行程可共用同一個檔案
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """取得目前執行緒的資料庫連線"""
+        conn = getattr(self._local, 'conn', None)
+        # 預載應用程式時，fork 出的工作行程不可沿用主行程的連線
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key: str, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        """
+        對指定鍵取用一個令牌
+
+        Args:
+            key: 限流鍵
+            capacity: 桶容量
+            refill_rate: 每秒補充的令牌數
+
+        Returns:
+            Tuple[bool, float]: (是否允許, 需等待的秒數)
+        """
+        now = time.time()
+        conn = self._connect()
+
+        # BEGIN IMMEDIATE 取得寫入鎖，確保讀取與更新之間不會被其他行程插入
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+
+            allowed, tokens, retry_after = refill_bucket(tokens, updated_at, now, capacity, refill_rate)
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return allowed, retry_after
+
+    def reset(self) -> None:
+        """清空所有計數"""
+        self._connect().execute('DELETE FROM rate_limit_buckets')
+
+
+class RedisBackend:
+    """
+    以 Redis（或相容協定的服務）共享的令牌桶儲存
+    使用 Lua 腳本在伺服器端原子地完成補充與取用
+    """
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(data[1]) or capacity
+local updated_at = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str, prefix: str = 'ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('使用 Redis 限流儲存需要安裝 redis 套件')
+
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def hit(self, key: str, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        """
+        對指定鍵取用一個令牌
+
+        Args:
+            key: 限流鍵
+            capacity: 桶容量
+            refill_rate: 每秒補充的令牌數
+
+        Returns:
+            Tuple[bool, float]: (是否允許, 需等待的秒數)
+        """
+        allowed, tokens = self._script(
+            keys=[self.prefix + key],
+            args=[capacity, refill_rate, time.time()]
+        )
+        if int(allowed):
+            return True, 0.0
+        return False, (1 - float(tokens)) / refill_rate
+
+    def reset(self) -> None:
+        """清空所有計數"""
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+
+def create_backend(url: Optional[str], instance_path: Optional[str] = None):
+    """
+    依儲存位址建立限流儲存
+
+    Args:
+        url: 'memory://'、'sqlite:///<檔案路徑>' 或 'redis://...'
+        instance_path: SQLite 相對路徑的基準目錄
+
+    Returns:
+        限流儲存實例
+    """
+    if not url or url == 'memory://':
+        return MemoryBackend()
+    if url.startswith('sqlite:///'):
+        return SQLiteBackend(sqlite_file_path(url, instance_path))
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f"不支援的限流儲存位址: {url}")
+
+
+def ip_key() -> Optional[str]:
+    """以用戶端 IP 作為限流鍵（位於反向代理之後時需設定 PROXY_FIX_X_FOR）"""
+    return request.remote_addr
+
+
+def account_key() -> Optional[str]:
+    """以表單或 JSON 中的電子郵件作為限流鍵，未提供時不限流"""
+    email = request.form.get('email')
+    if not email and request.is_json:
+        email = (request.get_json(silent=True) or {}).get('email')
+    email = (email or '').strip().lower()
+    return email or None
+
+
+class RateLimiter:
+    """
+    請求速率限制器
+    以令牌桶演算法計數，可套用在任何藍圖路由上
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.backend = MemoryBackend()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """
+        從應用程式配置載入限流設定
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        self.enabled = app.config.get('RATELIMIT_ENABLED', True)
+        self.backend = create_backend(app.config.get('RATELIMIT_STORAGE_URL'), app.instance_path)
+        app.extensions['rate_limiter'] = self
+
+    def hit(self, scope: str, key: str, rate: str) -> Tuple[bool, float]:
+        """
+        記錄一次請求並判斷是否超過限制
+
+        Args:
+            scope: 限流範圍名稱
+            key: 限流鍵（例如 IP 或帳號）
+            rate: 速率字串
+
+        Returns:
+            Tuple[bool, float]: (是否允許, 需等待的秒數)
+        """
+        capacity, refill_rate = parse_rate(rate)
+        return self.backend.hit(f'{scope}:{key}', capacity, refill_rate)
+
+    def limit(self, rate: str, key_func: Callable[[], Optional[str]] = ip_key,
+              scope: Optional[str] = None, methods: Optional[Tuple[str, ...]] = None):
+        """
+        路由限流裝飾器
+
+        Args:
+            rate: 速率字串，或存放速率字串的配置名稱
+            key_func: 取得限流鍵的函數，回傳 None 表示不限流
+            scope: 限流範圍名稱，預設為視圖函數名稱
+            methods: 需要限流的 HTTP 方法，預設全部
+
+        Returns:
+            裝飾器
+        """
+        def decorator(view):
+            limit_scope = scope or f'{view.__module__}.{view.__name__}'
+
+            @wraps(view)
+            def wrapped(*args, **kwargs):
+                if self.enabled and (methods is None or request.method in methods):
+                    key = key_func()
+                    if key is not None:
+                        allowed, retry_after = self.hit(
+                            limit_scope, key, current_app.config.get(rate, rate)
+                        )
+                        if not allowed:
+                            raise RateLimitExceeded(retry_after=math.ceil(retry_after))
+                return view(*args, **kwargs)
+
+            return wrapped
+
+        return decorator
@@ -0,0 +1,203 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional
+from werkzeug.exceptions import ServiceUnavailable
+from werkzeug.security import (
+    generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+)
+
+
+# Werkzeug 預設的 scrypt 參數 (n, r, p)
+DEFAULT_SCRYPT_PARAMS = ('32768', '8', '1')
+
+
+class HashingPoolSaturated(ServiceUnavailable):
+    """密碼雜湊工作池已滿，回應 503 並附上 Retry-After"""
+    description = '目前登入與註冊請求過多，請稍後再試'
+
+
+def normalize_hash_method(method: str) -> str:
+    """
+    將雜湊方法補齊為完整參數形式，與雜湊值前綴的格式一致
+
+    例如 'scrypt' -> 'scrypt:32768:8:1'，'pbkdf2' -> 'pbkdf2:sha256:600000'
+
+    Args:
+        method: 雜湊方法設定
+
+    Returns:
+        str: 完整的雜湊方法字串
+    """
+    name, *args = method.split(':')
+
+    if name == 'scrypt':
+        if not args:
+            args = list(DEFAULT_SCRYPT_PARAMS)
+        if len(args) != 3:
+            raise ValueError("scrypt 需要 n、r、p 三個參數，例如 'scrypt:32768:8:1'")
+    elif name == 'pbkdf2':
+        if not args:
+            args = ['sha256']
+        if len(args) == 1:
+            args.append(str(DEFAULT_PBKDF2_ITERATIONS))
+        if len(args) != 2:
+            raise ValueError("pbkdf2 格式應為 'pbkdf2:<雜湊演算法>:<迭代次數>'")
+    else:
+        raise ValueError(f"不支援的密碼雜湊方法: {name}")
+
+    return ':'.join([name, *args])
+
+
+class PasswordHasher:
+    """
+    密碼雜湊管理器
+    依照應用程式配置決定雜湊方法與成本，並判斷舊雜湊是否需要升級
+
+    啟用 PASSWORD_HASH_EXECUTOR 時，雜湊運算交由有上限的行程池執行，
+    等待中的工作超過上限時直接拋出 HashingPoolSaturated，而不是佔住請求執行緒
+    """
+
+    DEFAULT_METHOD = 'scrypt'
+    DEFAULT_SALT_LENGTH = 16
+    DEFAULT_TIMEOUT = 10
+    DEFAULT_RETRY_AFTER = 1
+
+    def __init__(self, app=None):
+        self.method = normalize_hash_method(self.DEFAULT_METHOD)
+        self.salt_length = self.DEFAULT_SALT_LENGTH
+
+        # 行程池設定
+        self.use_executor = False
+        self.workers = os.cpu_count() or 1
+        self.queue_size = self.workers * 2
+        self.timeout = self.DEFAULT_TIMEOUT
+        self.retry_after = self.DEFAULT_RETRY_AFTER
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._executor_lock = threading.Lock()
+        self._slots: Optional[threading.BoundedSemaphore] = None
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """
+        從應用程式配置載入雜湊參數
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        self.method = normalize_hash_method(
+            app.config.get('PASSWORD_HASH_METHOD') or self.DEFAULT_METHOD
+        )
+        self.salt_length = app.config.get('PASSWORD_SALT_LENGTH') or self.DEFAULT_SALT_LENGTH
+
+        self.use_executor = bool(app.config.get('PASSWORD_HASH_EXECUTOR'))
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS') or os.cpu_count() or 1
+        self.queue_size = app.config.get('PASSWORD_HASH_QUEUE_SIZE')
+        if self.queue_size is None:
+            self.queue_size = self.workers * 2
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT') or self.DEFAULT_TIMEOUT
+        self.retry_after = app.config.get('PASSWORD_HASH_RETRY_AFTER') or self.DEFAULT_RETRY_AFTER
+
+        # 同時進行中的工作上限 = 工作行程數 + 排隊數
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self.shutdown()
+
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        取得行程池，首次使用時才建立
+        若目前行程是由預載的主行程 fork 而來，則重新建立屬於自己的行程池
+
+        Returns:
+            ProcessPoolExecutor: 行程池
+        """
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, func, *args):
+        """
+        執行雜湊運算，啟用行程池時交由行程池處理
+
+        Args:
+            func: 雜湊函數
+            *args: 函數參數
+
+        Returns:
+            雜湊函數的回傳值
+        """
+        if not self.use_executor:
+            return func(*args)
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingPoolSaturated(retry_after=self.retry_after)
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+
+        # 工作完成（包含逾時後才完成）時才釋放名額
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingPoolSaturated(retry_after=self.retry_after)
+
+    def shutdown(self) -> None:
+        """關閉行程池（若已建立）"""
+        with self._executor_lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._executor_pid = None
+
+    def hash(self, password: str) -> str:
+        """
+        以目前配置產生密碼雜湊
+
+        Args:
+            password: 原始密碼
+
+        Returns:
+            str: 密碼雜湊
+        """
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        """
+        驗證密碼，雜湊值本身記錄了當初使用的方法與成本
+
+        Args:
+            pwhash: 已儲存的密碼雜湊
+            password: 待驗證的密碼
+
+        Returns:
+            bool: 密碼是否正確
+        """
+        if not pwhash:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """
+        檢查雜湊是否使用了與目前配置不同的方法或成本
+
+        Args:
+            pwhash: 已儲存的密碼雜湊
+
+        Returns:
+            bool: 是否需要重新雜湊
+        """
+        if not pwhash or '$' not in pwhash:
+            return True
+        return pwhash.split('$', 1)[0] != self.method
@@ -0,0 +1,119 @@
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+# 在子行程中建立應用程式並輸出各步驟耗時（搭配 python -X importtime 執行）
+PROFILE_SCRIPT = '''
+import json, sys, time
+before = set(sys.modules)
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+modules = sorted(set(sys.modules) - before)
+flask_app = app.create_app()
+steps = [{'name': 'import app', 'seconds': imported - started, 'modules': modules}]
+steps += flask_app.extensions['startup'].steps
+print(json.dumps({'total': time.perf_counter() - started, 'steps': steps}))
+'''
+
+
+class StartupProfiler:
+    """
+    記錄 create_app 各步驟（擴展初始化、藍圖註冊、建立資料表）的耗時，
+    以及每個步驟中第一次匯入的模組
+    """
+
+    def __init__(self):
+        self.steps: List[Dict] = []
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        記錄一個步驟
+
+        Args:
+            name: 步驟名稱，例如 extension:db、blueprint:main_bp
+        """
+        before = set(sys.modules)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({
+                'name': name,
+                'seconds': time.perf_counter() - started,
+                'modules': sorted(set(sys.modules) - before),
+            })
+
+
+def parse_importtime(output: str) -> Dict[str, float]:
+    """
+    解析 python -X importtime 的輸出
+
+    Args:
+        output: 標準錯誤輸出
+
+    Returns:
+        Dict[str, float]: 模組名稱 -> 匯入自身耗時（秒，不含其匯入的其他模組）
+    """
+    costs = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        try:
+            self_us = int(parts[0])
+        except ValueError:
+            continue  # 標題列
+        costs[parts[2].strip()] = self_us / 1_000_000
+    return costs
+
+
+def package_of(module: str) -> str:
+    """
+    模組歸屬的套件：第三方套件取最上層名稱，本專案取前兩層（例如 app.services）
+
+    Args:
+        module: 模組名稱
+
+    Returns:
+        str: 套件名稱
+    """
+    parts = module.split('.')
+    return '.'.join(parts[:2]) if parts[0] == 'app' else parts[0]
+
+
+def profile_startup(env: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    在新的 Python 行程中建立應用程式並量測啟動耗時
+
+    Args:
+        env: 子行程的環境變數，預設沿用目前環境
+
+    Returns:
+        Dict: total（秒）、steps（名稱、耗時、匯入耗時、模組數）、packages（套件 -> 匯入耗時）
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT],
+        capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else '應用程式建立失敗')
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    costs = parse_importtime(result.stderr)
+
+    packages = defaultdict(float)
+    for step in report['steps']:
+        step['import_seconds'] = sum(costs.get(module, 0.0) for module in step['modules'])
+        for module in step['modules']:
+            packages[package_of(module)] += costs.get(module, 0.0)
+        step['module_count'] = len(step.pop('modules'))
+
+    report['packages'] = dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+    return report
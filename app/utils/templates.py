@@ -0,0 +1,76 @@
+import os
+from typing import List, Optional
+from jinja2 import Environment, FileSystemBytecodeCache
+
+
+# 預設的 Jinja 位元組碼快取目錄（相對於 Flask instance 資料夾）
+BYTECODE_CACHE_FOLDER = 'jinja_cache'
+
+
+def list_html_templates(env: Environment) -> List[str]:
+    """
+    列出所有 HTML 模板（包含藍圖的模板資料夾）
+
+    Args:
+        env: Jinja 環境
+
+    Returns:
+        List[str]: 模板名稱
+    """
+    return [name for name in env.list_templates() if name.endswith('.html')]
+
+
+def bytecode_cache_dir(app) -> str:
+    """
+    取得位元組碼快取目錄，未設定 TEMPLATE_BYTECODE_CACHE_DIR 時使用 instance/jinja_cache
+
+    Args:
+        app: Flask 應用程式實例
+
+    Returns:
+        str: 目錄路徑
+    """
+    return app.config.get('TEMPLATE_BYTECODE_CACHE_DIR') or \
+        os.path.join(app.instance_path, BYTECODE_CACHE_FOLDER)
+
+
+def create_bytecode_cache(app) -> Optional[FileSystemBytecodeCache]:
+    """
+    依配置建立檔案系統位元組碼快取
+
+    Args:
+        app: Flask 應用程式實例
+
+    Returns:
+        Optional[FileSystemBytecodeCache]: 未啟用 TEMPLATE_BYTECODE_CACHE 時為 None
+    """
+    if not app.config.get('TEMPLATE_BYTECODE_CACHE'):
+        return None
+
+    directory = bytecode_cache_dir(app)
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory)
+
+
+def precompile_templates(env: Environment, cache: FileSystemBytecodeCache) -> int:
+    """
+    編譯所有模板並寫入位元組碼快取（不論快取是否已存在，一律重新編譯）
+
+    快取以模板原始碼的雜湊驗證，模板修改後舊的快取會自動失效；
+    Python 或 Jinja 版本不同時也會重新編譯
+
+    Args:
+        env: Jinja 環境
+        cache: 位元組碼快取
+
+    Returns:
+        int: 編譯的模板數
+    """
+    names = list_html_templates(env)
+    for name in names:
+        source, filename, _ = env.loader.get_source(env, name)
+        bucket = cache.get_bucket(env, name, filename, source)
+        bucket.code = env.compile(source, name, filename)
+        cache.set_bucket(bucket)
+    return len(names)
+
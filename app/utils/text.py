@@ -0,0 +1,106 @@
+import re
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+from markupsafe import escape
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+
+# Markdown 連結與圖片允許的網址協定
+SAFE_URL_SCHEMES = ('', 'http', 'https', 'mailto')
+
+# markdown.Markdown 在 convert() 之間保存狀態，不能跨執行緒共用，每個執行緒各建立一個
+_markdown_local = threading.local()
+
+
+def nl2br(text: Optional[str]) -> str:
+    """
+    跳脫 HTML 並將換行轉為 <br> 標籤
+
+    Args:
+        text: 純文字內容
+
+    Returns:
+        str: 可直接輸出的 HTML
+    """
+    if not text:
+        return ''
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return str(escape(text)).replace('\n', '<br>\n')
+
+
+def _get_markdown_renderer():
+    """
+    取得目前執行緒的 Markdown 轉換器（每個執行緒只建立一次）
+
+    停用原始 HTML 區塊與行內 HTML，使用者輸入的標籤會被跳脫；
+    並移除非 http(s)/mailto 協定的連結與圖片網址
+    """
+    renderer = getattr(_markdown_local, 'renderer', None)
+    if renderer is not None:
+        return renderer
+
+    from markdown.treeprocessors import Treeprocessor
+
+    class SafeUrlTreeprocessor(Treeprocessor):
+        """移除不安全的連結與圖片網址（例如 javascript:）"""
+
+        def run(self, root):
+            for element in root.iter():
+                for attribute in ('href', 'src'):
+                    value = element.get(attribute)
+                    if value is not None and urlsplit(value.strip()).scheme.lower() not in SAFE_URL_SCHEMES:
+                        element.set(attribute, '')
+
+    renderer = markdown.Markdown(extensions=['fenced_code', 'nl2br', 'sane_lists'])
+    renderer.preprocessors.deregister('html_block')
+    renderer.inlinePatterns.deregister('html')
+    renderer.treeprocessors.register(SafeUrlTreeprocessor(renderer), 'safe_url', 0)
+
+    _markdown_local.renderer = renderer
+    return renderer
+
+
+def render_content(text: Optional[str], use_markdown: bool = False) -> str:
+    """
+    將用戶輸入的內容轉為 HTML
+
+    Args:
+        text: 純文字內容
+        use_markdown: 是否以 Markdown 轉換（未安裝 markdown 套件時退回純文字）
+
+    Returns:
+        str: 已跳脫、可直接輸出的 HTML
+    """
+    if not text:
+        return ''
+    if use_markdown and markdown is not None:
+        renderer = _get_markdown_renderer()
+        try:
+            return renderer.reset().convert(text)
+        finally:
+            renderer.reset()
+    return nl2br(text)
+
+
+def make_excerpt(text: Optional[str], length: int) -> str:
+    """
+    產生摘要：合併空白後截斷，超過長度時加上省略號
+
+    Args:
+        text: 純文字內容
+        length: 摘要長度上限（不含省略號）
+
+    Returns:
+        str: 摘要
+    """
+    if not text:
+        return ''
+    text = re.sub(r'\s+', ' ', text).strip()
+    if len(text) <= length:
+        return text
+    return text[:length].rstrip() + '…'
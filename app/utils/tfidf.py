@@ -0,0 +1,362 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+
+# 英數字單字與中日韓文字的連續片段
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+
+# 批次計算相似度時，每批分數矩陣（批次大小 x 文件數）的元素上限
+BLOCK_ELEMENTS = 4_000_000
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    斷詞：英數字以單字為詞（至少兩個字元），中文以相鄰兩字（bigram）為詞，不需額外的斷詞套件
+
+    Args:
+        text: 文字
+
+    Returns:
+        List[str]: 詞列表
+    """
+    tokens = []
+    for chunk in TOKEN_PATTERN.findall(text.lower()):
+        if chunk.isascii():
+            if len(chunk) > 1:
+                tokens.append(chunk)
+        elif len(chunk) == 1:
+            tokens.append(chunk)
+        else:
+            tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+    return tokens
+
+
+def concat_ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    將多個區間 [start, start + length) 展開並串接成一個索引陣列（不使用 Python 迴圈）
+
+    Args:
+        starts: 各區間的起點
+        lengths: 各區間的長度
+
+    Returns:
+        np.ndarray: 索引陣列
+    """
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+    return np.repeat(starts - offsets, lengths) + np.arange(total)
+
+
+class TfidfIndex:
+    """
+    以 NumPy 陣列實作的稀疏 TF-IDF 索引
+
+    - 文件向量以 CSR（indptr / indices / data）儲存，詞頻取 1 + log(tf)、乘上平滑 IDF 後
+      每篇只保留權重最高的 max_terms 個詞並做 L2 正規化，內積即為餘弦相似度
+    - 另以 CSC（依詞排序的倒排表）計算相似度：查詢向量的每個詞取出其倒排表，
+      以 np.bincount 一次累加到各文件的分數
+    - 建立後新增或修改的文件放在 extra 中個別比對，原本的列以 removed 遮罩排除，定期重建時併入；
+      IDF 與常用詞沿用建立時的統計，重建前的分數只是近似值，與重建後的結果會略有差異
+    - 寫入（upsert、remove）需由呼叫端依序執行；查詢使用 extra 與 removed 的快照，可與寫入並行
+    """
+
+    def __init__(self, ids: List[int], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 vocabulary: Dict[str, int], idf: np.ndarray, common: np.ndarray, max_terms: int):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.common = common
+        self.max_terms = max_terms
+        self.removed = np.zeros(len(ids), dtype=bool)
+        self.extra: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+        # 倒排表（CSC）
+        n_terms = len(idf)
+        order = np.argsort(indices, kind='stable')
+        row_of_entry = np.repeat(np.arange(len(ids), dtype=np.int64), np.diff(indptr))
+        self.term_rows = row_of_entry[order]
+        self.term_data = data[order]
+        self.term_indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n_terms), out=self.term_indptr[1:])
+
+    @property
+    def size(self) -> int:
+        """索引中的文件數"""
+        return len(self.rows) - int(self.removed.sum()) + len(self.extra)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[int, str]], max_terms: int = 32,
+              max_df: float = 0.5) -> 'TfidfIndex':
+        """
+        建立索引
+
+        Args:
+            documents: (文件ID, 文字)
+            max_terms: 每篇文件保留的詞數
+            max_df: 出現在超過此比例文件中的詞視為常用詞而忽略（至少需出現在 3 篇以上）
+
+        Returns:
+            TfidfIndex: 索引
+        """
+        vocabulary: Dict[str, int] = {}
+        ids, terms, counts = [], [], []
+        for doc_id, text in documents:
+            tokens = Counter(tokenize(text))
+            ids.append(doc_id)
+            terms.append(np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in tokens),
+                                     dtype=np.int64, count=len(tokens)))
+            counts.append(np.fromiter(tokens.values(), dtype=np.float64, count=len(tokens)))
+
+        n_docs = len(ids)
+        lengths = np.fromiter((len(row) for row in terms), dtype=np.int64, count=n_docs)
+        indices = np.concatenate(terms) if n_docs else np.zeros(0, dtype=np.int64)
+        tf = np.concatenate(counts) if n_docs else np.zeros(0)
+        rows = np.repeat(np.arange(n_docs, dtype=np.int64), lengths)
+
+        df = np.bincount(indices, minlength=len(vocabulary))
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        common = df > max(2, max_df * n_docs)
+
+        weights = (1 + np.log(tf)) * idf[indices]
+        weights[common[indices]] = 0
+        rows, indices, weights = cls._prune(rows, indices, weights, max_terms)
+
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_docs), out=indptr[1:])
+        return cls(ids, indptr, indices, weights, vocabulary, idf, common, max_terms)
+
+    @staticmethod
+    def _prune(rows: np.ndarray, indices: np.ndarray, weights: np.ndarray,
+               max_terms: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """每列保留權重最高的 max_terms 個非零項並做 L2 正規化（結果依列排序）"""
+        order = np.lexsort((-weights, rows))
+        rows, indices, weights = rows[order], indices[order], weights[order]
+        if len(rows):
+            first = np.r_[0, np.flatnonzero(np.diff(rows)) + 1]
+            rank = np.arange(len(rows)) - np.repeat(first, np.diff(np.r_[first, len(rows)]))
+        else:
+            rank = np.zeros(0, dtype=np.int64)
+        keep = (rank < max_terms) & (weights > 0)
+        rows, indices, weights = rows[keep], indices[keep], weights[keep]
+
+        norms = np.sqrt(np.bincount(rows, weights=weights ** 2))
+        if len(rows):
+            weights = weights / norms[rows]
+        return rows, indices, weights
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        以建立時的 IDF 將文字轉為正規化的稀疏向量，新詞加入詞彙表（倒排表中沒有這些詞）
+
+        Args:
+            text: 文字
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (詞ID（已排序）, 權重)
+        """
+        tokens = Counter(tokenize(text))
+        indices = np.fromiter((self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokens),
+                              dtype=np.int64, count=len(tokens))
+        tf = np.fromiter(tokens.values(), dtype=np.float64, count=len(tokens))
+
+        known = indices < len(self.idf)
+        idf = np.full(len(indices), np.log(1 + len(self.ids)) + 1)  # 新詞視為 df = 0
+        idf[known] = self.idf[indices[known]]
+        weights = (1 + np.log(tf)) * idf
+        common = np.zeros(len(indices), dtype=bool)
+        common[known] = self.common[indices[known]]
+        weights[common] = 0
+
+        _, indices, weights = self._prune(np.zeros(len(indices), dtype=np.int64), indices, weights, self.max_terms)
+        order = np.argsort(indices)
+        return indices[order], weights[order]
+
+    def _block_scores(self, indices: np.ndarray, weights: np.ndarray, owners: np.ndarray,
+                      n_queries: int, removed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        計算多個查詢向量與索引中每篇文件的內積
+
+        Args:
+            indices: 查詢向量的詞ID（所有查詢串接）
+            weights: 對應的權重
+            owners: 每個項目屬於第幾個查詢
+            n_queries: 查詢數
+            removed: 排除的列（預設為目前的 removed 遮罩）
+
+        Returns:
+            np.ndarray: 分數矩陣（查詢數 x 文件數）
+        """
+        n_docs = len(self.ids)
+        indexed = indices < len(self.term_indptr) - 1
+        indices, weights, owners = indices[indexed], weights[indexed], owners[indexed]
+
+        starts = self.term_indptr[indices]
+        lengths = self.term_indptr[indices + 1] - starts
+        positions = concat_ranges(starts, lengths)
+        targets = np.repeat(owners, lengths) * n_docs + self.term_rows[positions]
+        values = np.repeat(weights, lengths) * self.term_data[positions]
+
+        scores = np.bincount(targets, weights=values, minlength=n_queries * n_docs)
+        scores = scores.reshape(n_queries, n_docs)
+        scores[:, self.removed if removed is None else removed] = 0
+        return scores
+
+    @staticmethod
+    def _top(scores: np.ndarray, ids: np.ndarray, k: int, min_score: float) -> List[Tuple[int, float]]:
+        """取分數最高的 k 個（分數需大於 min_score）"""
+        if len(scores) > k:
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(ids[i]), float(scores[i])) for i in candidates if scores[i] > min_score]
+
+    @staticmethod
+    def _dot(indices: np.ndarray, weights: np.ndarray,
+             other_indices: np.ndarray, other_weights: np.ndarray) -> float:
+        """兩個稀疏向量（詞ID已排序）的內積"""
+        common = np.intersect1d(indices, other_indices, assume_unique=True)
+        return float(np.dot(weights[np.searchsorted(indices, common)],
+                            other_weights[np.searchsorted(other_indices, common)]))
+
+    def vector(self, doc_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        取得索引中文件的向量
+
+        Args:
+            doc_id: 文件ID
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: (詞ID（已排序）, 權重)，不在索引中時為 None
+        """
+        vector = self.extra.get(doc_id)
+        if vector is not None:
+            return vector
+        row = self.rows.get(doc_id)
+        if row is None or self.removed[row]:
+            return None
+        lo, hi = self.indptr[row], self.indptr[row + 1]
+        order = np.argsort(self.indices[lo:hi])
+        return self.indices[lo:hi][order], self.data[lo:hi][order]
+
+    def similar(self, indices: np.ndarray, weights: np.ndarray, k: int,
+                exclude_id: Optional[int] = None, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """
+        找出與查詢向量最相似的文件
+
+        Args:
+            indices: 查詢向量的詞ID（已排序）
+            weights: 權重
+            k: 數量
+            exclude_id: 排除的文件ID（查詢文件本身）
+            min_score: 最低相似度
+
+        Returns:
+            List[Tuple[int, float]]: (文件ID, 相似度)，由高到低
+        """
+        return self.similar_many([(indices, weights)], k, [exclude_id], min_score)[0]
+
+    def similar_many(self, vectors: List[Tuple[np.ndarray, np.ndarray]], k: int,
+                     exclude_ids: Optional[List[Optional[int]]] = None,
+                     min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """
+        分批找出與多個查詢向量最相似的文件（同一次呼叫的分數以同一份 IDF 計算，可互相比較）
+
+        Args:
+            vectors: 查詢向量 (詞ID（已排序）, 權重)
+            k: 每個查詢的數量
+            exclude_ids: 每個查詢排除的文件ID（查詢文件本身）
+            min_score: 最低相似度
+
+        Returns:
+            List[List[Tuple[int, float]]]: 依查詢順序的 (文件ID, 相似度)，由高到低
+        """
+        # 查詢不持有鎖，先取得 extra 與 removed 的快照，計算期間的寫入不影響這次的結果
+        extra = dict(self.extra)
+        removed = self.removed.copy()
+        ids = self.ids
+        if extra:
+            ids = np.concatenate([ids, np.fromiter(extra.keys(), dtype=np.int64, count=len(extra))])
+
+        results = []
+        block = max(1, min(256, BLOCK_ELEMENTS // max(1, len(self.ids))))
+        for start in range(0, len(vectors), block):
+            chunk = vectors[start:start + block]
+            lengths = np.fromiter((len(indices) for indices, _ in chunk), dtype=np.int64, count=len(chunk))
+            owners = np.repeat(np.arange(len(chunk), dtype=np.int64), lengths)
+            scores = self._block_scores(np.concatenate([indices for indices, _ in chunk]),
+                                        np.concatenate([weights for _, weights in chunk]),
+                                        owners, len(chunk), removed)
+            if extra:
+                # 建立後新增或修改的文件不在倒排表中，個別計算內積
+                extra_scores = np.array([[self._dot(indices, weights, *other) for other in extra.values()]
+                                         for indices, weights in chunk])
+                scores = np.hstack([scores, extra_scores])
+
+            for offset, row_scores in enumerate(scores):
+                exclude_id = exclude_ids[start + offset] if exclude_ids is not None else None
+                if exclude_id is not None:
+                    row_scores[ids == exclude_id] = 0
+                results.append(self._top(row_scores, ids, k, min_score))
+        return results
+
+    def upsert(self, doc_id: int, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        新增或更新文件
+
+        Args:
+            doc_id: 文件ID
+            text: 文字
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 文件向量 (詞ID, 權重)
+        """
+        row = self.rows.get(doc_id)
+        if row is not None:
+            self.removed[row] = True
+        vector = self.vectorize(text)
+        self.extra[doc_id] = vector
+        return vector
+
+    def remove(self, doc_id: int) -> None:
+        """
+        移除文件
+
+        Args:
+            doc_id: 文件ID
+        """
+        row = self.rows.get(doc_id)
+        if row is not None:
+            self.removed[row] = True
+        self.extra.pop(doc_id, None)
+
+    def iter_top_k(self, k: int, min_score: float = 0.0) -> Iterator[Tuple[int, List[Tuple[int, float]]]]:
+        """
+        分批計算每篇文件最相似的 k 篇文件（只包含建立時的文件）
+
+        Args:
+            k: 數量
+            min_score: 最低相似度
+
+        Yields:
+            Tuple[int, List[Tuple[int, float]]]: (文件ID, [(相似文件ID, 相似度)])
+        """
+        n_docs = len(self.ids)
+        block = max(1, min(256, BLOCK_ELEMENTS // max(1, n_docs)))
+        for start in range(0, n_docs, block):
+            stop = min(start + block, n_docs)
+            lo, hi = self.indptr[start], self.indptr[stop]
+            owners = np.repeat(np.arange(stop - start, dtype=np.int64), np.diff(self.indptr[start:stop + 1]))
+            scores = self._block_scores(self.indices[lo:hi], self.data[lo:hi], owners, stop - start)
+            scores[np.arange(stop - start), np.arange(start, stop)] = 0  # 排除自己
+            for offset, row_scores in enumerate(scores):
+                if not self.removed[start + offset]:
+                    yield int(self.ids[start + offset]), self._top(row_scores, self.ids, k, min_score)
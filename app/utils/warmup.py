@@ -0,0 +1,224 @@
+import importlib
+import time
+from typing import Dict, List, Optional
+from flask import current_app
+
+
+class Warmup:
+    """
+    工作行程預熱
+
+    - preload(): 在預載應用程式的主行程執行（fork 前），編譯所有模板、匯入延遲載入的模組
+      （WARMUP_IMPORTS）並建立用戶名可用性過濾器，工作行程以 copy-on-write 共用
+    - reset_after_fork(): fork 後丟棄從主行程繼承的資料庫連線（不關閉，避免影響主行程）
+    - run(): 在每個工作行程開始處理請求前執行，建立連線池連線並請求常用頁面，
+      預先產生 SQLAlchemy 查詢編譯快取與各項行程內快取
+    - ready: 預熱完成前 /readyz 回應 503（WARMUP_REQUIRED 為 False 時一律視為就緒）
+    """
+
+    def __init__(self, app=None):
+        self.required = False
+        self.ready = False
+        self.report: Dict = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """
+        從應用程式配置載入預熱設定
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        self.required = bool(app.config.get('WARMUP_REQUIRED'))
+        self.ready = False
+        self.report = {}
+        app.extensions['warmup'] = self
+
+    @property
+    def is_ready(self) -> bool:
+        """是否可以接收流量"""
+        return self.ready or not self.required
+
+    @staticmethod
+    def compile_templates(app) -> int:
+        """
+        編譯所有模板並放入 Jinja 快取
+
+        Args:
+            app: Flask 應用程式實例
+
+        Returns:
+            int: 編譯的模板數
+        """
+        from app.utils.templates import list_html_templates
+
+        env = app.jinja_env
+        names = list_html_templates(env)
+        # 快取大小需容納所有模板，否則預熱的結果會被淘汰
+        if env.cache is not None and getattr(env.cache, 'capacity', 0) < len(names):
+            from jinja2.utils import LRUCache
+            env.cache = LRUCache(len(names) * 2)
+
+        for name in names:
+            env.get_template(name)
+        return len(names)
+
+    @staticmethod
+    def import_modules(app) -> List[str]:
+        """
+        匯入延遲載入的模組（例如 numpy、PIL.Image），避免第一個用到的請求負擔匯入成本
+
+        Args:
+            app: Flask 應用程式實例
+
+        Returns:
+            List[str]: 已匯入的模組
+        """
+        imported = []
+        for name in app.config.get('WARMUP_IMPORTS') or []:
+            try:
+                importlib.import_module(name)
+                imported.append(name)
+            except ImportError as e:
+                app.logger.warning(f"Cannot preload module {name}: {str(e)}")
+        return imported
+
+    @staticmethod
+    def build_filters(app) -> None:
+        """
+        建立用戶名與電子郵件可用性過濾器（不再於 create_app 中建立）
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        from app.services import AvailabilityService
+
+        with app.app_context():
+            AvailabilityService.rebuild()
+
+    @staticmethod
+    def open_connections(app) -> int:
+        """
+        同時借出連線池大小的連線後歸還，讓工作行程一開始就有可用的連線
+
+        Args:
+            app: Flask 應用程式實例
+
+        Returns:
+            int: 建立的連線數
+        """
+        from sqlalchemy import text
+        from app import db
+
+        limit = app.config.get('WARMUP_DB_CONNECTIONS') or 1
+        opened = 0
+        with app.app_context():
+            for engine in db.engines.values():
+                size = getattr(engine.pool, 'size', lambda: 1)()
+                connections = []
+                try:
+                    for _ in range(max(1, min(limit, size))):
+                        connection = engine.connect()
+                        connection.execute(text('SELECT 1'))
+                        connections.append(connection)
+                finally:
+                    for connection in connections:
+                        connection.close()
+                opened += len(connections)
+        return opened
+
+    @staticmethod
+    def request_paths(app, paths: List[str]) -> Dict[str, int]:
+        """
+        以測試用戶端請求常用頁面
+
+        Args:
+            app: Flask 應用程式實例
+            paths: 請求路徑
+
+        Returns:
+            Dict[str, int]: 路徑 -> 狀態碼
+        """
+        client = app.test_client()
+        statuses = {}
+        for path in paths:
+            response = client.get(path)
+            statuses[path] = response.status_code
+            response.close()
+        return statuses
+
+    def preload(self, app) -> None:
+        """
+        在主行程中執行的預熱（fork 前）
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        started = time.perf_counter()
+        templates = self.compile_templates(app)
+        modules = self.import_modules(app)
+        try:
+            self.build_filters(app)
+            self.report['filters'] = True
+        except Exception as e:
+            # 例如尚未執行 `flask db upgrade`，由工作行程於第一次使用時再建立
+            app.logger.error(f"Error building availability filters: {str(e)}")
+
+        self.report['preload'] = {
+            'templates': templates,
+            'modules': modules,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+        app.logger.info(f"Preloaded {templates} templates and {len(modules)} modules")
+
+    @staticmethod
+    def reset_after_fork(app) -> None:
+        """
+        fork 後丟棄從主行程繼承的資料庫連線
+
+        Args:
+            app: Flask 應用程式實例
+        """
+        from app import db
+
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+    def run(self, app, paths: Optional[List[str]] = None) -> Dict:
+        """
+        在工作行程開始處理請求前執行的預熱，完成後標記為就緒
+        預熱失敗時記錄錯誤並仍標記為就緒，避免工作行程永遠無法接收流量
+
+        Args:
+            app: Flask 應用程式實例
+            paths: 要請求的路徑，預設使用 WARMUP_PATHS
+
+        Returns:
+            Dict: 預熱結果
+        """
+        started = time.perf_counter()
+        try:
+            if 'preload' not in self.report:
+                self.report['templates'] = self.compile_templates(app)
+                self.report['modules'] = self.import_modules(app)
+            if not self.report.get('filters'):
+                self.build_filters(app)
+                self.report['filters'] = True
+            self.report['connections'] = self.open_connections(app)
+            paths = paths if paths is not None else app.config.get('WARMUP_PATHS') or []
+            self.report['paths'] = self.request_paths(app, paths)
+        except Exception as e:
+            app.logger.error(f"Error warming up worker: {str(e)}")
+            self.report['error'] = str(e)
+
+        self.report['seconds'] = round(time.perf_counter() - started, 3)
+        self.ready = True
+        app.logger.info(f"Worker warmed up in {self.report['seconds']}s")
+        return self.report
+
+
+def get_warmup() -> Warmup:
+    """取得目前應用程式的預熱管理器"""
+    return current_app.extensions['warmup']
@@ -0,0 +1,152 @@
+"""
+管理後台分析基準測試
+
+建立含大量文章、留言與按讚的暫存資料庫，比較：
+- 以 ORM 物件逐筆計算（每日活動數與貢獻排行）
+- AnalyticsService（串流讀取整數欄位後以 NumPy 向量化計算）
+並分別在 (created_at, user_id) 複合索引與只有 created_at 單欄索引下執行，
+觀察覆蓋索引對範圍掃描的影響。
+
+用法:
+    python benchmarks/bench_analytics.py
+    python benchmarks/bench_analytics.py --likes 1000000 --days 90 -n 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config  # noqa: E402
+
+# 模型定義的複合索引 -> 對照組的單欄索引
+INDEXES = {
+    'post': 'ix_post_created_at_user_id',
+    'comment': 'ix_comment_created_at_user_id',
+    'likes': 'ix_likes_created_at_user_id',
+}
+
+
+def seed(db, users: int, likes: int, span_days: int) -> None:
+    """建立測試資料：文章與留言數量分別為按讚數的 1/20 與 1/5，時間平均分布於 span_days 天內"""
+    from sqlalchemy import insert
+    from app.models import User, Post, Comment, Like
+
+    rng = random.Random(42)
+    now = datetime.now()
+
+    def moment():
+        return now - timedelta(seconds=rng.randrange(span_days * 86400))
+
+    db.session.execute(insert(User), [{
+        'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x', 'created_at': moment()
+    } for i in range(users)])
+
+    post_count = max(1, likes // 20)
+    db.session.execute(insert(Post), [{
+        'title': f'文章 {i}', 'content': 'x', 'user_id': rng.randint(1, users), 'created_at': moment()
+    } for i in range(post_count)])
+
+    comments = likes // 5
+    for offset in range(0, comments, 50000):
+        db.session.execute(insert(Comment), [{
+            'content': 'x', 'user_id': rng.randint(1, users), 'post_id': rng.randint(1, post_count),
+            'created_at': moment()
+        } for _ in range(min(50000, comments - offset))])
+
+    # 同一用戶對同一文章只能按讚一次，從所有 (用戶, 文章) 組合中不重複抽樣
+    pairs = rng.sample(range(users * post_count), min(likes, users * post_count))
+    for offset in range(0, len(pairs), 50000):
+        db.session.execute(insert(Like), [{
+            'user_id': pair // post_count + 1, 'post_id': pair % post_count + 1, 'created_at': moment()
+        } for pair in pairs[offset:offset + 50000]])
+    db.session.commit()
+
+
+def orm_dashboard(days: int) -> dict:
+    """對照組：載入 ORM 物件後以 Python 計算每日數量與貢獻排行"""
+    from app.models import Post, Comment, Like
+    from app.services import AnalyticsService
+
+    since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
+    daily = {}
+    scores = Counter()
+    for name, model in (('posts', Post), ('comments', Comment), ('likes', Like)):
+        counts = Counter()
+        for obj in model.query.filter(model.created_at >= since):
+            counts[(obj.created_at - since).days] += 1
+            scores[obj.user_id] += AnalyticsService.CONTRIBUTION_WEIGHTS[name]
+        daily[name] = [counts.get(day, 0) for day in range(days)]
+    return {'daily': daily, 'top': scores.most_common(AnalyticsService.TOP_CONTRIBUTORS)}
+
+
+def numpy_dashboard(days: int) -> dict:
+    """AnalyticsService（清除快取後計算）"""
+    from app.services import AnalyticsService
+
+    AnalyticsService._cache.clear()
+    return AnalyticsService.get_dashboard(days)
+
+
+def measure(db, func, days: int, iterations: int) -> float:
+    """平均耗時（秒）"""
+    func(days)
+    db.session.expunge_all()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(days)
+        db.session.expunge_all()
+    return (time.perf_counter() - start) / iterations
+
+
+def use_single_column_indexes(db) -> None:
+    """將複合索引換成只有 created_at 的單欄索引"""
+    from sqlalchemy import text
+
+    with db.engine.begin() as connection:
+        for table, name in INDEXES.items():
+            connection.execute(text(f'DROP INDEX {name}'))
+            connection.execute(text(f'CREATE INDEX ix_{table}_created_at ON {table} (created_at)'))
+            connection.execute(text(f'ANALYZE {table}'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='管理後台分析基準測試')
+    parser.add_argument('--users', type=int, default=5000, help='用戶數')
+    parser.add_argument('--likes', type=int, default=200000, help='按讚數')
+    parser.add_argument('--span', type=int, default=365, help='資料分布的天數')
+    parser.add_argument('--days', type=int, default=90, help='分析的時間範圍（天）')
+    parser.add_argument('-n', '--iterations', type=int, default=3, help='每種計算的執行次數')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(folder, 'bench.db')
+            RATELIMIT_ENABLED = False
+
+        from app import create_app, db
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            seed(db, args.users, args.likes, args.span)
+
+            print(f"用戶 {args.users}，按讚 {args.likes}，分析最近 {args.days} 天")
+            print(f"{'計算方式':<28}{'秒/次':>10}")
+            for label in ('複合索引', '單欄索引'):
+                if label == '單欄索引':
+                    use_single_column_indexes(db)
+                for name, func in (('ORM 物件', orm_dashboard), ('NumPy', numpy_dashboard)):
+                    seconds = measure(db, func, args.days, args.iterations)
+                    print(f"{f'{name}（{label}）':<28}{seconds:>10.3f}")
+
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+WSGI 與 ASGI 模式並行請求基準測試
+
+建立暫存資料庫後分別啟動三種伺服器，以不同並行數請求 API 文章列表：
+
+- wsgi:          Werkzeug 多執行緒伺服器（run.py 的方式）
+- asgi-fallback: uvicorn + app.asgi，停用非同步端點（全部在執行緒池中交給 Flask）
+- asgi:          uvicorn + app.asgi，API 唯讀端點使用非同步引擎
+
+需要安裝 uvicorn、aiosqlite 與 httpx。
+
+用法:
+    python benchmarks/bench_asgi.py
+    python benchmarks/bench_asgi.py --concurrency 1 10 50 200 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 啟動各模式伺服器的指令（{port} 於執行時替換）
+SERVERS = {
+    'wsgi': [sys.executable, '-c',
+             'from werkzeug.serving import run_simple; from app import create_app; '
+             'run_simple("127.0.0.1", {port}, create_app(), threaded=True)'],
+    'asgi-fallback': [sys.executable, '-m', 'uvicorn', '--factory', 'app.asgi:create_asgi_app',
+                      '--port', '{port}', '--log-level', 'warning'],
+    'asgi': [sys.executable, '-m', 'uvicorn', '--factory', 'app.asgi:create_asgi_app',
+             '--port', '{port}', '--log-level', 'warning'],
+}
+
+
+def seed(env: dict, users: int, posts: int, likes: int) -> None:
+    """建立測試資料"""
+    os.environ.update(env)
+    from app import create_app, db
+    from app.models import User, Post, Like
+
+    app = create_app()
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), [{
+            'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'
+        } for i in range(users)])
+        db.session.execute(Post.__table__.insert(), [{
+            'title': f'文章 {i}', 'content': '文章內容 ' * 50, 'excerpt': '文章內容',
+            'user_id': random.randint(1, users)
+        } for i in range(posts)])
+        pairs = {(random.randint(1, users), random.randint(1, posts)) for _ in range(likes)}
+        db.session.execute(Like.__table__.insert(), [
+            {'user_id': user_id, 'post_id': post_id} for user_id, post_id in pairs
+        ])
+        db.session.commit()
+        db.engine.dispose()
+
+
+def free_port() -> int:
+    """取得可用的連接埠"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, env: dict) -> tuple:
+    """啟動伺服器並等待可連線"""
+    port = free_port()
+    command = [part.replace('{port}', str(port)) for part in SERVERS[mode]]
+    server_env = dict(os.environ, **env)
+    if mode == 'asgi-fallback':
+        server_env['ASYNC_API_DISABLED'] = '1'
+
+    process = subprocess.Popen(command, cwd=ROOT, env=server_env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            httpx.get(url + '/api/v1/users?limit=1', timeout=1)
+            return process, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'{mode} 伺服器啟動失敗')
+
+
+async def run_load(url: str, path: str, concurrency: int, total: int) -> tuple:
+    """
+    以固定並行數送出請求
+
+    Returns:
+        Tuple[float, float, float, int]: (請求/秒, p50 毫秒, p99 毫秒, 失敗數)
+    """
+    latencies = []
+    failures = 0
+    queue = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal failures
+            for _ in queue:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        failures += 1
+                except httpx.HTTPError:
+                    failures += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return total / elapsed, p50, p99, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WSGI 與 ASGI 模式並行請求基準測試')
+    parser.add_argument('--modes', nargs='+', default=list(SERVERS), choices=list(SERVERS), help='要測試的模式')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50, 100], help='並行數')
+    parser.add_argument('--requests', type=int, default=1000, help='每個並行數的請求數')
+    parser.add_argument('--path', default='/api/v1/posts?include=author,counts', help='請求路徑')
+    parser.add_argument('--posts', type=int, default=5000, help='文章數')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        env = {
+            'APP_ENV': 'production',
+            'AUTO_CREATE_TABLES': '1',
+            'DATABASE_URL': 'sqlite:///' + os.path.join(folder, 'bench.db'),
+            'RATELIMIT_DISABLED': '1',
+            'COMPRESS_DISABLED': '1',
+        }
+        seed(env, users=500, posts=args.posts, likes=args.posts * 5)
+
+        print(f"路徑: {args.path}，每個並行數 {args.requests} 次請求")
+        print(f"{'模式':<16}{'並行數':>8}{'請求/秒':>12}{'p50(ms)':>10}{'p99(ms)':>10}{'失敗':>8}")
+        for mode in args.modes:
+            process, url = start_server(mode, env)
+            try:
+                for concurrency in args.concurrency:
+                    # 預熱
+                    asyncio.run(run_load(url, args.path, concurrency, min(100, args.requests)))
+                    rate, p50, p99, failures = asyncio.run(
+                        run_load(url, args.path, concurrency, args.requests)
+                    )
+                    print(f"{mode:<16}{concurrency:>8}{rate:>12.0f}{p50:>10.1f}{p99:>10.1f}{failures:>8}")
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+文章列表查詢基準測試
+
+建立一個含長篇文章的暫存資料庫，比較列表查詢載入完整文章
+與只載入卡片欄位（PostService.list_options）的耗時與記憶體用量。
+
+用法:
+    python benchmarks/bench_list_queries.py
+    python benchmarks/bench_list_queries.py --posts 2000 --length 20000 -n 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config  # noqa: E402
+
+
+def seed(db, post_count: int, length: int) -> None:
+    """建立測試用戶與文章"""
+    from app.models import User, Post
+    from app.utils.text import render_content, make_excerpt
+
+    user = User(username='bench', email='bench@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+
+    content = ('長篇文章內容 lorem ipsum dolor sit amet\n' * (length // 30 + 1))[:length]
+    html = render_content(content)
+    excerpt = make_excerpt(content, 200)
+    db.session.bulk_insert_mappings(Post, [{
+        'title': f'文章 {i}',
+        'content': content,
+        'content_html': html,
+        'excerpt': excerpt,
+        'user_id': user.id
+    } for i in range(post_count)])
+    db.session.commit()
+
+
+def measure(db, build_query, iterations: int):
+    """
+    測量查詢的平均耗時與單次查詢的記憶體峰值
+
+    Returns:
+        Tuple[float, float]: (毫秒/次, 記憶體峰值 KiB)
+    """
+    # 預熱一次
+    build_query().all()
+    db.session.expunge_all()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        build_query().all()
+        db.session.expunge_all()
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    posts = build_query().all()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del posts
+    db.session.expunge_all()
+
+    return elapsed * 1000, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='文章列表查詢基準測試')
+    parser.add_argument('--posts', type=int, default=1000, help='文章數')
+    parser.add_argument('--length', type=int, default=10000, help='每篇文章的字數')
+    parser.add_argument('--page-size', type=int, default=10, help='每頁文章數')
+    parser.add_argument('-n', '--iterations', type=int, default=100, help='每種查詢的執行次數')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(folder, 'bench.db')
+            RATELIMIT_ENABLED = False
+
+        from app import create_app, db
+        from app.models import Post
+        from app.services import PostService
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            seed(db, args.posts, args.length)
+
+            cases = [
+                (f'完整欄位（{args.page_size} 筆）',
+                 lambda: Post.query.order_by(Post.created_at.desc()).limit(args.page_size)),
+                (f'列表欄位（{args.page_size} 筆）',
+                 lambda: Post.query.options(PostService.list_options())
+                 .order_by(Post.created_at.desc()).limit(args.page_size)),
+                (f'完整欄位（全部 {args.posts} 筆）',
+                 lambda: Post.query.order_by(Post.created_at.desc())),
+                (f'列表欄位（全部 {args.posts} 筆）',
+                 lambda: Post.query.options(PostService.list_options())
+                 .order_by(Post.created_at.desc())),
+            ]
+
+            print(f"文章數: {args.posts}，每篇 {args.length} 字")
+            print(f"{'查詢':<24}{'毫秒/次':>12}{'記憶體峰值(KiB)':>20}")
+            for name, build_query in cases:
+                ms, peak = measure(db, build_query, args.iterations)
+                print(f"{name:<24}{ms:>12.2f}{peak:>20.1f}")
+
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
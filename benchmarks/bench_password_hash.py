@@ -0,0 +1,73 @@
+"""
+密碼雜湊成本基準測試
+
+針對每一種雜湊設定測量單核心每秒可完成的登入驗證次數，
+用於挑選符合伺服器容量的 PASSWORD_HASH_METHOD。
+
+用法:
+    python benchmarks/bench_password_hash.py
+    python benchmarks/bench_password_hash.py scrypt:16384:8:1 pbkdf2:sha256:600000 -n 20
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.security import normalize_hash_method  # noqa: E402
+from werkzeug.security import generate_password_hash, check_password_hash  # noqa: E402
+
+
+DEFAULT_METHODS = [
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+    'scrypt:8192:8:1',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:100000',
+]
+
+
+def bench_method(method: str, iterations: int) -> float:
+    """
+    測量單一雜湊設定的驗證速度
+
+    Args:
+        method: 雜湊方法
+        iterations: 驗證次數
+
+    Returns:
+        float: 每秒驗證次數（單核心）
+    """
+    pwhash = generate_password_hash('benchmark-password', method=method)
+
+    # 預熱一次，排除首次呼叫的額外成本
+    check_password_hash(pwhash, 'benchmark-password')
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        check_password_hash(pwhash, 'benchmark-password')
+    elapsed = time.perf_counter() - start
+
+    return iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='密碼雜湊成本基準測試')
+    parser.add_argument('methods', nargs='*', help='要測試的雜湊方法，預設測試一組常見設定')
+    parser.add_argument('-n', '--iterations', type=int, default=10, help='每種設定的驗證次數')
+    args = parser.parse_args()
+
+    methods = [normalize_hash_method(m) for m in (args.methods or DEFAULT_METHODS)]
+    cores = os.cpu_count() or 1
+
+    print(f"CPU 核心數: {cores}")
+    print(f"{'雜湊方法':<24}{'毫秒/次':>10}{'登入/秒/核心':>16}{'登入/秒(全部核心)':>20}")
+    for method in methods:
+        rate = bench_method(method, args.iterations)
+        print(f"{method:<24}{1000 / rate:>10.1f}{rate:>16.1f}{rate * cores:>20.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+SQLite 並行讀寫基準測試
+
+以多個讀取執行緒（文章列表查詢）與寫入執行緒（新增留言）同時存取暫存資料庫，
+比較預設配置（rollback journal）與 ProductionConfig（WAL 與連線 PRAGMA）的
+吞吐量、讀取延遲與鎖定錯誤數。
+
+用法:
+    python benchmarks/bench_sqlite_concurrency.py
+    python benchmarks/bench_sqlite_concurrency.py --readers 8 --writers 2 --seconds 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import Config, ProductionConfig  # noqa: E402
+
+
+def seed(db, post_count: int) -> None:
+    """建立測試用戶與文章"""
+    from app.models import User, Post
+
+    user = User(username='bench', email='bench@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+
+    db.session.bulk_insert_mappings(Post, [{
+        'title': f'文章 {i}',
+        'content': '文章內容 ' * 50,
+        'excerpt': '文章內容',
+        'user_id': user.id
+    } for i in range(post_count)])
+    db.session.commit()
+
+
+def percentile(values, fraction: float) -> float:
+    """計算百分位數（毫秒）"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def run_profile(name: str, base_config, args) -> None:
+    """以指定配置執行一輪並輸出結果"""
+    from sqlalchemy.exc import OperationalError
+    from app import create_app, db
+    from app.models import Post, Comment
+    from app.services import PostService
+
+    with tempfile.TemporaryDirectory() as folder:
+        class BenchConfig(base_config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(folder, 'bench.db')
+            RATELIMIT_ENABLED = False
+            AUTO_CREATE_TABLES = True
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            seed(db, args.posts)
+            user_id = Post.query.first().user_id
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        read_latencies, write_latencies = [], []
+        errors = {'read': 0, 'write': 0}
+
+        def reader():
+            latencies = []
+            with app.app_context():
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        Post.query.options(PostService.list_options()) \
+                            .order_by(Post.created_at.desc()).limit(10).all()
+                        Comment.query.filter_by(post_id=1).count()
+                        latencies.append(time.perf_counter() - start)
+                    except OperationalError:
+                        with lock:
+                            errors['read'] += 1
+                    finally:
+                        db.session.remove()
+            with lock:
+                read_latencies.extend(latencies)
+
+        def writer():
+            latencies = []
+            with app.app_context():
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        for _ in range(args.batch):
+                            db.session.add(Comment(content='留言', user_id=user_id, post_id=1))
+                        db.session.commit()
+                        latencies.append(time.perf_counter() - start)
+                    except OperationalError:
+                        db.session.rollback()
+                        with lock:
+                            errors['write'] += 1
+                    finally:
+                        db.session.remove()
+            with lock:
+                write_latencies.extend(latencies)
+
+        threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+        threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    print(f"{name:<12}"
+          f"{len(read_latencies) / args.seconds:>10.0f}"
+          f"{percentile(read_latencies, 0.5):>10.1f}"
+          f"{percentile(read_latencies, 0.99):>10.1f}"
+          f"{len(write_latencies) / args.seconds:>10.0f}"
+          f"{percentile(write_latencies, 0.99):>10.1f}"
+          f"{errors['read'] + errors['write']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 並行讀寫基準測試')
+    parser.add_argument('--posts', type=int, default=1000, help='文章數')
+    parser.add_argument('--readers', type=int, default=4, help='讀取執行緒數')
+    parser.add_argument('--writers', type=int, default=2, help='寫入執行緒數')
+    parser.add_argument('--batch', type=int, default=1, help='每次提交的留言數')
+    parser.add_argument('--seconds', type=float, default=5, help='每種配置的執行秒數')
+    args = parser.parse_args()
+
+    print(f"讀取執行緒: {args.readers}，寫入執行緒: {args.writers}，每種配置 {args.seconds} 秒")
+    print(f"{'配置':<12}{'讀取/秒':>10}{'p50(ms)':>10}{'p99(ms)':>10}"
+          f"{'寫入/秒':>10}{'p99(ms)':>10}{'錯誤':>8}")
+    run_profile('預設', Config, args)
+    run_profile('正式環境', ProductionConfig, args)
+
+
+if __name__ == '__main__':
+    main()
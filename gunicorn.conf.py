@@ -0,0 +1,52 @@
+"""
+gunicorn 設定
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+可用環境變數調整：GUNICORN_BIND、GUNICORN_WORKERS、GUNICORN_THREADS、GUNICORN_TIMEOUT
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND') or '0.0.0.0:8000'
+workers = int(os.environ.get('GUNICORN_WORKERS') or multiprocessing.cpu_count() * 2 + 1)
+threads = int(os.environ.get('GUNICORN_THREADS') or 4)
+worker_class = 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT') or 30)
+graceful_timeout = 30
+keepalive = 5
+
+# 在主行程載入應用程式，工作行程 fork 後共用已載入的模組與已編譯的模板
+preload_app = True
+
+# 定期重啟工作行程以回收記憶體；新的工作行程由已預載的主行程 fork，並在預熱後才接收請求
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """fork 後丟棄從主行程繼承的資料庫連線"""
+    from app import warmup
+    warmup.reset_after_fork(worker.app.wsgi())
+
+
+def post_worker_init(worker):
+    """工作行程開始接收請求前執行預熱"""
+    from app import warmup
+    warmup.run(worker.wsgi)
+
+
+def when_ready(server):
+    """多個工作行程時，檢查需要跨工作行程共享的儲存是否設為行程內的 memory://"""
+    if server.num_workers <= 1:
+        return
+    config = server.app.wsgi().config
+    if (config.get('RATELIMIT_STORAGE_URL') or 'memory://') == 'memory://':
+        server.log.error(f'RATELIMIT_STORAGE_URL 為 memory://，{server.num_workers} 個工作行程各自計數，'
+                         f'實際的限流上限約為設定值的 {server.num_workers} 倍；請改用 sqlite:/// 或 redis://')
+    if (config.get('EVENTS_BACKEND_URL') or 'memory://') == 'memory://':
+        server.log.error('EVENTS_BACKEND_URL 為 memory://，按讚與留言只會即時送到同一個工作行程的連線，'
+                         '連到其他工作行程的用戶收不到；請改用 sqlite:/// 或 redis://')
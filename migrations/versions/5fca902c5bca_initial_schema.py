@@ -0,0 +1,87 @@
+"""initial schema
+
+與 baseline 版本的模型相同；之後的結構變更各自有遷移。
+以 baseline 版本的 db.create_all() 建立的資料庫已有這些資料表，直接略過建立，
+`flask db upgrade` 會從下一個遷移開始套用。
+
+Revision ID: 5fca902c5bca
+Revises: 
+Create Date: 2026-10-19 16:39:53.039367
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5fca902c5bca'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # baseline 版本以 db.create_all() 建立的資料庫沒有 alembic_version，但資料表已存在
+    if sa.inspect(op.get_bind()).has_table('user'):
+        return
+
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=64), nullable=False, comment='用戶名'),
+    sa.Column('email', sa.String(length=120), nullable=False, comment='電子郵件'),
+    sa.Column('password_hash', sa.String(length=128), nullable=True, comment='密碼雜湊'),
+    sa.Column('avatar_path', sa.String(length=200), nullable=True, comment='頭像路徑'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='創建時間'),
+    sa.Column('last_login', sa.DateTime(), nullable=True, comment='最後登入時間'),
+    sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否啟用'),
+    sa.Column('is_admin', sa.Boolean(), nullable=True, comment='是否為管理員'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_user_username'), ['username'], unique=True)
+
+    op.create_table('post',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False, comment='標題'),
+    sa.Column('content', sa.Text(), nullable=False, comment='內容'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='創建時間'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新時間'),
+    sa.Column('user_id', sa.Integer(), nullable=False, comment='作者ID'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('comment',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False, comment='留言內容'),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='創建時間'),
+    sa.Column('updated_at', sa.DateTime(), nullable=True, comment='更新時間'),
+    sa.Column('user_id', sa.Integer(), nullable=False, comment='留言者ID'),
+    sa.Column('post_id', sa.Integer(), nullable=False, comment='文章ID'),
+    sa.Column('parent_id', sa.Integer(), nullable=True, comment='父留言ID，用於回覆功能'),
+    sa.ForeignKeyConstraint(['parent_id'], ['comment.id'], ),
+    sa.ForeignKeyConstraint(['post_id'], ['post.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('likes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True, comment='按讚時間'),
+    sa.Column('user_id', sa.Integer(), nullable=False, comment='用戶ID'),
+    sa.Column('post_id', sa.Integer(), nullable=False, comment='文章ID'),
+    sa.ForeignKeyConstraint(['post_id'], ['post.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'post_id', name='unique_user_post_like')
+    )
+
+
+def downgrade():
+    op.drop_table('likes')
+    op.drop_table('comment')
+    op.drop_table('post')
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_username'))
+        batch_op.drop_index(batch_op.f('ix_user_email'))
+
+    op.drop_table('user')
@@ -0,0 +1,42 @@
+"""cascade follow user foreign keys
+
+Revision ID: 948344bcae91
+Revises: feb3d03276d6
+Create Date: 2026-10-19 18:11:09.271846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '948344bcae91'
+down_revision = 'feb3d03276d6'
+branch_labels = None
+depends_on = None
+
+# SQLite 的外鍵沒有名稱，batch 模式以命名規則對應反射出的外鍵
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+COLUMNS = ('follower_id', 'followed_id')
+
+
+def replace_user_foreign_keys(table, columns, ondelete):
+    """以指定的 ON DELETE 重建參照 user 的外鍵（保留資料庫中原本的名稱）"""
+    names = {}
+    for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        column = foreign_key['constrained_columns'][0]
+        if foreign_key['referred_table'] == 'user' and column in columns:
+            names[column] = foreign_key['name'] or f'fk_{table}_{column}_user'
+
+    with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        for column, name in names.items():
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, 'user', [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    replace_user_foreign_keys('follow', COLUMNS, 'CASCADE')
+
+
+def downgrade():
+    replace_user_foreign_keys('follow', COLUMNS, None)
@@ -0,0 +1,42 @@
+"""cascade notification user foreign keys
+
+Revision ID: feb3d03276d6
+Revises: 7437c25a6fc6
+Create Date: 2026-10-19 18:02:41.635120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'feb3d03276d6'
+down_revision = '7437c25a6fc6'
+branch_labels = None
+depends_on = None
+
+# SQLite 的外鍵沒有名稱，batch 模式以命名規則對應反射出的外鍵
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+COLUMNS = ('user_id', 'actor_id')
+
+
+def replace_user_foreign_keys(table, columns, ondelete):
+    """以指定的 ON DELETE 重建參照 user 的外鍵（保留資料庫中原本的名稱）"""
+    names = {}
+    for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        column = foreign_key['constrained_columns'][0]
+        if foreign_key['referred_table'] == 'user' and column in columns:
+            names[column] = foreign_key['name'] or f'fk_{table}_{column}_user'
+
+    with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+        for column, name in names.items():
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, 'user', [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    replace_user_foreign_keys('notification', COLUMNS, 'CASCADE')
+
+
+def downgrade():
+    replace_user_foreign_keys('notification', COLUMNS, None)
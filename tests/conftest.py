@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import insert
+from app import create_app, db
+from app.config import Config
+from app.models import User
+from app.utils.database import REPLICA_BIND_KEY
+
+
+@pytest.fixture
+def app(tmp_path):
+    """以暫存目錄中的兩個 SQLite 檔案模擬主資料庫與唯讀副本的應用程式"""
+    class TestConfig(Config):
+        TESTING = True
+        SECRET_KEY = 'test-secret-key'
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "primary.db"}'
+        SQLALCHEMY_BINDS = {REPLICA_BIND_KEY: f'sqlite:///{tmp_path / "replica.db"}'}
+        WTF_CSRF_ENABLED = False
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def add_user(app):
+    """直接在主資料庫新增用戶（不經過 session，模擬其他請求的寫入）"""
+    def add(username: str, **values) -> int:
+        with db.engine.begin() as connection:
+            return connection.execute(insert(User).values(
+                username=username, email=f'{username}@example.com', **values
+            )).inserted_primary_key[0]
+
+    return add
@@ -0,0 +1,35 @@
+from datetime import date, datetime
+import numpy as np
+from app.services.analytics_service import AnalyticsService, SECONDS_PER_DAY, SECONDS_PER_WEEK, to_epoch
+
+START = to_epoch(datetime(2024, 1, 1))
+
+
+def at(week: int, day: int = 0) -> int:
+    return START + week * SECONDS_PER_WEEK + day * SECONDS_PER_DAY
+
+
+def test_cohort_retention():
+    signups = np.array([(1, at(0)), (2, at(0, 3)), (3, at(0, 6)), (4, at(1, 2))], dtype=np.int64)
+    activity = np.array([
+        (1, at(0, 1)), (1, at(0, 2)),  # 同一週多次活動只計一次
+        (2, at(1)), (1, at(2)),
+        (4, at(1, 5)), (4, at(2)),
+        (9, at(1)),                    # 範圍外註冊的用戶不計入
+        (3, at(5)),                    # 超出觀察範圍
+    ], dtype=np.int64)
+
+    rows = AnalyticsService.cohort_retention(signups, activity, START, 3)
+
+    assert [row['week_start'] for row in rows] == [date(2024, 1, 1), date(2024, 1, 8)]
+    assert [row['size'] for row in rows] == [3, 1]
+    assert rows[0]['retention'] == [0.333, 0.333, 0.333]
+    assert rows[1]['retention'] == [1.0, 1.0]
+
+
+def test_cohort_retention_without_data():
+    empty = np.empty((0, 2), dtype=np.int64)
+    assert AnalyticsService.cohort_retention(empty, empty, START, 4) == []
+
+    signups = np.array([(1, at(0))], dtype=np.int64)
+    assert AnalyticsService.cohort_retention(signups, empty, START, 2)[0]['retention'] == [0.0, 0.0]
@@ -0,0 +1,30 @@
+from app.utils.assets import minify_js
+
+
+def test_minify_js_removes_comments_and_indentation():
+    js = (
+        '// comment\n'
+        'function f(a) {\n'
+        '    return /* inline */ a;   \n'
+        '}\n'
+        '\n'
+        '\n'
+        'f(1)\n'
+    )
+    assert minify_js(js) == 'function f(a) {\nreturn   a;\n}\nf(1)'
+
+
+def test_minify_js_keeps_license_comments_and_newlines():
+    # 保留換行，自動分號插入的結果不變
+    js = '/*! license */\nvar a = 1\nvar b = a\n++b\n'
+    assert minify_js(js) == '/*! license */\nvar a = 1\nvar b = a\n++b'
+
+
+def test_minify_js_keeps_strings_and_regex():
+    js = 'var s = "// not a comment", t = \'/* nor this */\';\nvar r = /\\/\\*x/g;\n'
+    assert minify_js(js) == js.rstrip('\n')
+
+
+def test_minify_js_keeps_template_literals():
+    js = 'var s = `${a}  /* kept */\n    // kept\n${ {b: 1}.b }`;  // removed\n'
+    assert minify_js(js) == 'var s = `${a}  /* kept */\n    // kept\n${ {b: 1}.b }`;'
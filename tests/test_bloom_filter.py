@@ -0,0 +1,32 @@
+import pytest
+from app.utils.bloom_filter import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(1000)
+    values = [f'user{i}' for i in range(1000)]
+    bloom.update(values)
+    assert all(value in bloom for value in values)
+    assert bloom.count == 1000 and not bloom.is_full
+
+
+def test_false_positive_rate():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    bloom.update(f'user{i}' for i in range(1000))
+    false_positives = sum(f'other{i}' in bloom for i in range(10000))
+    # 設計誤判率為 1%，留一些餘裕
+    assert false_positives < 300
+
+
+def test_is_full():
+    bloom = BloomFilter(2)
+    bloom.update(['a', 'b'])
+    assert not bloom.is_full
+    bloom.add('c')
+    assert bloom.is_full
+
+
+@pytest.mark.parametrize('capacity, error_rate', [(0, 0.01), (10, 0), (10, 1)])
+def test_invalid_arguments(capacity, error_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, error_rate)
@@ -0,0 +1,82 @@
+from sqlalchemy import select, func, update
+from app import db
+from app.models import User
+from app.utils.database import REPLICA_BIND_KEY, use_replica, replica_reads, sync_sqlite_replica
+
+
+def count_users() -> int:
+    return db.session.scalar(select(func.count(User.id)))
+
+
+def sync_replica() -> None:
+    sync_sqlite_replica(db.engines[None], db.engines[REPLICA_BIND_KEY])
+
+
+def test_reads_use_replica(app, add_user):
+    add_user('alice')
+    sync_replica()
+    add_user('bob')  # 副本尚未同步
+
+    with use_replica():
+        assert count_users() == 1
+    assert count_users() == 2
+
+
+def test_replica_reads_decorator(app, add_user):
+    add_user('alice')
+    sync_replica()
+    add_user('bob')
+
+    assert replica_reads(count_users)() == 1
+
+
+def test_reads_after_flush_use_primary(app, add_user):
+    add_user('alice')
+    sync_replica()
+
+    with use_replica():
+        assert count_users() == 1
+        db.session.add(User(username='bob', email='bob@example.com'))
+        db.session.flush()
+        # 寫入後同一個 session 的讀取改用主資料庫，讀得到剛寫入的資料
+        assert count_users() == 2
+
+        db.session.commit()
+        assert count_users() == 2
+
+
+def test_reads_after_update_statement_use_primary(app, add_user):
+    user_id = add_user('alice')
+    sync_replica()
+
+    with use_replica():
+        db.session.execute(update(User).where(User.id == user_id).values(is_admin=True))
+        assert db.session.scalar(select(User.is_admin).where(User.id == user_id)) is True
+
+
+def test_new_session_reads_replica_again(app, add_user):
+    add_user('alice')
+    sync_replica()
+
+    with use_replica():
+        db.session.add(User(username='bob', email='bob@example.com'))
+        db.session.commit()
+
+    # 下一個請求（新的 session）重新使用副本
+    db.session.remove()
+    with use_replica():
+        assert count_users() == 1
+
+
+def test_sync_sqlite_replica_makes_replica_current(app, add_user):
+    add_user('alice')
+    sync_replica()
+    add_user('bob')
+    with use_replica():
+        assert count_users() == 1
+
+    sync_replica()
+    db.session.remove()
+    with use_replica():
+        assert count_users() == 2
+        assert set(db.session.scalars(select(User.username))) == {'alice', 'bob'}
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import select
+from app import db
+from app.models import Post, FeedEntry
+from app.services import FeedService, FollowService
+
+
+@pytest.fixture
+def users(app, add_user):
+    app.config['FEED_FANOUT_THRESHOLD'] = 2
+    ids = {name: add_user(name) for name in ('author', 'celebrity', 'reader', 'other')}
+    for follower in ('reader', 'other'):
+        assert FollowService.follow(ids[follower], ids['celebrity']) == (True, None)
+    assert FollowService.follow(ids['reader'], ids['author']) == (True, None)
+    return ids
+
+
+def publish(user_id: int, title: str) -> int:
+    post = Post(title=title, content=title, user_id=user_id)
+    db.session.add(post)
+    db.session.flush()
+    FeedService.fan_out_post(post)
+    db.session.commit()
+    return post.id
+
+
+def feed_entries(post_id: int):
+    return set(db.session.scalars(select(FeedEntry.user_id).where(FeedEntry.post_id == post_id)))
+
+
+def test_fan_out_below_threshold(users):
+    post_id = publish(users['author'], 'hello')
+    assert feed_entries(post_id) == {users['author'], users['reader']}
+    assert FeedService.get_feed_post_ids(users['reader']) == [post_id]
+
+
+def test_authors_over_threshold_are_merged_on_read(users):
+    pushed = publish(users['author'], 'hello')
+    pulled = publish(users['celebrity'], 'news')
+
+    # 追蹤者達門檻的作者只寫入自己的動態，讀取時再合併
+    assert feed_entries(pulled) == {users['celebrity']}
+    assert FeedService.get_pulled_author_ids(users['reader']) == [users['celebrity']]
+    assert FeedService.get_feed_post_ids(users['reader']) == [pulled, pushed]
+    assert FeedService.get_feed_post_ids(users['reader'], before=pulled) == [pushed]
+    assert FeedService.get_feed_post_ids(users['other']) == [pulled]
+
+
+def test_follow_backfills_and_unfollow_removes(users):
+    post_id = publish(users['author'], 'hello')
+    assert FollowService.follow(users['other'], users['author']) == (True, None)
+    assert users['other'] in feed_entries(post_id)
+
+    assert FollowService.unfollow(users['reader'], users['author']) == (True, None)
+    assert FeedService.get_feed_post_ids(users['reader']) == []
@@ -0,0 +1,47 @@
+import pytest
+from app.utils.rate_limit import parse_rate, refill_bucket, MemoryBackend, SQLiteBackend
+
+
+def test_parse_rate():
+    assert parse_rate('5/minute') == (5, 5 / 60)
+    assert parse_rate(' 100 / hours ') == (100, 100 / 3600)
+    for rate in ('5', 'five/minute', '5/week', '0/minute'):
+        with pytest.raises(ValueError):
+            parse_rate(rate)
+
+
+def test_refill_bucket():
+    # 桶內還有令牌時允許並扣除一個
+    assert refill_bucket(3, 0.0, 0.0, 3, 1.0) == (True, 2, 0.0)
+    # 用完後拒絕，回傳補滿一個令牌需等待的秒數
+    assert refill_bucket(0.5, 0.0, 0.0, 3, 0.5) == (False, 0.5, 1.0)
+    # 依經過時間補充，但不超過容量
+    assert refill_bucket(0, 0.0, 2.0, 3, 1.0) == (True, 1.0, 0.0)
+    assert refill_bucket(0, 0.0, 100.0, 3, 1.0) == (True, 2, 0.0)
+
+
+@pytest.mark.parametrize('make_backend', [
+    lambda tmp_path: MemoryBackend(),
+    lambda tmp_path: SQLiteBackend(str(tmp_path / 'ratelimit.db')),
+])
+def test_backend_allows_capacity_then_rejects(tmp_path, make_backend):
+    backend = make_backend(tmp_path)
+    assert [backend.hit('ip:1', 3, 0.001)[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = backend.hit('ip:1', 3, 0.001)
+    assert not allowed and retry_after > 0
+
+    # 不同的鍵各自計數
+    assert backend.hit('ip:2', 3, 0.001)[0]
+
+    backend.reset()
+    assert backend.hit('ip:1', 3, 0.001)[0]
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    # 多個工作行程各自開啟同一個檔案，共用同一個令牌桶
+    path = str(tmp_path / 'ratelimit.db')
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    assert first.hit('ip:1', 2, 0.001)[0]
+    assert second.hit('ip:1', 2, 0.001)[0]
+    assert not first.hit('ip:1', 2, 0.001)[0]
+    assert not second.hit('ip:1', 2, 0.001)[0]
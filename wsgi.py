@@ -0,0 +1,17 @@
+"""
+正式環境 WSGI 進入點
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py 啟用 preload_app：應用程式在主行程建立並編譯所有模板，
+工作行程 fork 後以 copy-on-write 共用已載入的模組與模板；每個工作行程在
+開始接收請求前執行預熱（app/utils/warmup.py），完成後 /readyz 才回應 200。
+"""
+import os
+
+os.environ.setdefault('APP_ENV', 'production')
+
+from app import create_app, warmup  # noqa: E402
+
+app = create_app()
+warmup.preload(app)